@@ -0,0 +1,335 @@
+"""
+추첨 성능 벤치마크
+
+    python bench/bench_draw.py [--quick] [--save results.json] [--compare baseline.json]
+                               [--threshold 0.10] [--rounds 3] [--filter verify]
+
+Commitment 생성, 추첨, 검증을 범위 크기(10 ~ 10^12), 배치 크기(1 ~ 10^6),
+I/O 방식(파일 / 메모리)별로 측정하고, 매 호출마다 실행되는 시드 생성과 JSON 정규화
+마이크로 벤치마크도 함께 측정합니다. 메모리 검증은 검증 캐시를 매번 비운 값(cache=cold)과
+캐시 적중(cache=warm)을 따로 기록합니다. streamlit 이 설치되어 있으면 Streamlit 앱 한 번
+재실행(rerun) 비용도 측정합니다. 결과는 JSON 으로 저장되며, --compare 로
+기준 결과와 비교해 허용 범위보다 느려진 항목이 있으면 종료 코드 1 을 반환합니다.
+
+전체를 --rounds 번 되풀이하며 항목마다 라운드당 REPEAT 개 표본을 재고, 모든 표본 중 가장 빠른 값
+(per_call_us)으로 비교합니다. 허용 범위는 max(threshold, NOISE_K × 잡음) 이며, 잡음은 라운드별
+최솟값이 얼마나 흩어졌는지((최대 - 최소) / 최소)로 기준과 현재 중 큰 값입니다.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import random_draw  # noqa: E402
+from draw_core import (  # noqa: E402
+    compute_commitment_hash,
+    derive_seed,
+    draw_reveal,
+    make_commitment,
+    verify_drawing,
+)
+from draw_core import npengine  # noqa: E402
+from draw_core.batch import iter_verify  # noqa: E402
+from draw_core.cache import verify_cache  # noqa: E402
+
+RANGE_SIZES = [10, 10**3, 10**6, 10**9, 10**12]
+BATCH_SIZES = [1, 10, 10**2, 10**3, 10**4, 10**5, 10**6]
+QUICK_BATCH_SIZES = [1, 10, 10**2, 10**3, 10**4]
+
+# 측정 반복 횟수와 한 번의 측정이 최소로 걸려야 하는 시간
+REPEAT = 5
+MIN_TIME = 0.05
+# 전체 벤치마크를 되풀이하는 횟수 (CPU 속도가 몇 초 단위로 바뀌는 환경에서도 빠른 구간의 표본을 얻도록
+# 표본을 시간적으로 흩어 놓음)
+ROUNDS = 3
+# 비교 시 허용 범위 = max(threshold, NOISE_K × 잡음) (잡음은 기준/현재 중 큰 값)
+NOISE_K = 1.5
+
+
+def measure(func, number=None):
+    """func 를 반복 실행하여 호출당 시간(초) 표본 REPEAT 개와 호출 수 반환"""
+    if number is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= MIN_TIME or number >= 1 << 20:
+                break
+            number *= 2
+
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples, number
+
+
+@contextlib.contextmanager
+def _quiet_cwd(path):
+    """작업 디렉터리를 바꾸고 표준 출력을 버림 (CLI 함수 측정용)"""
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.chdir(old)
+
+
+def _result(name, params, samples, number, ops=1):
+    """한 라운드의 측정값 (run() 이 라운드별 표본을 모아 _summary 로 요약)"""
+    return {"name": name, "params": params, "calls": number, "ops": ops, "samples": samples}
+
+
+def _summary(result, rounds):
+    """라운드별 표본 목록 → 결과 dict
+
+    per_call_us 는 모든 라운드에서 가장 빠른 표본, noise 는 라운드별 최솟값의 퍼짐
+    (최대 - 최소) / 최소 입니다 (라운드가 하나면 그 라운드 표본의 (중앙값 - 최소) / 최소).
+    """
+    samples = [sample for round_samples in rounds for sample in round_samples]
+    best = min(samples)
+    bests = [min(round_samples) for round_samples in rounds]
+    if len(rounds) == 1:
+        spread = statistics.median(samples) - best
+    else:
+        spread = max(bests) - best
+    return {
+        "name": result["name"],
+        "params": result["params"],
+        "calls": result["calls"],
+        "rounds": len(rounds),
+        "per_call_us": round(best * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "noise": round(spread / best, 4) if best else 0.0,
+        "ops_per_s": round(result["ops"] / best, 1) if best else None,
+    }
+
+
+def bench_micro():
+    commitment_hash, commitment_data = make_commitment()
+    timestamp, nonce = commitment_data["timestamp"], commitment_data["nonce"]
+    seed_value = derive_seed(timestamp, nonce)
+    rng = random.Random(seed_value)
+
+    cases = {
+        "json_canonicalize": lambda: json.dumps(commitment_data, sort_keys=True),
+        "sha256_commitment": lambda: compute_commitment_hash(commitment_data),
+        "seed_sha256_reduce": lambda: derive_seed(timestamp, nonce),
+        "seed_hexdigest_int": lambda: int(hashlib.sha256((timestamp + nonce).encode()).hexdigest(), 16) % (2**32),
+        "mt_seed": lambda: random.Random(seed_value),
+        "randint_1_100": lambda: rng.randint(1, 100),
+    }
+    for name, func in cases.items():
+        samples, number = measure(func)
+        yield _result(f"micro.{name}", {}, samples, number)
+
+
+def bench_commit(tmp):
+    samples, number = measure(make_commitment)
+    yield _result("commit", {"io": "memory"}, samples, number)
+
+    with _quiet_cwd(tmp):
+        samples, number = measure(random_draw.generate_commitment)
+    yield _result("commit", {"io": "file"}, samples, number)
+
+
+def bench_reveal(tmp):
+    _, commitment_data = make_commitment()
+    for size in RANGE_SIZES:
+        samples, number = measure(lambda: draw_reveal(commitment_data, 1, size))
+        yield _result("reveal", {"io": "memory", "range": size}, samples, number)
+
+    with _quiet_cwd(tmp):
+        random_draw.generate_commitment()
+        for size in RANGE_SIZES:
+            samples, number = measure(lambda: random_draw.reveal_and_draw(1, size))
+            yield _result("reveal", {"io": "file", "range": size}, samples, number)
+
+
+def bench_verify(tmp):
+    commitment_hash, commitment_data = make_commitment()
+    timestamp, nonce = commitment_data["timestamp"], commitment_data["nonce"]
+    for size in RANGE_SIZES:
+        # verify_drawing 은 같은 입력을 verify_cache 에서 찾으므로 매 호출 전에 비운 값(cold,
+        # 해시와 추첨을 실제로 계산)과 캐시 적중(warm)을 따로 측정
+        def cold():
+            verify_cache.clear()
+            verify_drawing(commitment_hash, timestamp, nonce, 1, size)
+        samples, number = measure(cold)
+        yield _result("verify", {"io": "memory", "range": size, "cache": "cold"}, samples, number)
+        samples, number = measure(lambda: verify_drawing(commitment_hash, timestamp, nonce, 1, size))
+        yield _result("verify", {"io": "memory", "range": size, "cache": "warm"}, samples, number)
+    verify_cache.clear()
+
+    with _quiet_cwd(tmp):
+        for size in RANGE_SIZES:
+            with open('reveal.json', 'w') as f:
+                json.dump({"min_num": 1, "max_num": size}, f)
+            samples, number = measure(lambda: random_draw.verify(commitment_hash, timestamp, nonce))
+            yield _result("verify", {"io": "file", "range": size}, samples, number)
+
+
+def bench_batch(tmp, batch_sizes, workers):
+    records = []
+    for i in range(min(max(batch_sizes), 1000)):
+        _, commitment_data = make_commitment()
+        records.append(json.dumps(draw_reveal(commitment_data, 1, 10 + i)))
+
+    for size in batch_sizes:
+        lines = [records[i % len(records)] for i in range(size)]
+        number = 1 if size >= 10**4 else None
+
+        def run_memory():
+            for _ in iter_verify(lines, workers):
+                pass
+        samples, calls = measure(run_memory, number)
+        yield _result("verify_batch", {"io": "memory", "batch": size, "workers": workers},
+                      samples, calls, ops=size)
+
+        if npengine.available():
+            def run_numpy():
+                for _ in iter_verify(lines, workers, engine="numpy"):
+                    pass
+            samples, calls = measure(run_numpy, number)
+            yield _result("verify_batch", {"io": "memory", "batch": size, "workers": workers, "engine": "numpy"},
+                          samples, calls, ops=size)
+
+        path = os.path.join(tmp, f"batch_{size}.jsonl")
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+        def run_file():
+            with open(os.devnull, 'w') as out:
+                random_draw.verify_batch(path, workers, quiet=True, out=out)
+        samples, calls = measure(run_file, number)
+        yield _result("verify_batch", {"io": "file", "batch": size, "workers": workers},
+                      samples, calls, ops=size)
+
+
+def bench_ui():
+    """Streamlit 앱 전체 재실행 비용 (streamlit 이 없으면 건너뜀)"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("ui.rerun: streamlit 미설치 → 건너뜀", file=sys.stderr)
+        return
+    app = AppTest.from_file(os.path.join(ROOT, "streamlit_lottery.py"))
+    app.run()
+    samples, number = measure(app.run, 10)
+    yield _result("ui.rerun", {}, samples, number)
+
+
+def run(quick=False, name_filter=None, workers=1, rounds=ROUNDS):
+    """벤치마크를 rounds 번 되풀이 → {"meta": ..., "results": [...]}. name_filter 가 이름에 포함된 그룹만 실행"""
+    collected = {}   # (이름, 파라미터) → (첫 라운드 결과, 라운드별 표본)
+    for round_no in range(1, rounds + 1):
+        with tempfile.TemporaryDirectory() as tmp:
+            groups = {
+                "micro": lambda: bench_micro(),
+                "commit": lambda: bench_commit(tmp),
+                "reveal": lambda: bench_reveal(tmp),
+                "verify": lambda: bench_verify(tmp),
+                "verify_batch": lambda: bench_batch(tmp, QUICK_BATCH_SIZES if quick else BATCH_SIZES, workers),
+                "ui.rerun": lambda: bench_ui(),
+            }
+            for group, make in groups.items():
+                if name_filter and name_filter not in group:
+                    continue
+                for result in make():
+                    collected.setdefault(_key(result), (result, []))[1].append(result["samples"])
+                    params = " ".join(f"{k}={v}" for k, v in result["params"].items())
+                    print(f"[{round_no}/{rounds}] {result['name']:<28} {params:<40} "
+                          f"{min(result['samples']) * 1e6:>14.3f} us", file=sys.stderr)
+    results = [_summary(result, samples) for result, samples in collected.values()]
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "rounds": rounds,
+            "repeat": REPEAT,
+        },
+        "results": results,
+    }
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(current, baseline, threshold, noise_k=NOISE_K):
+    """기준 결과와 비교 → 느려진 항목 목록 (비율 = 현재 / 기준, 가장 빠른 표본끼리)
+
+    항목마다 허용 범위(band)는 max(threshold, noise_k × 기준/현재 중 큰 잡음) 이며,
+    비율이 1 + band 를 넘을 때만 느려진 것으로 봅니다.
+    """
+    base = {_key(r): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':<70} {'baseline':>12} {'current':>12} {'ratio':>7} {'band':>7}")
+    for result in current["results"]:
+        old = base.get(_key(result))
+        if not old:
+            continue
+        ratio = result["per_call_us"] / old["per_call_us"] if old["per_call_us"] else 1.0
+        band = max(threshold, noise_k * max(result.get("noise", 0.0), old.get("noise", 0.0)))
+        label = f"{result['name']} " + " ".join(f"{k}={v}" for k, v in result["params"].items())
+        mark = " ❌" if ratio > 1 + band else ""
+        print(f"{label:<70} {old['per_call_us']:>12.3f} {result['per_call_us']:>12.3f} {ratio:>7.2f} "
+              f"{band:>6.0%}{mark}")
+        if mark:
+            regressions.append((label, ratio))
+    return regressions
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    quick = "--quick" in args
+    save = _take_option(args, "--save")
+    baseline = _take_option(args, "--compare")
+    threshold = float(_take_option(args, "--threshold", 0.10))
+    name_filter = _take_option(args, "--filter")
+    workers = int(_take_option(args, "--workers", 1))
+    rounds = int(_take_option(args, "--rounds", ROUNDS))
+
+    current = run(quick, name_filter, workers, rounds)
+    if save:
+        with open(save, 'w') as f:
+            json.dump(current, f, indent=2)
+    else:
+        print(json.dumps(current, indent=2))
+
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(current, json.load(f), threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)}개 항목이 허용 범위(잡음 band, 최소 {threshold:.0%}) 이상 느려졌습니다.")
+            sys.exit(1)
+        print("\n✅ 기준 대비 성능 저하 없음")
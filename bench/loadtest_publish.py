@@ -0,0 +1,160 @@
+"""
+게시 파이프라인 부하 테스트 (로컬)
+
+    python bench/loadtest_publish.py [--messages 500] [--concurrency 4] [--pool 4] [--delays 20,50,100] [--flaky 10]
+
+같은 프로세스에 응답 지연이 서로 다른 webhook 수신기(delays, ms)를 띄우고, 임시 디렉터리의
+file / queue sink 와 함께 Commitment 메시지 messages 개를 concurrency 개씩 동시에 게시합니다.
+webhook sink 는 수신기마다 연결을 pool 개까지 열며, concurrency 가 pool 보다 크면 남는 게시는
+연결이 빌 때까지 기다리므로 그만큼 게시 시간에 포함됩니다.
+flaky 를 주면 가장 빠른 수신기가 flaky 번째 요청마다 503 을 돌려 재시도 경로도 지나갑니다.
+
+메시지당 게시 시간 p50/p99 를 가장 느린 sink 지연, sink 지연의 합과 비교하고, 수신기별로 연 연결 수
+(연결 풀 재사용)와 영수증 로그 검증 결과를 JSON 으로 출력합니다. 게시 실패, 영수증 검증 실패가
+있거나 p50 이 sink 지연의 합 이상이면 종료 코드 1 을 반환합니다.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from draw_core.commitment import make_commitments  # noqa: E402
+
+import draw_publish  # noqa: E402
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Receiver:
+    """응답을 delay 초 늦게 보내는 webhook 수신기 (flaky 번째 요청마다 503)"""
+
+    def __init__(self, delay, flaky=0):
+        self.delay = delay
+        self.flaky = flaky
+        self.requests = 0
+        self.accepted = 0
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                status = "503 Service Unavailable" if self.flaky and self.requests % self.flaky == 0 else "200 OK"
+                if status == "200 OK":
+                    self.accepted += 1
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 2\r\n\r\n{{}}".encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main(messages, concurrency, pool, delays, flaky):
+    receivers = [Receiver(delay / 1000, flaky if i == 0 else 0) for i, delay in enumerate(sorted(delays))]
+    servers = [await asyncio.start_server(receiver.handle, "127.0.0.1", 0) for receiver in receivers]
+    ports = [server.sockets[0].getsockname()[1] for server in servers]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sinks = [draw_publish.WebhookSink(f"http://127.0.0.1:{port}/hook", pool_size=pool) for port in ports]
+        sinks += [draw_publish.FileSink(os.path.join(tmp, "published")),
+                  draw_publish.QueueSink(os.path.join(tmp, "outbox"))]
+        key = os.urandom(32)
+        receipts_path = os.path.join(tmp, "receipts.jsonl")
+        publisher = draw_publish.Publisher(sinks, timeout=2.0, retries=2, backoff=0.01, receipts=receipts_path,
+                                           key=key)
+        items = [data for _, data in make_commitments(messages)]
+        slot = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def publish(data):
+            async with slot:
+                start = time.perf_counter()
+                receipt = await publisher.publish(data)
+                latencies.append(time.perf_counter() - start)
+                return receipt
+
+        start = time.perf_counter()
+        try:
+            receipts = await asyncio.gather(*(publish(data) for data in items))
+        finally:
+            await publisher.close()
+        elapsed = time.perf_counter() - start
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+
+        verified, receipt_error = draw_publish.verify_receipts(receipts_path, key)
+        queued = len(os.listdir(os.path.join(tmp, "outbox", "new")))
+
+    latencies.sort()
+    retried = sum(1 for receipt in receipts for outcome in receipt["sinks"] if outcome["attempts"] > 1)
+    report = {
+        "messages": messages,
+        "concurrency": concurrency,
+        "pool_size": pool,
+        "sinks": len(sinks),
+        "elapsed_s": round(elapsed, 3),
+        "messages_per_s": round(messages / elapsed, 1),
+        "failed": sum(1 for receipt in receipts if not receipt["ok"]),
+        "retried_sends": retried,
+        "slowest_sink_ms": max(delays),
+        "sum_of_sinks_ms": sum(delays),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "webhooks": [{"delay_ms": round(r.delay * 1000), "requests": r.requests, "accepted": r.accepted,
+                      "connections": r.connections} for r in receivers],
+        "queued": queued,
+        "receipts_verified": verified,
+        "receipt_error": receipt_error,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    messages = int(_take_option(args, "--messages", 500))
+    pool = int(_take_option(args, "--pool", draw_publish.DEFAULT_POOL_SIZE))
+    concurrency = int(_take_option(args, "--concurrency", pool))
+    delays = [float(d) for d in _take_option(args, "--delays", "20,50,100").split(",")]
+    flaky = int(_take_option(args, "--flaky", 10))
+
+    report = asyncio.run(main(messages, concurrency, pool, delays, flaky))
+    ok = (report["failed"] == 0 and report["receipt_error"] is None and report["receipts_verified"] == messages
+          and report["p50_ms"] < report["sum_of_sinks_ms"])
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,144 @@
+"""
+예약 공개 데몬 부하 테스트 (로컬)
+
+    python bench/loadtest_scheduler.py [--draws 100000] [--spread 30] [--concurrency 4] [--crash]
+
+임시 장부에 추첨 draws 개를 만들고 지금부터 spread 초 동안 고르게 흩어진 공개 시각으로
+예약한 뒤, 데몬(draw_scheduler.py)이 모두 공개할 때까지 실행합니다. 공개 지연(장부에 기록된
+시각 - 예약 시각)의 p50/p99/최대와 공개 결과 검증 실패 수를 JSON 으로 출력합니다.
+
+--crash 를 주면 데몬을 별도 프로세스로 띄워 중간에 SIGKILL 로 죽이고 다시 띄워,
+재시작 후 남은 예약이 모두 한 번씩 공개되는지도 확인합니다.
+목표치(TARGET_P99_DELAY_MS)를 넘거나 공개되지 않은 추첨이 있으면 종료 코드 1 을 반환합니다.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from draw_core import ledger, verify_record  # noqa: E402
+from draw_core.commitment import make_commitments  # noqa: E402
+
+import draw_scheduler  # noqa: E402
+
+# 문서화된 지연 목표 (ms). LOTTERY_README.md 참고
+TARGET_P99_DELAY_MS = 50
+# 예약을 마친 뒤 첫 공개까지의 여유(초)
+LEAD = 2.0
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def prepare(ledger_path, draws, spread):
+    """추첨 draws 개를 만들고 LEAD 초 뒤부터 spread 초에 걸쳐 예약"""
+    with closing(ledger.connect(ledger_path)) as conn:
+        draw_ids = ledger.add_commitments(conn, make_commitments(draws))
+        start = time.time() + LEAD
+        step = spread / draws
+        ledger.schedule_reveals(conn, ((draw_id, start + i * step, 1, 1000 + i % 1000, 1)
+                                       for i, draw_id in enumerate(draw_ids)))
+
+
+def run_with_crash(ledger_path, concurrency, spread):
+    """데몬을 띄워 spread 의 절반쯤에서 SIGKILL 로 죽이고 다시 띄워 끝까지 실행 → 재시작 시 복구한 예약 수"""
+    command = [sys.executable, os.path.join(ROOT, "draw_scheduler.py"), "--ledger", ledger_path,
+               "--concurrency", str(concurrency)]
+    daemon = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    time.sleep(LEAD + spread / 2)
+    daemon.send_signal(signal.SIGKILL)
+    daemon.wait()
+    with closing(ledger.connect(ledger_path)) as conn:
+        recovered = len(ledger.pending_schedules(conn))
+    subprocess.run(command + ["--until-idle"], stderr=subprocess.DEVNULL, check=True)
+    return recovered
+
+
+def collect(ledger_path):
+    """공개 지연 목록(초), 공개되지 않은 추첨 수, 검증 실패 수"""
+    with closing(ledger.connect(ledger_path)) as conn:
+        rows = conn.execute(
+            "SELECT d.status, d.revealed_at, d.reveal, MAX(s.reveal_at) AS reveal_at "
+            "FROM draws d JOIN schedules s ON s.draw_id = d.id GROUP BY d.id"
+        ).fetchall()
+    delays = []
+    pending = failed = 0
+    for row in rows:
+        if row["status"] != "revealed":
+            pending += 1
+            continue
+        delays.append(row["revealed_at"] - row["reveal_at"])
+        if not verify_record(json.loads(row["reveal"]))["ok"]:
+            failed += 1
+    return sorted(delays), pending, failed
+
+
+def main(draws, spread, concurrency, crash):
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path = os.path.join(tmp, "draws.db")
+        prepare(ledger_path, draws, spread)
+        start = time.perf_counter()
+        recovered = None
+        if crash:
+            recovered = run_with_crash(ledger_path, concurrency, spread)
+        else:
+            scheduler = draw_scheduler.RevealScheduler(ledger_path, concurrency, verbose=False)
+            try:
+                asyncio.run(scheduler.run(until_idle=True))
+            finally:
+                scheduler.close()
+        elapsed = time.perf_counter() - start
+        delays, pending, failed = collect(ledger_path)
+
+    report = {
+        "draws": draws,
+        "spread_s": spread,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "revealed": len(delays),
+        "pending": pending,
+        "verify_failed": failed,
+        "p50_delay_ms": round(percentile(delays, 50) * 1000, 2),
+        "p99_delay_ms": round(percentile(delays, 99) * 1000, 2),
+        "max_delay_ms": round(delays[-1] * 1000, 2) if delays else 0.0,
+        "target_p99_ms": TARGET_P99_DELAY_MS,
+    }
+    if crash:
+        report["recovered_after_crash"] = recovered
+    print(json.dumps(report, indent=2))
+    return report
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    draws = int(_take_option(args, "--draws", 100000))
+    spread = float(_take_option(args, "--spread", 30))
+    concurrency = int(_take_option(args, "--concurrency", draw_scheduler.DEFAULT_CONCURRENCY))
+
+    report = main(draws, spread, concurrency, "--crash" in args)
+    ok = report["pending"] == 0 and report["verify_failed"] == 0
+    if not report.get("recovered_after_crash"):
+        ok = ok and report["p99_delay_ms"] <= TARGET_P99_DELAY_MS
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,183 @@
+"""
+추첨 API 서버 부하 테스트 (로컬)
+
+    python bench/loadtest_server.py [--url http://127.0.0.1:8600] [--requests 5000]
+                                    [--concurrency 64] [--endpoint verify|verify-batch]
+                                    [--batch 500] [--spawn] [--workers N]
+
+--spawn 을 주면 같은 프로세스에서 서버를 띄워 측정합니다. keep-alive 연결
+concurrency 개로 요청을 보내고 초당 검증 수와 p50/p95/p99 지연을 JSON 으로 출력합니다.
+목표치(TARGET_VERIFY_PER_SEC)에 못 미치면 종료 코드 1 을 반환합니다.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draw_core import draw_reveal, make_commitment  # noqa: E402
+
+# 문서화된 처리량 목표 (검증/초). LOTTERY_README.md 참고
+TARGET_VERIFY_PER_SEC = {
+    "verify": 1000,
+    "verify-batch": 20000,
+}
+
+
+def make_records(count):
+    """검증용 reveal 레코드 생성 (범위를 조금씩 바꿔 가며)"""
+    records = []
+    for i in range(count):
+        _, commitment_data = make_commitment()
+        records.append(draw_reveal(commitment_data, 1, 10 + i % 1000))
+    return records
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def _request(reader, writer, host, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "transfer-encoding":
+            chunked = value.strip().lower() == "chunked"
+    if not chunked:
+        return int(status_line.split()[1]), await reader.readexactly(length)
+    # verify-batch 는 결과를 chunked 로 보냄
+    payload = []
+    while True:
+        size = int(await reader.readline(), 16)
+        chunk = await reader.readexactly(size + 2)
+        if not size:
+            break
+        payload.append(chunk[:-2])
+    return int(status_line.split()[1]), b"".join(payload)
+
+
+async def run_load(url, bodies, concurrency, path):
+    """bodies 를 concurrency 개 연결로 나눠 보내고 요청별 지연(초) 목록과 오류 수 반환"""
+    parsed = urlparse(url)
+    queue = asyncio.Queue()
+    for body in bodies:
+        queue.put_nowait(body)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(parsed.hostname, parsed.port)
+        try:
+            while not queue.empty():
+                body = queue.get_nowait()
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, parsed.hostname, path, body)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def main(url, total, concurrency, endpoint, batch, spawn, workers):
+    server_task = None
+    if spawn:
+        import draw_server
+        ready = asyncio.Event()
+        parsed = urlparse(url)
+        server_task = asyncio.create_task(draw_server.serve(parsed.hostname, parsed.port, workers, ready=ready))
+        await ready.wait()
+
+    records = make_records(min(total, 2000))
+    if endpoint == "verify":
+        bodies = [json.dumps(records[i % len(records)]).encode() for i in range(total)]
+        per_request = 1
+    else:
+        requests = max(1, total // batch)
+        bodies = [
+            json.dumps({"records": [records[(r * batch + i) % len(records)] for i in range(batch)]}).encode()
+            for r in range(requests)
+        ]
+        per_request = batch
+
+    # 워밍업 (워커 프로세스 기동)
+    await run_load(url, bodies[:concurrency], concurrency, f"/{endpoint}")
+
+    start = time.perf_counter()
+    latencies, errors = await run_load(url, bodies, concurrency, f"/{endpoint}")
+    elapsed = time.perf_counter() - start
+
+    if server_task is not None:
+        server_task.cancel()
+        try:
+            await server_task
+        except asyncio.CancelledError:
+            pass
+
+    latencies.sort()
+    verifications = len(latencies) * per_request
+    report = {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "verifications": verifications,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "verifications_per_s": round(verifications / elapsed, 1),
+        "target_per_s": TARGET_VERIFY_PER_SEC[endpoint],
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "cpu_count": os.cpu_count(),
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    spawn = "--spawn" in args
+    if spawn:
+        args.remove("--spawn")
+    url = _take_option(args, "--url", "http://127.0.0.1:8600")
+    total = int(_take_option(args, "--requests", 5000))
+    concurrency = int(_take_option(args, "--concurrency", 64))
+    endpoint = _take_option(args, "--endpoint", "verify")
+    batch = int(_take_option(args, "--batch", 500))
+    workers = _take_option(args, "--workers")
+
+    report = asyncio.run(main(url, total, concurrency, endpoint, batch, spawn, int(workers) if workers else None))
+    ok = report["errors"] == 0 and report["verifications_per_s"] >= report["target_per_s"]
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,251 @@
+"""
+Streamlit 앱 부하 테스트 (로컬, headless)
+
+    python bench/loadtest_streamlit.py [--sessions 50] [--concurrency 8] [--memory-sessions 10]
+                                       [--save result.json] [--compare baseline.json] [--threshold 0.25]
+
+streamlit.testing.v1.AppTest 로 streamlit_lottery.py 세션 sessions 개를 만들어 concurrency 개씩 동시에
+다음 흐름을 실행합니다 (브라우저/서버 없이 같은 프로세스에서 스크립트를 실행).
+
+    load → generate → upload_commitment → draw → upload_reveal → verify → verify_warm
+
+세션마다 새 Commitment(새 nonce)를 만들므로 verify 는 검증 캐시에 없는 값(cold)이고,
+같은 버튼을 한 번 더 누르는 verify_warm 은 캐시 적중입니다. 두 값을 따로 보고합니다.
+
+상호작용별 지연 p50/p95/p99, 세션당 전체 재실행(rerun) 횟수, 세션당 메모리(tracemalloc,
+memory-sessions 개를 따로 실행해 측정)를 JSON 으로 출력합니다. --compare 로 기준 결과와 비교해
+p95 가 threshold 보다 느려진 상호작용이 있으면 종료 코드 1 을 반환합니다.
+
+AppTest 는 파일 업로드 위젯을 조작할 수 없으므로, 실행 중에는 st.file_uploader 를 세션 상태
+(UPLOAD_KEY)에 넣어 둔 JSON 을 돌려주는 함수로 바꿔 "JSON 파일 업로드" 경로를 그대로 지나가게 합니다.
+"""
+
+import gc
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "streamlit_lottery.py")
+
+# 업로드할 JSON 을 넣어 두는 세션 상태 키 ({위젯 key 또는 label: bytes})
+UPLOAD_KEY = "_loadtest_uploads"
+# 전체 재실행 횟수를 세는 세션 상태 키 (set_page_config 는 전체 실행 때만 호출됨)
+RERUN_KEY = "_loadtest_full_reruns"
+# AppTest 한 번 실행의 제한 시간(초)
+RUN_TIMEOUT = 30
+
+INTERACTIONS = ["load", "generate", "upload_commitment", "draw", "upload_reveal", "verify", "verify_warm"]
+
+
+class _Upload(io.BytesIO):
+    """st.file_uploader 가 돌려주는 UploadedFile 대신 쓰는 파일 객체"""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def _patches():
+    """file_uploader / set_page_config 를 부하 테스트용으로 바꾸는 patch 목록"""
+    import streamlit as st
+
+    real_set_page_config = st.set_page_config
+
+    def file_uploader(label, *args, key=None, **kwargs):
+        data = st.session_state.get(UPLOAD_KEY, {}).get(key or label)
+        return _Upload(f"{key or 'upload'}.json", data) if data is not None else None
+
+    def set_page_config(*args, **kwargs):
+        st.session_state[RERUN_KEY] = st.session_state.get(RERUN_KEY, 0) + 1
+        return real_set_page_config(*args, **kwargs)
+
+    return [mock.patch.object(st, "file_uploader", file_uploader),
+            mock.patch.object(st, "set_page_config", set_page_config)]
+
+
+def _widget(widgets, label=None, key=None):
+    """label 또는 key 로 위젯 찾기 (label 로 찾으면 key 가 없는 위젯만)"""
+    for widget in widgets:
+        if key is not None and widget.key == key:
+            return widget
+        if label is not None and widget.label == label and widget.key is None:
+            return widget
+    raise LookupError(f"위젯을 찾을 수 없습니다: {label or key}")
+
+
+def run_session(max_num=1000, winners=3):
+    """세션 하나로 생성 → 추첨 → 검증 흐름 실행 → (AppTest, {"latencies": {상호작용: 초}, "full_reruns", "error"})"""
+    from streamlit.testing.v1 import AppTest
+
+    latencies = {}
+    app = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+
+    def step(name, action):
+        start = time.perf_counter()
+        action()
+        latencies[name] = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(f"{name}: {app.exception[0].message}")
+
+    try:
+        step("load", app.run)
+        step("generate", lambda: app.button(key="gen_commit").click().run())
+        commitment = app.session_state["commitment_data"]
+
+        app.session_state[UPLOAD_KEY] = {"Commitment JSON 파일 선택": json.dumps(commitment).encode()}
+        step("upload_commitment",
+             lambda: _widget(app.radio, label="Commitment 데이터 입력 방법:").set_value("JSON 파일 업로드").run())
+
+        _widget(app.number_input, label="최대값").set_value(max_num)
+        _widget(app.number_input, label="당첨자 수").set_value(winners)
+        step("draw", lambda: app.button(key="do_draw").click().run())
+        reveal = app.session_state["reveal_data"]
+
+        app.session_state[UPLOAD_KEY] = {"verify_upload": json.dumps(reveal).encode()}
+        step("upload_reveal", lambda: _widget(app.radio, key="verify_method").set_value("JSON 파일 업로드").run())
+        for name in ("verify", "verify_warm"):
+            step(name, lambda: app.button(key="do_verify").click().run())
+            if not any("검증 성공" in element.value for element in app.success):
+                raise RuntimeError(f"{name}: 검증 성공 메시지가 없습니다")
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    full_reruns = app.session_state[RERUN_KEY] if RERUN_KEY in app.session_state else 0
+    return app, {"latencies": latencies, "full_reruns": full_reruns, "error": error}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_memory(count):
+    """세션 count 개를 만들어 흐름을 마친 뒤 살아 있는 메모리 증가분 / count (바이트, AppTest 객체 포함)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        sessions = [run_session() for _ in range(count)]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del sessions
+    return retained // max(count, 1)
+
+
+def run(sessions=50, concurrency=8, memory_sessions=10):
+    """부하 테스트 실행 → 보고서 dict"""
+    try:
+        import streamlit
+        from streamlit.testing.v1 import AppTest  # noqa: F401
+    except ImportError:
+        print("❌ streamlit 이 설치되어 있지 않습니다: pip install -r requirements_lottery.txt", file=sys.stderr)
+        sys.exit(2)
+
+    patches = _patches()
+    for patch in patches:
+        patch.start()
+    try:
+        run_session()  # 워밍업 (import, 첫 컴파일)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = [result for _, result in pool.map(lambda _: run_session(), range(sessions))]
+        elapsed = time.perf_counter() - start
+        memory_per_session = measure_memory(memory_sessions) if memory_sessions else None
+    finally:
+        for patch in patches:
+            patch.stop()
+
+    errors = [r["error"] for r in results if r["error"]]
+    interactions = {}
+    for name in INTERACTIONS:
+        values = sorted(r["latencies"][name] for r in results if name in r["latencies"])
+        interactions[name] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+    full_reruns = [r["full_reruns"] for r in results]
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "streamlit": streamlit.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_s": round(sessions / elapsed, 2),
+        "errors": len(errors),
+        "first_errors": errors[:5],
+        "interactions": interactions,
+        "runs_per_session": len(INTERACTIONS),
+        "full_reruns_per_session": round(statistics.mean(full_reruns), 2) if full_reruns else 0,
+        "memory_per_session_kb": round(memory_per_session / 1024, 1) if memory_per_session is not None else None,
+    }
+
+
+def compare(current, baseline, threshold):
+    """기준 결과와 상호작용별 p95 비교 → 느려진 항목 목록 (비율 = 현재 / 기준)"""
+    regressions = []
+    print(f"{'interaction':<20} {'baseline p95':>14} {'current p95':>14} {'ratio':>7}")
+    for name, stats in current["interactions"].items():
+        old = baseline["interactions"].get(name)
+        if not old or not old["p95_ms"]:
+            continue
+        ratio = stats["p95_ms"] / old["p95_ms"]
+        mark = " ❌" if ratio > 1 + threshold else ""
+        print(f"{name:<20} {old['p95_ms']:>12.2f}ms {stats['p95_ms']:>12.2f}ms {ratio:>7.2f}{mark}")
+        if mark:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sessions = int(_take_option(args, "--sessions", 50))
+    concurrency = int(_take_option(args, "--concurrency", 8))
+    memory_sessions = int(_take_option(args, "--memory-sessions", 10))
+    save = _take_option(args, "--save")
+    baseline = _take_option(args, "--compare")
+    threshold = float(_take_option(args, "--threshold", 0.25))
+
+    report = run(sessions, concurrency, memory_sessions)
+    if save:
+        with open(save, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if report["errors"]:
+        print(f"\n❌ {report['errors']}개 세션에서 오류가 발생했습니다.")
+        sys.exit(1)
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(report, json.load(f), threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)}개 상호작용의 p95 가 {threshold:.0%} 이상 느려졌습니다.")
+            sys.exit(1)
+        print("\n✅ 기준 대비 성능 저하 없음")
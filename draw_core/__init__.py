@@ -0,0 +1,23 @@
+"""
+공정한 추첨 시스템 핵심 로직 (Commitment Scheme)
+
+CLI(random_draw.py)와 Streamlit 앱(streamlit_lottery.py)이 함께 사용합니다.
+표준 라이브러리만 사용하며, 짧게 실행되는 검증 프로세스가 빨리 뜨도록
+무거운 모듈을 import 하지 않습니다 (python -m draw_core.importcheck 로 확인).
+"""
+
+from .commitment import KST, compute_commitment_hash, derive_seed, derive_subseed, make_commitment
+from .draw import draw_numbers, draw_reveal, draw_subdraws, verify_drawing, verify_record
+
+__all__ = [
+    "KST",
+    "compute_commitment_hash",
+    "derive_seed",
+    "derive_subseed",
+    "make_commitment",
+    "draw_numbers",
+    "draw_reveal",
+    "draw_subdraws",
+    "verify_drawing",
+    "verify_record",
+]
@@ -0,0 +1,328 @@
+"""
+고정 폭 바이너리 추첨 아카이브 (.drawarc)
+
+JSON reveal 레코드(해시 64자, nonce 64자, ISO 타임스탬프 ...)는 한 건에 수백 바이트지만,
+여기서는 한 건을 128바이트 고정 폭으로 저장합니다.
+
+- 레코드: 32바이트 hash, 32바이트 nonce, int64 epoch 마이크로초 + UTC 오프셋(분),
+  min_num / max_num / result (int64), seed_value / winners (uint32), 플래그
+- 고정 폭에 들어가지 않는 값(여러 당첨 번호, Merkle 증명, 가중치 정보, int64 를 넘는 범위,
+  다시 만들 수 없는 형식의 타임스탬프 등)은 파일 끝의 extras 영역에 JSON 으로 둡니다.
+  그래서 어떤 레코드든 JSON 으로 내보내면 원래 값과 같습니다 (무손실).
+- 헤더 64바이트 뒤에 레코드가 이어지므로 mmap / NumPy structured array 로
+  복사 없이 읽을 수 있습니다 (records_array).
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+ARCHIVE_MAGIC = b"DRAWARC1"
+ARCHIVE_VERSION = 1
+
+# 헤더: magic, 버전, 레코드 크기, 레코드 수, extras 시작 위치 (64바이트로 채움)
+HEADER = struct.Struct("<8sIIQQ32x")
+
+# 레코드 (128바이트, 모든 필드가 자기 크기에 정렬됨)
+RECORD = struct.Struct("<32s32sqqqqQIIIhH8x")
+
+# 레코드에 어떤 필드가 있는지 나타내는 플래그
+HAS_HASH = 1 << 0
+HAS_NONCE = 1 << 1
+HAS_TIMESTAMP = 1 << 2
+HAS_SEED = 1 << 3
+HAS_MIN = 1 << 4
+HAS_MAX = 1 << 5
+HAS_RESULT = 1 << 6
+HAS_WINNERS = 1 << 7
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+KST_MINUTES = 9 * 60
+_INT64 = (-2**63, 2**63 - 1)
+_UINT32 = (0, 2**32 - 1)
+
+# 고정 폭 정수 필드: (JSON 키, 플래그, 허용 범위)
+_INT_FIELDS = (
+    ("seed_value", HAS_SEED, _UINT32),
+    ("min_num", HAS_MIN, _INT64),
+    ("max_num", HAS_MAX, _INT64),
+    ("result", HAS_RESULT, _INT64),
+    ("winners", HAS_WINNERS, _UINT32),
+)
+
+
+def records_dtype():
+    """RECORD 와 같은 배치의 NumPy structured dtype (NumPy 필요)"""
+    import numpy as np
+
+    return np.dtype([
+        ("commitment_hash", "u1", (32,)),
+        ("nonce", "u1", (32,)),
+        ("timestamp_us", "<i8"),
+        ("min_num", "<i8"),
+        ("max_num", "<i8"),
+        ("result", "<i8"),
+        ("extra_offset", "<u8"),
+        ("extra_length", "<u4"),
+        ("seed_value", "<u4"),
+        ("winners", "<u4"),
+        ("utc_offset_min", "<i2"),
+        ("flags", "<u2"),
+        ("_pad", "V8"),
+    ])
+
+
+def _pack_hex(value):
+    """64자 소문자 hex → 32바이트 (다시 hex 로 만들었을 때 같을 때만), 아니면 None"""
+    if not isinstance(value, str) or len(value) != 64:
+        return None
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return raw if raw.hex() == value else None
+
+
+def _pack_timestamp(value):
+    """ISO 타임스탬프 → (epoch 마이크로초, UTC 오프셋 분). 그대로 복원되지 않으면 None"""
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    offset = dt.utcoffset()
+    if offset is None or offset % timedelta(minutes=1):
+        return None
+    micros = (dt - _EPOCH) // timedelta(microseconds=1)
+    minutes = offset // timedelta(minutes=1)
+    if _format_timestamp(micros, minutes) != value:
+        return None
+    return micros, minutes
+
+
+@lru_cache(maxsize=None)
+def _timezone(minutes):
+    return timezone(timedelta(minutes=minutes))
+
+
+def _format_timestamp(micros, minutes):
+    return (_EPOCH + timedelta(microseconds=micros)).astimezone(_timezone(minutes)).isoformat()
+
+
+def pack_record(record, extra_offset=0):
+    """레코드 dict → (128바이트 레코드, extras JSON bytes)
+
+    고정 폭에 넣을 수 없는 항목은 모두 extras 로 갑니다.
+    """
+    extra = dict(record)
+    flags = 0
+    hash_raw = _pack_hex(extra.get("commitment_hash"))
+    if hash_raw is not None:
+        flags |= HAS_HASH
+        del extra["commitment_hash"]
+    nonce_raw = _pack_hex(extra.get("nonce"))
+    if nonce_raw is not None:
+        flags |= HAS_NONCE
+        del extra["nonce"]
+    micros = minutes = 0
+    packed_time = _pack_timestamp(extra.get("timestamp"))
+    if packed_time is not None:
+        flags |= HAS_TIMESTAMP
+        micros, minutes = packed_time
+        del extra["timestamp"]
+
+    ints = {}
+    for key, flag, (low, high) in _INT_FIELDS:
+        value = extra.get(key)
+        if type(value) is int and low <= value <= high:
+            flags |= flag
+            ints[key] = value
+            del extra[key]
+
+    extra_bytes = json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode() if extra else b""
+    packed = RECORD.pack(
+        hash_raw or b"", nonce_raw or b"", micros,
+        ints.get("min_num", 0), ints.get("max_num", 0), ints.get("result", 0),
+        extra_offset if extra_bytes else 0, len(extra_bytes),
+        ints.get("seed_value", 0), ints.get("winners", 0), minutes, flags
+    )
+    return packed, extra_bytes
+
+
+def unpack_record(buffer, offset, extras=b"", extras_start=0):
+    """buffer 의 offset 위치 레코드 → 원래 JSON 형식의 dict
+
+    키 순서는 draw_reveal 과 같은 순서의 고정 항목 뒤에 extras 항목이 옵니다.
+    """
+    (hash_raw, nonce_raw, micros, min_num, max_num, result, extra_offset, extra_length,
+     seed_value, winners, minutes, flags) = RECORD.unpack_from(buffer, offset)
+    record = {}
+    if flags & HAS_HASH:
+        record["commitment_hash"] = hash_raw.hex()
+    if flags & HAS_TIMESTAMP:
+        record["timestamp"] = _format_timestamp(micros, minutes)
+    if flags & HAS_NONCE:
+        record["nonce"] = nonce_raw.hex()
+    values = {"seed_value": seed_value, "min_num": min_num, "max_num": max_num,
+              "result": result, "winners": winners}
+    for key, flag, _ in _INT_FIELDS:
+        if flags & flag:
+            record[key] = values[key]
+    if extra_length:
+        start = extras_start + extra_offset
+        record.update(json.loads(bytes(extras[start:start + extra_length])))
+    return record
+
+
+def write_archive(path, records):
+    """레코드들을 아카이브 파일로 저장 → 저장한 레코드 수
+
+    레코드는 차례로 쓰고 extras 는 임시 파일에 모았다가 끝에 붙이므로
+    레코드 수와 상관없이 메모리를 일정하게 씁니다. 같은 디렉터리의 임시 파일에 모두 쓰고
+    fsync 한 뒤 교체하므로, 중간에 오류가 나면 임시 파일만 지우고 path 는 건드리지 않습니다.
+    """
+    count = 0
+    extra_size = 0
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f, tempfile.TemporaryFile() as extras:
+            f.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, RECORD.size, 0, 0))
+            for record in records:
+                packed, extra_bytes = pack_record(record, extra_size)
+                f.write(packed)
+                if extra_bytes:
+                    extras.write(extra_bytes)
+                    extra_size += len(extra_bytes)
+                count += 1
+            extras_start = f.tell()
+            extras.seek(0)
+            shutil.copyfileobj(extras, f)
+            f.seek(0)
+            f.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, RECORD.size, count, extras_start))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+class Archive:
+    """아카이브 파일을 mmap 으로 열어 레코드를 읽기 (with 문으로 사용)
+
+        with Archive("draws.drawarc") as arc:
+            arc[0]                       # dict (JSON 과 같은 형식)
+            for record in arc: ...
+            arc.records_array()          # NumPy structured array (복사 없음)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            self._file.close()
+            raise ValueError(f"아카이브 파일이 아닙니다: {path}")
+        magic, version, record_size, self.count, self.extras_start = HEADER.unpack(header)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION or record_size != RECORD.size:
+            self._file.close()
+            raise ValueError(f"아카이브 파일이 아니거나 지원하지 않는 버전입니다: {path}")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"레코드 번호 범위를 벗어났습니다: {index} (레코드 {self.count}개)")
+        return unpack_record(self._mm, HEADER.size + index * RECORD.size, self._mm, self.extras_start)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield unpack_record(self._mm, HEADER.size + index * RECORD.size, self._mm, self.extras_start)
+
+    def records_array(self):
+        """레코드 영역 전체를 NumPy structured array 로 (읽기 전용 memmap, 복사 없음)"""
+        import numpy as np
+
+        return np.memmap(self.path, dtype=records_dtype(), mode="r",
+                         offset=HEADER.size, shape=(self.count,))
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_json_records(fileobj):
+    """JSONL 또는 JSON(레코드 하나 / 배열, 들여쓰기 포함) 파일 → 레코드 dict 생성"""
+    first_line = fileobj.readline()
+    try:
+        data = json.loads(first_line) if first_line.strip() else None
+    except ValueError:
+        # 첫 줄만으로 JSON 이 아니면 reveal.json 같은 들여쓰기 JSON 파일
+        data = json.loads(first_line + fileobj.read())
+        yield from data if isinstance(data, list) else [data]
+        return
+    if data is not None:
+        yield from data if isinstance(data, list) else [data]
+    for line in fileobj:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def summary(path):
+    """아카이브 요약 (전체 스캔) → {"count", "revealed", "with_extras", "first", "last", "bytes"}
+
+    first / last 는 가장 이른/늦은 타임스탬프(KST)입니다. NumPy 가 있으면 레코드 영역을 복사 없이 벡터 연산으로 훑습니다.
+    """
+    with Archive(path) as arc:
+        info = {"count": arc.count, "bytes": os.path.getsize(path)}
+        if not arc.count:
+            return {**info, "revealed": 0, "with_extras": 0, "first": None, "last": None}
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            rows = arc.records_array()
+            flags = rows["flags"]
+            timed = (flags & HAS_TIMESTAMP) != 0
+            info["revealed"] = int(np.count_nonzero(flags & HAS_RESULT))
+            info["with_extras"] = int(np.count_nonzero(rows["extra_length"]))
+            times = rows["timestamp_us"][timed]
+            first = int(times.min()) if times.size else None
+            last = int(times.max()) if times.size else None
+            del rows
+        else:
+            revealed = with_extras = 0
+            first = last = None
+            for index in range(arc.count):
+                fields = RECORD.unpack_from(arc._mm, HEADER.size + index * RECORD.size)
+                flags = fields[11]
+                revealed += bool(flags & HAS_RESULT)
+                with_extras += bool(fields[7])
+                if flags & HAS_TIMESTAMP:
+                    first = fields[2] if first is None else min(first, fields[2])
+                    last = fields[2] if last is None else max(last, fields[2])
+            info["revealed"] = revealed
+            info["with_extras"] = with_extras
+    info["first"] = _format_timestamp(first, KST_MINUTES) if first is not None else None
+    info["last"] = _format_timestamp(last, KST_MINUTES) if last is not None else None
+    return info
@@ -0,0 +1,315 @@
+"""
+추첨 공정성 감사 (몬테카를로)
+
+    python random_draw.py audit <trials> [--ranges 7,10,1000000007] [--winners 3] [--engine numpy] [--checkpoint audit.ckpt]
+
+실제 파이프라인 sha256(timestamp + nonce) % 2^32 → random.seed → randint(min_num, max_num) 으로
+모의 추첨을 trials 번 실행하고, 범위마다 당첨 번호의 분포가 균등한지 검정합니다.
+--winners k 이면 희소 Fisher-Yates 로 뽑은 k 개를 모두 세므로 범위마다 trials × k 개를 검정합니다
+(한 추첨 안의 k 개는 중복이 없어 서로 약하게 음의 상관이 있고, 검정은 그만큼 보수적입니다).
+
+- 모의 추첨 i 의 nonce 는 sha256("{label}:{i}") 이므로, 같은 설정이면 워커 수, 묶음 크기,
+  엔진과 관계없이 같은 개수(counts_sha256)가 나옵니다. 보고서를 누구나 다시 만들 수 있습니다.
+- 범위 크기가 bins 보다 크면 결과를 bins 개의 연속 구간으로 묶고 구간 폭에 비례한 기대값과 비교합니다.
+- 범위마다 카이제곱 검정, KS 검정(구간 경계에서 누적 분포의 최대 차이), 구간별 편차 z 를 계산합니다.
+  범위가 여러 개이므로 유의수준은 범위 수로 나눠(Bonferroni) 판정합니다.
+- 체크포인트 파일에 끝난 추첨 수와 누적 개수를 주기적으로 저장하여, 중단된 실행을 이어서 합니다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from functools import partial
+
+from .commitment import derive_seed
+from .draw import draw_numbers
+
+# 모의 추첨에 쓰는 고정 timestamp (nonce 만 바뀜)
+AUDIT_TIMESTAMP = "2025-01-01T00:00:00+09:00"
+DEFAULT_LABEL = "fairness-audit"
+DEFAULT_RANGES = "7,10,100,1000000007"
+DEFAULT_BINS = 1000
+DEFAULT_ALPHA = 0.001
+
+# 워커 하나에 보내는 모의 추첨 수 (NumPy 엔진은 npengine.BLOCK_SIZE 단위로 나눠 처리)
+CHUNK_SIZE = 20000
+NP_CHUNK_SIZE = 65536
+# 체크포인트 저장 간격(초)
+CHECKPOINT_INTERVAL = 30.0
+
+CHECKPOINT_VERSION = 1
+
+
+def trial_seed(label, timestamp, index):
+    """모의 추첨 index 의 시드 (nonce = sha256("{label}:{index}"))"""
+    nonce = hashlib.sha256(f"{label}:{index}".encode()).hexdigest()
+    return derive_seed(timestamp, nonce)
+
+
+def bucket_bounds(size, bins):
+    """범위 크기 size 를 min(bins, size) 개 구간으로 나눈 경계 → [0, ..., size]
+
+    x (0 ~ size-1) 는 x * 구간 수 // size 번째 구간에 들어갑니다.
+    """
+    count = min(bins, size)
+    return [-(-b * size // count) for b in range(count + 1)]
+
+
+def make_config(trials, ranges, bins=DEFAULT_BINS, label=DEFAULT_LABEL, timestamp=AUDIT_TIMESTAMP, winners=1):
+    for min_num, max_num in ranges:
+        if min_num > max_num:
+            raise ValueError(f"잘못된 범위입니다: {min_num} ~ {max_num}")
+        if winners < 1 or winners > max_num - min_num + 1:
+            raise ValueError(f"당첨자 수는 1 ~ {max_num - min_num + 1} 사이여야 합니다: {winners}")
+    return {
+        "version": CHECKPOINT_VERSION,
+        "label": label,
+        "timestamp": timestamp,
+        "ranges": [[min_num, max_num] for min_num, max_num in ranges],
+        "bins": bins,
+        "winners": winners,
+        "trials": trials,
+    }
+
+
+def _empty_counts(config):
+    return [[0] * min(config["bins"], max_num - min_num + 1) for min_num, max_num in config["ranges"]]
+
+
+def _audit_span_python(config, start, stop):
+    ranges = [(min_num, max_num - min_num + 1) for min_num, max_num in config["ranges"]]
+    counts = _empty_counts(config)
+    buckets = [len(c) for c in counts]
+    label, timestamp = config["label"], config["timestamp"]
+    winners = config.get("winners", 1)
+    rng = random.Random()
+    for i in range(start, stop):
+        rng.seed(trial_seed(label, timestamp, i))
+        state = rng.getstate() if len(ranges) > 1 else None
+        for r, (min_num, size) in enumerate(ranges):
+            if r:
+                rng.setstate(state)
+            for x in draw_numbers(rng, min_num, min_num + size - 1, winners):
+                counts[r][(x - min_num) * buckets[r] // size] += 1
+    return counts
+
+
+def _audit_span_numpy(config, start, stop):
+    import numpy as np
+
+    from . import npengine
+
+    if not npengine.available():
+        return _audit_span_python(config, start, stop)
+    ranges = [(min_num, max_num - min_num + 1) for min_num, max_num in config["ranges"]]
+    if any(size >= 2**64 for _, size in ranges):
+        return _audit_span_python(config, start, stop)
+    totals = [np.zeros(min(config["bins"], size), dtype=np.int64) for _, size in ranges]
+    label, timestamp = config["label"], config["timestamp"]
+
+    for block_start in range(start, stop, npengine.BLOCK_SIZE):
+        block_stop = min(stop, block_start + npengine.BLOCK_SIZE)
+        seeds = np.fromiter((trial_seed(label, timestamp, i) for i in range(block_start, block_stop)),
+                            dtype=np.uint32, count=block_stop - block_start)
+        drawn = npengine.draw_offsets(seeds, [size for _, size in ranges], config.get("winners", 1))
+        for r, (_, size) in enumerate(ranges):
+            x = drawn[r].ravel()
+            buckets = len(totals[r])
+            if size * buckets < 2**64:
+                bucket = (x * np.uint64(buckets)) // np.uint64(size)
+            else:
+                bucket = np.array([v * buckets // size for v in x.tolist()], dtype=np.uint64)
+            totals[r] += np.bincount(bucket.astype(np.intp), minlength=buckets)
+    return [t.tolist() for t in totals]
+
+
+def audit_span(config, engine, span):
+    """모의 추첨 start ~ stop-1 실행 → 범위별 구간 개수 (워커에서 실행)"""
+    start, stop = span
+    if engine == "numpy":
+        return _audit_span_numpy(config, start, stop)
+    return _audit_span_python(config, start, stop)
+
+
+# ---------- 체크포인트 ----------
+
+def load_checkpoint(path):
+    with open(path, 'r') as f:
+        state = json.load(f)
+    if state.get("config", {}).get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"지원하지 않는 체크포인트입니다: {path}")
+    return state
+
+
+def save_checkpoint(state, path):
+    """임시 파일에 쓴 뒤 교체 (저장 중 중단되어도 이전 체크포인트가 남음)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def _same_audit(a, b):
+    keys = ("version", "label", "timestamp", "ranges", "bins")
+    return all(a[key] == b[key] for key in keys) and a.get("winners", 1) == b.get("winners", 1)
+
+
+def run_audit(config, workers=1, engine="python", checkpoint=None, progress=None):
+    """감사 실행 (체크포인트가 있으면 이어서) → {"config", "engine", "done", "counts", "elapsed_s"}
+
+    checkpoint 의 설정이 config 와 다르면 ValueError 를 발생시킵니다. trials 는 늘릴 수 있습니다.
+    progress(done, trials) 는 묶음이 끝날 때마다 호출됩니다. 중단(KeyboardInterrupt)되면
+    체크포인트를 저장하고 다시 발생시킵니다.
+    """
+    state = {"config": config, "engine": engine, "done": 0, "counts": _empty_counts(config), "elapsed_s": 0.0}
+    if checkpoint and os.path.exists(checkpoint):
+        saved = load_checkpoint(checkpoint)
+        if not _same_audit(saved["config"], config):
+            raise ValueError(f"체크포인트의 감사 설정이 다릅니다: {checkpoint}")
+        state.update(done=saved["done"], counts=saved["counts"], elapsed_s=saved.get("elapsed_s", 0.0))
+
+    trials = config["trials"]
+    chunk = CHUNK_SIZE if engine == "python" else NP_CHUNK_SIZE
+    spans = [(start, min(trials, start + chunk)) for start in range(state["done"], trials, chunk)]
+    func = partial(audit_span, config, engine)
+    if workers == 1:
+        results = map(func, spans)
+    else:
+        from .batch import ordered_pool_map
+        results = ordered_pool_map(func, spans, workers)
+
+    started = time.perf_counter()
+    base_elapsed = state["elapsed_s"]
+    last_save = time.monotonic()
+    try:
+        for (_, stop), counts in zip(spans, results):
+            for total, part in zip(state["counts"], counts):
+                for b, n in enumerate(part):
+                    total[b] += n
+            state["done"] = stop
+            state["elapsed_s"] = base_elapsed + time.perf_counter() - started
+            if progress:
+                progress(stop, trials)
+            if checkpoint and time.monotonic() - last_save >= CHECKPOINT_INTERVAL:
+                save_checkpoint(state, checkpoint)
+                last_save = time.monotonic()
+    finally:
+        if checkpoint:
+            save_checkpoint(state, checkpoint)
+    return state
+
+
+# ---------- 검정 ----------
+
+def _chi2_sf(x, df):
+    """카이제곱 분포의 상단 꼬리 확률 P(X >= x) (정규화 불완전 감마 함수 Q(df/2, x/2))"""
+    if x <= 0:
+        return 1.0
+    a, x = df / 2, x / 2
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # 급수: P(a, x)
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+    # 연분수 (Lentz): Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def _ks_sf(d, n):
+    """Kolmogorov 분포로 근사한 KS 통계량의 p-value (이산 분포에서는 보수적)"""
+    sqrt_n = math.sqrt(n)
+    lam = (sqrt_n + 0.12 + 0.11 / sqrt_n) * d
+    if lam < 0.2:
+        return 1.0
+    total = sum(2 * (-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam) for k in range(1, 101))
+    return min(1.0, max(0.0, total))
+
+
+def analyze_range(min_num, max_num, bins, counts):
+    """한 범위의 구간 개수 → 검정 결과 dict (구간별 관측/기대/z 포함)"""
+    size = max_num - min_num + 1
+    bounds = bucket_bounds(size, bins)
+    n = sum(counts)
+    chi2 = 0.0
+    ks = 0.0
+    cum_observed = cum_expected = 0.0
+    buckets = []
+    worst = None
+    for b, observed in enumerate(counts):
+        width = bounds[b + 1] - bounds[b]
+        expected = n * width / size
+        z = (observed - expected) / math.sqrt(expected) if expected else 0.0
+        chi2 += (observed - expected) ** 2 / expected if expected else 0.0
+        cum_observed += observed
+        cum_expected += expected
+        ks = max(ks, abs(cum_observed - cum_expected) / n if n else 0.0)
+        bucket = {"min": min_num + bounds[b], "max": min_num + bounds[b + 1] - 1,
+                  "observed": observed, "expected": round(expected, 3), "z": round(z, 3)}
+        buckets.append(bucket)
+        if worst is None or abs(z) > abs(worst["z"]):
+            worst = bucket
+    df = len(counts) - 1
+    return {
+        "min_num": min_num,
+        "max_num": max_num,
+        "buckets": len(counts),
+        "trials": n,
+        "chi2": round(chi2, 3),
+        "df": df,
+        "chi2_p": _chi2_sf(chi2, df) if df else 1.0,
+        "ks_d": ks,
+        "ks_p": _ks_sf(ks, n) if n else 1.0,
+        "max_abs_z": abs(worst["z"]) if worst else 0.0,
+        "worst_bucket": worst,
+        "bucket_detail": buckets,
+    }
+
+
+def make_report(state, alpha=DEFAULT_ALPHA):
+    """감사 상태 → 보고서 dict (범위별 검정, 재현용 설정과 counts_sha256)"""
+    config = state["config"]
+    threshold = alpha / max(1, len(config["ranges"]))
+    ranges = []
+    for (min_num, max_num), counts in zip(config["ranges"], state["counts"]):
+        result = analyze_range(min_num, max_num, config["bins"], counts)
+        result["suspicious"] = result["chi2_p"] < threshold or result["ks_p"] < threshold
+        ranges.append(result)
+    counts_json = json.dumps(state["counts"], separators=(",", ":"))
+    return {
+        "config": {**config, "trials": state["done"]},
+        "pipeline": "sha256(timestamp + sha256(label:i)) % 2^32 → random.seed → "
+                    + ("randint(min_num, max_num)" if config.get("winners", 1) == 1
+                       else f"희소 Fisher-Yates (winners={config['winners']})"),
+        "engine": state["engine"],
+        "elapsed_s": round(state["elapsed_s"], 3),
+        "alpha": alpha,
+        "alpha_per_range": threshold,
+        "counts_sha256": hashlib.sha256(counts_json.encode()).hexdigest(),
+        "passed": not any(r["suspicious"] for r in ranges),
+        "ranges": ranges,
+    }
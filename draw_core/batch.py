@@ -0,0 +1,294 @@
+"""
+JSONL reveal 레코드 배치 검증 (프로세스 풀, 입력 순서 유지)
+"""
+
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from functools import partial
+
+from .draw import LimitExceeded, PathNotAllowed, confine_record, verify_record
+
+# 한 번에 워커로 보내는 레코드 수
+BATCH_CHUNK_SIZE = 512
+
+# NumPy 엔진의 묶음 크기 (작으면 벡터화 이득이 없음)
+NP_CHUNK_SIZE = 16384
+
+# 업로드 검증(VerifyJob) 한 건이 읽는 최대 레코드 수와 보관하는 결과/실패 수
+JOB_MAX_RECORDS = 1_000_000
+JOB_MAX_RESULTS = 50_000
+JOB_MAX_FAILURES = 10_000
+# ZIP 안의 .json 멤버 최대 크기 (압축 해제 후)
+MAX_MEMBER_BYTES = 16 * 1024 * 1024
+
+
+def verify_lines(numbered_lines, engine="python", untrusted=False, data_dir=None):
+    """(줄 번호, JSONL 문자열) 묶음을 검증하여 (실패 수, 결과 JSON 문자열 목록) 반환
+
+    engine="numpy" 이면 묶음 전체의 추첨 재현을 npengine 으로 벡터화합니다
+    (NumPy 가 없으면 순수 Python 으로 계산, 결과는 같음).
+    untrusted 이면 레코드의 당첨자 수/범위와 파일 경로를 draw.confine_record(data_dir) 로 제한합니다
+    (허용되지 않으면 error: limit_exceeded 또는 path_not_allowed).
+    """
+    if engine == "numpy":
+        from .npengine import verify_lines as verify_lines_np
+        return verify_lines_np(numbered_lines, untrusted, data_dir)
+    failed = 0
+    output = []
+    for line_no, line in numbered_lines:
+        try:
+            record = json.loads(line)
+            if untrusted:
+                record = confine_record(record, data_dir)
+            outcome = verify_record(record)
+        except LimitExceeded as e:
+            outcome = {"ok": False, "error": "limit_exceeded", "detail": str(e)}
+        except PathNotAllowed as e:
+            outcome = {"ok": False, "error": "path_not_allowed", "detail": str(e)}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            outcome = {"ok": False, "error": "invalid_record", "detail": str(e)}
+        outcome["line"] = line_no
+        failed += not outcome["ok"]
+        output.append(json.dumps(outcome, ensure_ascii=False))
+    return failed, output
+
+
+def verify_jsonl_bytes(data, first_line=1, untrusted=False, data_dir=None):
+    """JSONL bytes 조각(줄 단위로 자른 것) 검증 → (실패 수, 결과 JSON 문자열 목록)
+
+    줄 번호는 first_line 부터 줄바꿈(LF) 기준으로 세고, UTF-8 이 아닌 바이트는 U+FFFD 로 바꿉니다.
+    서버가 큰 본문을 이벤트 루프에서 디코드/분할하지 않고 워커에 넘길 때 씁니다.
+    """
+    numbered = [(line_no, line.decode('utf-8', 'replace'))
+                for line_no, line in enumerate(data.split(b"\n"), first_line) if line.strip()]
+    return verify_lines(numbered, untrusted=untrusted, data_dir=data_dir)
+
+
+def records_to_jsonl(raw_body):
+    """{"records": [...]} JSON 본문 → 레코드마다 한 줄인 JSONL bytes (그런 본문이 아니면 None)
+
+    파싱과 직렬화를 워커 프로세스에서 하도록 bytes 로 주고받습니다.
+    """
+    try:
+        body = json.loads(raw_body)
+    except ValueError:
+        return None
+    if not (isinstance(body, dict) and "records" in body):
+        return None
+    return "\n".join(json.dumps(record, ensure_ascii=False) for record in body["records"]).encode('utf-8')
+
+
+def split_jsonl(data, size):
+    """JSONL bytes 를 약 size 바이트씩 줄 경계에서 자른 (시작, 끝) 위치 생성 (복사 없음)"""
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", start + size) if start + size < len(data) else -1
+        end = len(data) if end < 0 else end + 1
+        yield start, end
+        start = end
+
+
+def read_chunks(lines, chunk_size=BATCH_CHUNK_SIZE):
+    """빈 줄을 건너뛰며 (줄 번호, 문자열) 묶음을 chunk_size 단위로 생성"""
+    return chunk_records(enumerate(lines, 1), chunk_size)
+
+
+def chunk_records(numbered_lines, chunk_size=BATCH_CHUNK_SIZE):
+    """(위치, 문자열) 을 빈 문자열은 건너뛰며 chunk_size 단위 묶음으로 생성"""
+    chunk = []
+    for line_no, line in numbered_lines:
+        line = line.strip()
+        if not line:
+            continue
+        chunk.append((line_no, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_upload_records(fileobj, name):
+    """업로드된 JSONL 또는 reveal 파일 ZIP 을 조금씩 읽어 (위치, 레코드 문자열) 생성
+
+    JSONL 은 줄 단위로, ZIP 은 멤버 단위로 읽으므로 파일 전체를 한 번에 파싱하지 않습니다.
+    위치는 JSONL 이면 줄 번호, ZIP 이면 "멤버 이름" 또는 "멤버 이름:줄 번호" 입니다.
+    ZIP 안의 .json 파일은 reveal 하나 또는 reveal 배열이며, 압축을 푼 크기가 MAX_MEMBER_BYTES 를
+    넘으면 읽기 전에 ValueError 를 냅니다 (압축 폭탄 방지).
+    """
+    import io
+    import zipfile
+
+    if not (name.lower().endswith(".zip") or zipfile.is_zipfile(fileobj)):
+        fileobj.seek(0)
+        yield from enumerate(io.TextIOWrapper(fileobj, encoding="utf-8"), 1)
+        return
+
+    fileobj.seek(0)
+    with zipfile.ZipFile(fileobj) as zf:
+        for info in zf.infolist():
+            member = info.filename
+            if info.is_dir() or os.path.basename(member).startswith("."):
+                continue
+            if not member.lower().endswith(".jsonl") and info.file_size > MAX_MEMBER_BYTES:
+                raise ValueError(f"ZIP 안의 파일이 너무 큽니다: {member} "
+                                 f"({info.file_size:,} 바이트, 최대 {MAX_MEMBER_BYTES:,})")
+            with zf.open(info) as f:
+                if member.lower().endswith(".jsonl"):
+                    for line_no, line in enumerate(io.TextIOWrapper(f, encoding="utf-8"), 1):
+                        yield f"{member}:{line_no}", line
+                    continue
+                text = f.read(MAX_MEMBER_BYTES).decode("utf-8")
+            if text.lstrip().startswith("["):
+                try:
+                    records = json.loads(text)
+                except ValueError:
+                    yield member, text  # invalid_record 로 보고됨
+                    continue
+                for i, record in enumerate(records, 1):
+                    yield f"{member}[{i}]", json.dumps(record)
+            else:
+                yield member, text
+
+
+def ordered_pool_map(func, items, workers, pool=None):
+    """프로세스 풀에서 func 를 실행하되 입력 순서대로, 제한된 개수만 미리 제출
+
+    pool 을 주면 그 풀을 쓰고 닫지 않습니다 (없으면 workers 개짜리 풀을 만들고 끝나면 닫음).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from ordered_pool_map(func, items, workers, pool)
+        return
+    max_in_flight = workers * 2
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# 업로드 검증이 함께 쓰는 프로세스 풀 (업로드마다 풀을 띄우지 않음)
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """CPU 수만큼의 워커를 가진 프로세스 전체 공유 풀 → (풀, 워커 수)"""
+    global _shared_pool
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = os.cpu_count() or 1
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ProcessPoolExecutor(max_workers=workers)
+        return _shared_pool, workers
+
+
+def _discard_shared_pool(pool):
+    """워커가 죽어 망가진 공유 풀을 버려 다음 업로드가 새 풀을 쓰게 함"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+    pool.shutdown(wait=False)
+
+
+def _verify_chunks(chunks, workers, engine="python", untrusted=False, data_dir=None, pool=None):
+    func = verify_lines
+    if engine != "python" or untrusted:
+        func = partial(verify_lines, engine=engine, untrusted=untrusted, data_dir=data_dir)
+    if workers == 1 and pool is None:
+        return map(func, chunks)
+    return ordered_pool_map(func, chunks, workers, pool)
+
+
+def iter_verify(lines, workers=None, chunk_size=None, engine="python"):
+    """JSONL 줄들을 검증하여 묶음마다 (실패 수, 결과 JSON 문자열 목록) 을 입력 순서대로 생성
+
+    workers 가 1 이면 현재 프로세스에서 바로 검증합니다. engine="numpy" 이면
+    벡터화 이득이 나도록 기본 묶음 크기를 키웁니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = BATCH_CHUNK_SIZE if engine == "python" else NP_CHUNK_SIZE
+    return _verify_chunks(read_chunks(lines, chunk_size), workers, engine)
+
+
+class VerifyJob:
+    """(위치, 레코드 문자열) 들을 백그라운드 스레드에서 묶음 단위로 검증
+
+    호출한 스레드(예: Streamlit 스크립트)는 막히지 않고 done / failed / results 로
+    진행 상황을 확인합니다. results 는 입력 순서의 결과 JSON 문자열(앞의 max_results 건),
+    failures 는 실패한 결과 dict 목록(앞의 max_failures 건)이며, done / failed 는 전체 수입니다.
+    max_records 건을 넘게 읽으면 멈추고 truncated 를 켭니다. 업로드처럼 신뢰할 수 없는 입력은
+    untrusted=True 로 파일 경로와 당첨자 수/범위를 제한합니다 (draw.confine_record).
+
+    workers 를 주지 않으면 업로드마다 풀을 만들지 않도록 shared_pool() 을 씁니다.
+    """
+
+    def __init__(self, numbered_lines, workers=None, chunk_size=BATCH_CHUNK_SIZE, untrusted=False, data_dir=None,
+                 max_records=JOB_MAX_RECORDS, max_results=JOB_MAX_RESULTS, max_failures=JOB_MAX_FAILURES):
+        self.pool = None
+        if workers is None:
+            self.pool, workers = shared_pool()
+        self.workers = workers
+        self.done = 0
+        self.failed = 0
+        self.results = []
+        self.failures = []
+        self.finished = False
+        self.truncated = False
+        self.error = None
+        self.max_records = max_records
+        self.max_results = max_results
+        self.max_failures = max_failures
+        self._cancel = threading.Event()
+        self.untrusted = untrusted
+        self.data_dir = data_dir
+        self._thread = threading.Thread(target=self._run, args=(numbered_lines, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _run(self, numbered_lines, chunk_size):
+        # 빈 줄이 아닌 레코드를 max_records + 1 건까지만 읽음 (넘으면 truncated)
+        records = itertools.islice(((pos, line) for pos, line in numbered_lines if line.strip()),
+                                   self.max_records + 1)
+        try:
+            for failed, lines in _verify_chunks(chunk_records(records, chunk_size), self.workers,
+                                                untrusted=self.untrusted, data_dir=self.data_dir, pool=self.pool):
+                if self.done + len(lines) > self.max_records:
+                    lines = lines[:self.max_records - self.done]
+                    failed = sum(not json.loads(line)["ok"] for line in lines)
+                    self.truncated = True
+                if failed and len(self.failures) < self.max_failures:
+                    room = self.max_failures - len(self.failures)
+                    self.failures.extend(itertools.islice((o for o in map(json.loads, lines) if not o["ok"]), room))
+                self.results.extend(lines[:max(0, self.max_results - len(self.results))])
+                self.failed += failed
+                self.done += len(lines)
+                if self._cancel.is_set() or self.truncated:
+                    break
+        except Exception as e:  # 업로드 파일 손상 등은 화면에 표시
+            from concurrent.futures.process import BrokenProcessPool
+            if isinstance(e, BrokenProcessPool) and self.pool is not None:
+                _discard_shared_pool(self.pool)
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.finished = True
+
+    def cancel(self):
+        self._cancel.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
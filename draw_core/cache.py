@@ -0,0 +1,91 @@
+"""
+검증 결과 캐시 (프로세스 전체 공유, 크기 제한 LRU + TTL)
+
+큰 추첨이 발표되면 수많은 시청자가 같은 hash/timestamp/nonce/범위로 검증합니다.
+verify_drawing 은 검증 입력 전체를 키로 결과를 이 캐시에 보관하므로, 같은 프로세스의
+모든 Streamlit 세션과 라이브러리 호출이 SHA-256 과 추첨을 다시 계산하지 않고 결과를 찾습니다.
+
+- 항목 수가 max_size 를 넘으면 가장 오래 쓰지 않은 항목부터 버립니다.
+- 항목은 저장 후 ttl 초가 지나면 만료됩니다 (조회 시 제거).
+- 적중/실패/만료/제거 횟수를 info() 로 확인합니다.
+
+    from draw_core.cache import verify_cache
+    verify_cache.configure(max_size=50000, ttl=300)
+    print(verify_cache.info())
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# verify_drawing 결과 캐시 기본값
+VERIFY_CACHE_SIZE = 10000
+VERIFY_CACHE_TTL = 600.0
+# 당첨자가 이보다 많은 결과는 캐시하지 않음 (항목 하나의 메모리 상한)
+VERIFY_CACHE_MAX_WINNERS = 1000
+
+_MISSING = object()
+
+
+class TTLCache:
+    """스레드 안전한 LRU + TTL 캐시 (max_size=0 이면 꺼짐)"""
+
+    def __init__(self, max_size, ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # 키 → (만료 시각, 값)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    def get(self, key, default=None):
+        """키의 값 (없거나 만료되었으면 default)"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            if entry[0] <= self._clock():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+
+    def configure(self, max_size=None, ttl=None):
+        """크기/TTL 변경 (줄어든 크기는 다음 저장 때 반영)"""
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl is not None:
+                self.ttl = ttl
+
+    def info(self):
+        """현황 → {"hits", "misses", "expired", "evicted", "size", "max_size", "ttl"}"""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_size": self.max_size, "ttl": self.ttl}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# verify_drawing 이 쓰는 프로세스 전체 캐시
+verify_cache = TTLCache(VERIFY_CACHE_SIZE, VERIFY_CACHE_TTL)
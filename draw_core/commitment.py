@@ -0,0 +1,121 @@
+"""
+Commitment 생성, 해시 계산, 시드 생성
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone, timedelta
+
+from . import metrics
+
+# 한국 타임존 (KST = UTC+9)
+KST = timezone(timedelta(hours=9))
+
+# reveal 의 seed_scheme (필드가 없는 기존 reveal 은 SEED_SCHEME_SINGLE)
+SEED_SCHEME_SINGLE = 1   # Commitment 하나에 시드 하나: SHA256(timestamp + nonce)
+SEED_SCHEME_COUNTER = 2  # 하위 추첨 i 의 시드: SHA256(timestamp + nonce + ":" + i)
+SEED_SCHEMES = (SEED_SCHEME_SINGLE, SEED_SCHEME_COUNTER)
+
+
+def compute_commitment_hash(commitment_data):
+    """Commitment 데이터의 SHA-256 해시 계산"""
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    data_string = json.dumps(commitment_data, sort_keys=True)
+    if tracing:
+        t = metrics.lap("json_dump", t)
+    digest = hashlib.sha256(data_string.encode()).hexdigest()
+    if tracing:
+        metrics.lap("sha256", t)
+    return digest
+
+
+def derive_seed(timestamp, nonce):
+    """timestamp + nonce 로부터 32비트 시드 생성"""
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    seed_string = timestamp + nonce
+    seed_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16) % (2**32)
+    if tracing:
+        metrics.lap("seed_reduce", t)
+    return seed_value
+
+
+def derive_subseed(timestamp, nonce, sub_index):
+    """counter 방식: 하위 추첨 sub_index(0부터)의 32비트 시드
+
+    앞선 하위 추첨을 거치지 않고 i 번째 시드를 바로 계산합니다. 공개 전에는 알 수 없는
+    nonce 를 포함하므로 Commitment 해시만으로는 어떤 하위 추첨의 시드도 미리 계산할 수 없습니다.
+    """
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    seed_string = f"{timestamp}{nonce}:{int(sub_index)}"
+    seed_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16) % (2**32)
+    if tracing:
+        metrics.lap("seed_reduce", t)
+    return seed_value
+
+
+def derive_subseeds(timestamp, nonce, indices):
+    """derive_subseed 를 여러 하위 추첨에 대해 계산 → 시드 목록
+
+    timestamp + nonce 접두사를 한 번만 해시하고 상태를 복사해 번호만 이어 붙입니다.
+    """
+    prefix = hashlib.sha256(f"{timestamp}{nonce}:".encode())
+    seeds = []
+    for i in indices:
+        h = prefix.copy()
+        h.update(str(int(i)).encode())
+        seeds.append(int.from_bytes(h.digest()[-4:], "big"))
+    return seeds
+
+
+def make_commitment(extra=None):
+    """현재 한국 시간과 256비트 랜덤 nonce 로 Commitment 생성 → (hash, data)
+
+    extra 의 항목(예: 가중치 파일 해시)은 Commitment 데이터에 함께 포함됩니다.
+    """
+    tracing = metrics.enabled
+    if tracing:
+        start = metrics.clock()
+    commitment_data = {
+        "timestamp": datetime.now(KST).isoformat(),
+        "nonce": os.urandom(32).hex()
+    }
+    if extra:
+        commitment_data.update(extra)
+    if tracing:
+        metrics.lap("entropy", start)
+    commitment_hash = compute_commitment_hash(commitment_data)
+    if tracing:
+        metrics.lap("commit", start)
+    return commitment_hash, commitment_data
+
+
+# make_commitments 가 os.urandom 을 한 번에 읽는 Commitment 수 (32바이트 x 4096 = 128KB)
+ENTROPY_BLOCK = 4096
+
+
+def make_commitments(count, extra=None):
+    """Commitment count 건을 차례로 생성 → (hash, data) 생성기
+
+    nonce 용 난수는 ENTROPY_BLOCK 건 단위로 os.urandom 을 한 번에 읽어 나눠 씁니다.
+    각 Commitment 는 make_commitment 와 같은 형식(현재 KST 시각, 256비트 nonce)입니다.
+    """
+    remaining = count
+    while remaining > 0:
+        block = min(ENTROPY_BLOCK, remaining)
+        entropy = os.urandom(32 * block)
+        for i in range(0, 32 * block, 32):
+            commitment_data = {
+                "timestamp": datetime.now(KST).isoformat(),
+                "nonce": entropy[i:i + 32].hex()
+            }
+            if extra:
+                commitment_data.update(extra)
+            yield compute_commitment_hash(commitment_data), commitment_data
+        remaining -= block
@@ -0,0 +1,414 @@
+"""
+추첨 및 검증 (파일/출력 없음, 스레드 안전)
+"""
+
+import os
+import random
+import threading
+
+from . import metrics
+from .cache import VERIFY_CACHE_MAX_WINNERS, verify_cache
+from .commitment import (SEED_SCHEME_COUNTER, SEED_SCHEME_SINGLE, SEED_SCHEMES, compute_commitment_hash,
+                         derive_seed, derive_subseed, derive_subseeds)
+
+
+def draw_numbers(rng, min_num, max_num, winners=1):
+    """rng 로 min_num ~ max_num 에서 서로 다른 당첨 번호 winners 개를 순서대로 추첨
+
+    희소 Fisher-Yates 셔플: 바뀐 위치만 dict 에 기록하므로 범위 크기와 무관하게
+    O(winners) 시간/메모리를 사용합니다. winners=1 이면 rng.randint(min_num, max_num)
+    와 동일한 결과를 냅니다.
+    """
+    size = max_num - min_num + 1
+    if winners < 1 or winners > size:
+        raise ValueError(f"당첨자 수는 1 ~ {size} 사이여야 합니다: {winners}")
+
+    swapped = {}
+    results = []
+    for i in range(winners):
+        j = rng.randint(i, size - 1)
+        results.append(min_num + swapped.get(j, j))
+        swapped[j] = swapped.get(i, i)
+    return results
+
+
+def _draw(seed_value, min_num, max_num, winners, table=None):
+    """시드로 새 생성기를 만들어 추첨 (계측 시 mt_seed / randint 단계 기록)"""
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    rng = random.Random(seed_value)
+    if tracing:
+        t = metrics.lap("mt_seed", t)
+    if table is not None:
+        from .weighted import weighted_draw
+        results = weighted_draw(table, rng, winners)
+    else:
+        results = draw_numbers(rng, min_num, max_num, winners)
+    if tracing:
+        metrics.lap("randint", t)
+    return results
+
+
+def draw_reveal(commitment_data, min_num=1, max_num=10, winners=1, table=None, roster=None, sub_index=None):
+    """Commitment 데이터로 추첨하여 reveal 데이터(dict) 반환
+
+    추첨마다 별도의 random.Random 인스턴스를 쓰고 전역 random 상태를 건드리지
+    않으므로 여러 스레드에서 동시에 호출해도 안전합니다. random.seed + randint
+    와 비트 단위로 같은 결과를 내므로 기존 reveal 파일도 그대로 검증됩니다.
+    table 로 가중치 alias table 을 주면 가중치 추첨을 합니다.
+    명단 추첨 Commitment(roster_sha256 포함)는 범위가 1 ~ 명단 줄 수로 고정되며,
+    roster 로 연 명단을 주면 당첨 번호의 참가자 줄(roster_entries)도 함께 기록합니다.
+    sub_index 를 주면 counter 방식(seed_scheme 2)으로 그 하위 추첨의 시드를 씁니다.
+    """
+    tracing = metrics.enabled
+    if tracing:
+        start = metrics.clock()
+    commitment_hash = compute_commitment_hash(commitment_data)
+    timestamp_str = commitment_data["timestamp"]
+    nonce = commitment_data["nonce"]
+    if "roster_sha256" in commitment_data:
+        min_num, max_num = 1, int(commitment_data["roster_lines"])
+    if sub_index is None:
+        seed_value = derive_seed(timestamp_str, nonce)
+    else:
+        seed_value = derive_subseed(timestamp_str, nonce, sub_index)
+    results = _draw(seed_value, min_num, max_num, winners, table)
+    reveal_data = _reveal_data(commitment_data, commitment_hash, seed_value, results, min_num, max_num, winners,
+                               table, roster, sub_index)
+    if tracing:
+        metrics.lap("reveal", start)
+    return reveal_data
+
+
+def _reveal_data(commitment_data, commitment_hash, seed_value, results, min_num, max_num, winners, table, roster,
+                 sub_index):
+    """추첨 결과로 reveal 데이터(dict) 작성"""
+    reveal_data = {
+        "commitment_hash": commitment_hash,
+        "timestamp": commitment_data["timestamp"],
+        "nonce": commitment_data["nonce"],
+        "seed_value": seed_value,
+        "min_num": min_num,
+        "max_num": max_num,
+        "result": results[0]
+    }
+    if sub_index is not None:
+        reveal_data["seed_scheme"] = SEED_SCHEME_COUNTER
+        reveal_data["sub_index"] = int(sub_index)
+    if table is not None:
+        del reveal_data["min_num"], reveal_data["max_num"]
+        reveal_data["weights_sha256"] = table.digest
+        reveal_data["entrants"] = len(table.ids)
+        reveal_data["total_weight"] = table.total
+    if "roster_sha256" in commitment_data:
+        reveal_data["roster_sha256"] = commitment_data["roster_sha256"]
+        reveal_data["roster_lines"] = max_num
+    if winners > 1:
+        reveal_data["winners"] = winners
+        reveal_data["results"] = results
+    if roster is not None:
+        reveal_data["roster_entries"] = [roster.entry(number) for number in results]
+    return reveal_data
+
+
+def draw_subdraws(commitment_data, count, min_num=1, max_num=10, winners=1, table=None, roster=None, start=0,
+                  engine="python"):
+    """counter 방식 하위 추첨 start ~ start + count - 1 을 한 번에 → reveal 데이터 목록
+
+    각 항목은 draw_reveal(..., sub_index=i) 와 같습니다. 하위 추첨끼리 상태를 공유하지
+    않으므로 engine="numpy" 이면 모든 하위 추첨을 npengine 으로 한꺼번에 계산합니다
+    (가중치 추첨은 순수 Python).
+    """
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    commitment_hash = compute_commitment_hash(commitment_data)
+    if "roster_sha256" in commitment_data:
+        min_num, max_num = 1, int(commitment_data["roster_lines"])
+    indices = range(start, start + count)
+    seeds = derive_subseeds(commitment_data["timestamp"], commitment_data["nonce"], indices)
+    if tracing:
+        t = metrics.lap("seed_reduce", t)
+    if engine == "numpy" and table is None:
+        from .npengine import draw_many
+        drawn = draw_many(seeds, [min_num] * count, [max_num] * count, winners)
+    else:
+        drawn = [_draw(seed_value, min_num, max_num, winners, table) for seed_value in seeds]
+    if tracing:
+        t = metrics.lap("randint", t)
+    reveals = [_reveal_data(commitment_data, commitment_hash, seed_value, results, min_num, max_num, winners,
+                            table, roster, i)
+               for i, seed_value, results in zip(indices, seeds, drawn)]
+    if tracing:
+        metrics.lap("reveal", t)
+    return reveals
+
+
+def verify_drawing(commitment_hash, timestamp, nonce, min_num, max_num, winners=1, sub_index=None):
+    """공개된 값으로 검증 → (성공 여부, 재현된 결과, 계산된 해시)
+
+    winners 가 2 이상이면 결과는 추첨 순서대로의 당첨 번호 목록입니다.
+    sub_index 를 주면 counter 방식(seed_scheme 2)의 그 하위 추첨만 검증합니다.
+    같은 입력의 결과는 프로세스 전체 캐시(cache.verify_cache)에서 찾습니다.
+    """
+    tracing = metrics.enabled
+    if tracing:
+        start = metrics.clock()
+    key = (commitment_hash, timestamp, nonce, min_num, max_num, winners, sub_index)
+    cached = verify_cache.get(key)
+    if cached is not None:
+        success, result, calculated_hash = cached
+        if tracing:
+            metrics.lap("verify_cached", start)
+        return success, list(result) if isinstance(result, tuple) else result, calculated_hash
+
+    commitment_data = {
+        "timestamp": timestamp,
+        "nonce": nonce
+    }
+    calculated_hash = compute_commitment_hash(commitment_data)
+    if calculated_hash != commitment_hash:
+        verify_cache.put(key, (False, None, calculated_hash))
+        if tracing:
+            metrics.lap("verify", start)
+            metrics.count("verify_failed")
+        return False, None, calculated_hash
+
+    if sub_index is None:
+        seed_value = derive_seed(timestamp, nonce)
+    else:
+        seed_value = derive_subseed(timestamp, nonce, sub_index)
+    results = _draw(seed_value, min_num, max_num, winners)
+    result = results if winners > 1 else results[0]
+    if winners <= VERIFY_CACHE_MAX_WINNERS:
+        verify_cache.put(key, (True, tuple(results) if winners > 1 else result, calculated_hash))
+    if tracing:
+        metrics.lap("verify", start)
+    return True, result, calculated_hash
+
+
+# 같은 가중치 파일을 반복해서 해시/로드하지 않도록 프로세스 내 보관
+_weights_tables = {}
+_weights_lock = threading.Lock()
+
+
+def _weights_table(path, digest):
+    """(경로, 크기, 수정 시각) 이 같으면 이미 읽은 alias table 재사용"""
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns, digest)
+    table = _weights_tables.get(key)
+    if table is None:
+        from .weighted import load_alias_table
+        table = load_alias_table(path, expected_digest=digest)
+        with _weights_lock:
+            _weights_tables[key] = table
+    return table
+
+
+# 같은 명단 파일을 레코드마다 다시 해시하지 않도록 프로세스 내 보관
+_rosters = {}
+_rosters_lock = threading.Lock()
+
+
+def _roster(path, digest):
+    """(경로, 크기, 수정 시각) 이 같으면 이미 연 명단 재사용"""
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns, digest)
+    roster = _rosters.get(key)
+    if roster is None:
+        from .roster import open_roster
+        roster = open_roster(path, expected_digest=digest)
+        with _rosters_lock:
+            _rosters[key] = roster
+    return roster
+
+
+# 검증 레코드에서 서버 파일을 여는 키
+FILE_KEYS = ("weights_path", "roster_path")
+
+
+class PathNotAllowed(ValueError):
+    """신뢰할 수 없는 레코드가 허용되지 않은 파일을 가리킴"""
+
+
+def confine_paths(record, data_dir=None):
+    """신뢰할 수 없는 레코드(HTTP 요청, 업로드)의 파일 경로 제한 → 검증에 쓸 레코드
+
+    data_dir 가 없으면 FILE_KEYS 가 있는 레코드를 거부합니다. 있으면 data_dir 기준 경로를
+    realpath 로 풀어 data_dir 안의 일반 파일일 때만 그 실제 경로로 바꿔 허용합니다
+    (장치/FIFO, 심볼릭 링크나 .. 로 밖을 가리키는 경로는 거부). 오류에는 경로나 errno 를 넣지 않습니다.
+    """
+    keys = [key for key in FILE_KEYS if key in record]
+    if not keys:
+        return record
+    if data_dir is None:
+        raise PathNotAllowed(f"{keys[0]} 는 허용되지 않습니다")
+    base = os.path.realpath(data_dir)
+    confined = dict(record)
+    for key in keys:
+        value = record[key]
+        path = os.path.realpath(os.path.join(base, value)) if isinstance(value, str) else None
+        if path is None or os.path.commonpath([base, path]) != base or not os.path.isfile(path):
+            raise PathNotAllowed(f"{key} 는 데이터 디렉터리 안의 파일이어야 합니다")
+        confined[key] = path
+    return confined
+
+
+# 신뢰할 수 없는 레코드/요청에서 허용하는 당첨자 수와 범위 크기
+# (당첨자 수만큼 시간과 메모리를 쓰므로 서버/업로드 한 건이 워커를 붙잡지 않도록 제한)
+MAX_UNTRUSTED_WINNERS = 10_000
+MAX_UNTRUSTED_RANGE = 2**64
+
+
+class LimitExceeded(ValueError):
+    """신뢰할 수 없는 요청의 당첨자 수나 범위가 상한을 넘음"""
+
+
+def check_limits(min_num, max_num, winners):
+    """신뢰할 수 없는 요청의 추첨 크기 확인 (상한을 넘으면 LimitExceeded)"""
+    if winners > MAX_UNTRUSTED_WINNERS:
+        raise LimitExceeded(f"당첨자 수는 {MAX_UNTRUSTED_WINNERS} 이하여야 합니다: {winners}")
+    if max_num - min_num + 1 > MAX_UNTRUSTED_RANGE:
+        raise LimitExceeded(f"범위 크기는 2^64 이하여야 합니다: {min_num} ~ {max_num}")
+
+
+def confine_record(record, data_dir=None):
+    """신뢰할 수 없는 검증 레코드 제한: 추첨 크기(check_limits)와 파일 경로(confine_paths)"""
+    check_limits(int(record.get("min_num", 1)), int(record.get("max_num", 10)), int(record.get("winners", 1)))
+    return confine_paths(record, data_dir)
+
+
+def verify_record(record):
+    """reveal 레코드 하나를 검증하여 결과 dict 반환
+
+    전역 상태를 바꾸지 않으므로 스레드 풀에서 동시에 호출해도 안전합니다.
+    가중치 추첨 레코드는 weights_path 에 가중치 파일 경로가 있어야 합니다.
+    명단 추첨 레코드는 roster_path 에 명단 파일이 있으면 파일 해시를 다시 확인하고
+    당첨 번호의 참가자 줄까지 재현합니다 (없으면 번호까지만 검증).
+    해시 체인 레코드(link 포함)는 체인 규칙으로 검증합니다.
+    """
+    if not metrics.enabled:
+        return _verify_record(record)
+    start = metrics.clock()
+    outcome = _verify_record(record)
+    metrics.lap("verify", start)
+    if not outcome["ok"]:
+        metrics.count("verify_failed")
+    return outcome
+
+
+def _verify_record(record):
+    if "link" in record:
+        from .hashchain import verify_chain_record
+        return verify_chain_record(record)
+
+    failure, params = _prepare_record(record)
+    if failure is not None:
+        return failure
+    _, seed_value, min_num, max_num, winners, table, _ = params
+    return _complete_record(record, params, _draw(seed_value, min_num, max_num, winners, table))
+
+
+def _prepare_record(record):
+    """추첨 전 검사 (해시, 가중치/명단 파일, Merkle 증명) → (실패 결과 dict 또는 None, 추첨 인자)
+
+    추첨 인자는 (commitment_hash, 시드, min_num, max_num, winners, alias table, 명단) 입니다.
+    """
+    commitment_hash = record["commitment_hash"]
+    timestamp = record["timestamp"]
+    nonce = record["nonce"]
+    min_num = int(record.get("min_num", 1))
+    max_num = int(record.get("max_num", 10))
+    winners = int(record.get("winners", 1))
+
+    commitment_data = {"timestamp": timestamp, "nonce": nonce}
+    table = None
+    if "weights_sha256" in record:
+        commitment_data["weights_sha256"] = record["weights_sha256"]
+        if "weights_path" not in record:
+            return {"ok": False, "commitment_hash": commitment_hash, "error": "weights_required"}, None
+        try:
+            table = _weights_table(record["weights_path"], record["weights_sha256"])
+        except (OSError, ValueError) as e:
+            return {"ok": False, "commitment_hash": commitment_hash, "error": "weights_mismatch", "detail": str(e)}, None
+    roster = None
+    if "roster_sha256" in record:
+        commitment_data["roster_sha256"] = record["roster_sha256"]
+        commitment_data["roster_lines"] = record["roster_lines"]
+        min_num, max_num = 1, int(record["roster_lines"])
+        if "roster_path" in record:
+            try:
+                roster = _roster(record["roster_path"], record["roster_sha256"])
+            except (OSError, ValueError) as e:
+                return {"ok": False, "commitment_hash": commitment_hash, "error": "roster_mismatch", "detail": str(e)}, None
+
+    calculated_hash = compute_commitment_hash(commitment_data)
+    if calculated_hash != commitment_hash:
+        return {
+            "ok": False,
+            "commitment_hash": commitment_hash,
+            "error": "hash_mismatch",
+            "calculated_hash": calculated_hash
+        }, None
+
+    # Merkle 배치 Commitment 이면 공개된 루트에 포함되는지 확인
+    if "merkle_root" in record:
+        from .merkle import verify_proof
+        if not verify_proof(commitment_hash, int(record["merkle_index"]), int(record["merkle_size"]),
+                            record["merkle_proof"], record["merkle_root"]):
+            return {"ok": False, "commitment_hash": commitment_hash, "error": "merkle_proof_invalid"}, None
+
+    # 시드 방식: seed_scheme 이 없는 기존 reveal 은 Commitment 하나에 시드 하나
+    seed_scheme = int(record.get("seed_scheme", SEED_SCHEME_SINGLE))
+    if seed_scheme == SEED_SCHEME_COUNTER:
+        seed_value = derive_subseed(timestamp, nonce, int(record["sub_index"]))
+    elif seed_scheme == SEED_SCHEME_SINGLE:
+        seed_value = derive_seed(timestamp, nonce)
+    else:
+        return {"ok": False, "commitment_hash": commitment_hash, "error": "unknown_seed_scheme",
+                "detail": f"지원하는 seed_scheme: {', '.join(map(str, SEED_SCHEMES))}"}, None
+    return None, (commitment_hash, seed_value, min_num, max_num, winners, table, roster)
+
+
+def _complete_record(record, params, results):
+    """재현된 추첨 결과로 검증 결과 dict 작성 (공개된 결과가 있으면 비교)"""
+    commitment_hash, seed_value, min_num, max_num, winners, table, roster = params
+    outcome = {
+        "ok": True,
+        "commitment_hash": commitment_hash,
+        "seed_value": seed_value,
+        "min_num": min_num,
+        "max_num": max_num,
+        "result": results[0]
+    }
+    if table is not None:
+        del outcome["min_num"], outcome["max_num"]
+        outcome["weights_sha256"] = table.digest
+    if record.get("seed_scheme", SEED_SCHEME_SINGLE) == SEED_SCHEME_COUNTER:
+        outcome["seed_scheme"] = SEED_SCHEME_COUNTER
+        outcome["sub_index"] = int(record["sub_index"])
+    if "merkle_root" in record:
+        outcome["merkle_root"] = record["merkle_root"]
+    if "roster_sha256" in record:
+        outcome["roster_sha256"] = record["roster_sha256"]
+    if winners > 1:
+        outcome["winners"] = winners
+        outcome["results"] = results
+    if roster is not None:
+        outcome["roster_entries"] = [roster.entry(number) for number in results]
+
+    # 공개된 결과가 있으면 재현 결과와 비교
+    if "result" in record and record["result"] != results[0]:
+        outcome["ok"] = False
+        outcome["error"] = "result_mismatch"
+        outcome["expected"] = record["result"]
+    elif "results" in record and record["results"] != results:
+        outcome["ok"] = False
+        outcome["error"] = "result_mismatch"
+        outcome["expected"] = record["results"]
+    elif roster is not None and "roster_entries" in record and record["roster_entries"] != outcome["roster_entries"]:
+        outcome["ok"] = False
+        outcome["error"] = "roster_entry_mismatch"
+        outcome["expected"] = record["roster_entries"]
+    return outcome
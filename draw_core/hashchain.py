@@ -0,0 +1,157 @@
+"""
+해시 체인 Commitment (정기 추첨용)
+
+- 비밀값 x_0 에서 x_{k+1} = SHA256(x_k) 로 길이 N 의 체인을 만들고 끝값 x_N(tip) 만 공개합니다.
+- i 번째 추첨(1 ~ N)은 x_{N-i} 를 공개하며, 공개 링크를 i 번 해시하면 공개된 tip 이 되는지
+  누구나 확인할 수 있습니다 (레코드의 prev_link 만으로는 믿지 않음).
+- 약 √N 간격의 체크포인트만 저장하므로 임의의 링크를 O(√N) 해시로 다시 계산합니다.
+"""
+
+import hashlib
+import math
+import os
+from datetime import datetime
+
+from .commitment import KST, derive_seed
+
+# 체인 최대 길이 (검증 시 링크를 tip 까지 해시하는 횟수의 상한)
+MAX_CHAIN_LENGTH = 1_000_000
+
+
+def _next(link):
+    return hashlib.sha256(link).digest()
+
+
+def new_chain(length, step=None):
+    """길이 length 의 해시 체인 생성 → 체인 dict (비밀 보관용, tip 만 공개)
+
+    step 간격(기본 ⌈√length⌉)마다 체크포인트를 저장합니다.
+    """
+    if not 1 <= length <= MAX_CHAIN_LENGTH:
+        raise ValueError(f"체인 길이는 1 ~ {MAX_CHAIN_LENGTH} 사이여야 합니다.")
+    step = step or math.isqrt(length - 1) + 1
+
+    link = os.urandom(32)
+    checkpoints = {}
+    for k in range(length):
+        if k % step == 0:
+            checkpoints[str(k)] = link.hex()
+        link = _next(link)
+
+    return {
+        "timestamp": datetime.now(KST).isoformat(),
+        "length": length,
+        "step": step,
+        "tip": link.hex(),
+        "checkpoints": checkpoints
+    }
+
+
+def chain_link(chain, k):
+    """체인의 k 번째 값 x_k (hex) 를 가장 가까운 아래 체크포인트에서 다시 계산"""
+    if not 0 <= k <= chain["length"]:
+        raise IndexError(f"체인 범위를 벗어났습니다: {k}")
+    if k == chain["length"]:
+        return chain["tip"]
+    base = k - k % chain["step"]
+    link = bytes.fromhex(chain["checkpoints"][str(base)])
+    for _ in range(k - base):
+        link = _next(link)
+    return link.hex()
+
+
+def draw_link(chain, draw_index):
+    """draw_index 번째 추첨(1 ~ N)에 공개할 링크와 그 직전 링크 → (link, prev_link)"""
+    if not 1 <= draw_index <= chain["length"]:
+        raise IndexError(f"추첨 번호는 1 ~ {chain['length']} 사이여야 합니다: {draw_index}")
+    k = chain["length"] - draw_index
+    link = chain_link(chain, k)
+    return link, _next(bytes.fromhex(link)).hex()
+
+
+def verify_link(link, prev_link):
+    """SHA256(link) == prev_link 인지 확인 (해시 한 번)"""
+    return _next(bytes.fromhex(link)).hex() == prev_link
+
+
+def link_to_tip(link, draw_index):
+    """draw_index 번째 추첨의 링크를 draw_index 번 해시한 값 (hex, 올바른 링크면 tip)"""
+    value = bytes.fromhex(link)
+    for _ in range(draw_index):
+        value = _next(value)
+    return value.hex()
+
+
+def chain_draw(chain, draw_index, min_num, max_num, winners=1):
+    """draw_index 번째 추첨 실행 → reveal 데이터
+
+    시드는 체인 생성 시각과 공개 링크로 기존 방식(derive_seed)과 같이 만듭니다.
+    """
+    from .draw import _draw
+
+    link, prev_link = draw_link(chain, draw_index)
+    seed_value = derive_seed(chain["timestamp"], link)
+    results = _draw(seed_value, min_num, max_num, winners)
+
+    reveal_data = {
+        "chain_tip": chain["tip"],
+        "timestamp": chain["timestamp"],
+        "draw_index": draw_index,
+        "link": link,
+        "prev_link": prev_link,
+        "seed_value": seed_value,
+        "min_num": min_num,
+        "max_num": max_num,
+        "result": results[0]
+    }
+    if winners > 1:
+        reveal_data["winners"] = winners
+        reveal_data["results"] = results
+    return reveal_data
+
+
+def verify_chain_record(record):
+    """해시 체인 reveal 레코드 검증 → 결과 dict
+
+    링크를 draw_index 번 해시하여 레코드의 chain_tip 이 되는지 확인한 뒤 추첨 결과를
+    재현합니다 (O(draw_index) 해시). chain_tip 은 미리 공개된 tip 과 같은지 따로 비교해야 합니다.
+    """
+    from .draw import _draw
+
+    link = record["link"]
+    prev_link = record["prev_link"]
+    draw_index = int(record["draw_index"])
+    outcome = {"ok": False, "chain_tip": record["chain_tip"], "draw_index": draw_index}
+
+    if not 1 <= draw_index <= MAX_CHAIN_LENGTH:
+        outcome["error"] = "chain_index_invalid"
+        return outcome
+    if not verify_link(link, prev_link):
+        outcome["error"] = "chain_link_mismatch"
+        return outcome
+    # prev_link 도 레코드에서 온 값이므로 tip 까지 이어지는지 확인
+    if link_to_tip(prev_link, draw_index - 1) != record["chain_tip"]:
+        outcome["error"] = "chain_tip_mismatch"
+        return outcome
+
+    min_num = int(record.get("min_num", 1))
+    max_num = int(record.get("max_num", 10))
+    winners = int(record.get("winners", 1))
+    seed_value = derive_seed(record["timestamp"], link)
+    results = _draw(seed_value, min_num, max_num, winners)
+
+    outcome.update({"ok": True, "seed_value": seed_value, "min_num": min_num,
+                    "max_num": max_num, "result": results[0]})
+    if winners > 1:
+        outcome["winners"] = winners
+        outcome["results"] = results
+
+    if "result" in record and record["result"] != results[0]:
+        outcome["ok"] = False
+        outcome["error"] = "result_mismatch"
+        outcome["expected"] = record["result"]
+    elif "results" in record and record["results"] != results:
+        outcome["ok"] = False
+        outcome["error"] = "result_mismatch"
+        outcome["expected"] = record["results"]
+    return outcome
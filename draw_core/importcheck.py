@@ -0,0 +1,72 @@
+"""
+draw_core import 시간/의존성 회귀 검사
+
+    python -m draw_core.importcheck [--budget-ms 30]
+
+새 인터프리터에서 `import draw_core` 를 실행해 import 그래프에 Streamlit 등
+무거운 모듈이 섞여 들어왔거나 import 시간이 예산을 넘으면 종료 코드 1 로 실패합니다.
+"""
+
+import subprocess
+import sys
+
+# draw_core 가 절대 끌어오면 안 되는 모듈 (최상위 패키지 이름)
+FORBIDDEN_MODULES = {
+    "streamlit", "numpy", "pandas", "pyarrow", "altair", "PIL",
+    "tornado", "requests", "urllib3", "scipy", "matplotlib",
+    "asyncio", "multiprocessing", "concurrent", "sqlite3",
+}
+
+# 기본 import 시간 예산 (ms, 인터프리터 기동 시간 제외)
+DEFAULT_BUDGET_MS = 30.0
+
+# 측정 잡음을 줄이기 위해 여러 번 측정해 가장 빠른 값을 사용
+REPEAT = 3
+
+
+def measure_import(module="draw_core"):
+    """새 인터프리터에서 module import → (import 된 최상위 모듈 집합, 누적 시간 ms)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    modules = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.add(name.split(".")[0])
+        if name == module:
+            total_us = int(cumulative)
+    return modules, total_us / 1000
+
+
+def check(budget_ms=DEFAULT_BUDGET_MS, module="draw_core"):
+    """검사 실행 → (문제 목록, 측정된 import 시간 ms). 문제 목록이 비어 있으면 통과"""
+    modules = set()
+    elapsed_ms = float("inf")
+    for _ in range(REPEAT):
+        run_modules, run_ms = measure_import(module)
+        modules |= run_modules
+        elapsed_ms = min(elapsed_ms, run_ms)
+    problems = [f"무거운 모듈이 import 됨: {name}" for name in sorted(modules & FORBIDDEN_MODULES)]
+    if elapsed_ms > budget_ms:
+        problems.append(f"import 시간 {elapsed_ms:.1f}ms > 예산 {budget_ms:.1f}ms")
+    return problems, elapsed_ms
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    budget_ms = DEFAULT_BUDGET_MS
+    if "--budget-ms" in args:
+        budget_ms = float(args[args.index("--budget-ms") + 1])
+
+    problems, elapsed_ms = check(budget_ms)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ draw_core import {elapsed_ms:.1f}ms (예산 {budget_ms:.1f}ms)")
@@ -0,0 +1,251 @@
+"""
+추첨 장부 (SQLite, append-only)
+
+- commitment.json / reveal.json 을 덮어쓰는 대신 모든 추첨을 commitment hash 로 구분해 쌓습니다.
+- 행은 지울 수 없고, 상태는 pending → revealed 한 번만 바뀝니다 (트리거로 강제).
+- WAL 모드와 BEGIN IMMEDIATE 트랜잭션으로 여러 프로세스가 동시에 안전하게 기록합니다.
+- commitment hash, 생성 시각, 상태에 인덱스가 있어 수백만 건에서도 조회가 O(log n) 입니다.
+- 예약 공개(schedules)도 append-only 로 쌓고, 같은 추첨의 가장 최근 예약이 유효합니다.
+"""
+
+import json
+import sqlite3
+import time
+
+DEFAULT_LEDGER = "draws.db"
+
+# 해시 앞부분으로 추첨을 찾을 때 필요한 최소 길이
+MIN_PREFIX = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS draws (
+    id INTEGER PRIMARY KEY,
+    commitment_hash TEXT NOT NULL UNIQUE,
+    timestamp TEXT NOT NULL,
+    commitment TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'revealed')),
+    revealed_at REAL,
+    reveal TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_draws_created ON draws (created_at);
+CREATE INDEX IF NOT EXISTS idx_draws_status ON draws (status, created_at);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    draw_id INTEGER NOT NULL REFERENCES draws (id),
+    reveal_at REAL NOT NULL,
+    min_num INTEGER NOT NULL,
+    max_num INTEGER NOT NULL,
+    winners INTEGER NOT NULL DEFAULT 1,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_draw ON schedules (draw_id, id);
+
+CREATE TRIGGER IF NOT EXISTS schedules_append_only BEFORE UPDATE ON schedules
+BEGIN
+    SELECT RAISE(ABORT, 'schedules are append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS schedules_no_delete BEFORE DELETE ON schedules
+BEGIN
+    SELECT RAISE(ABORT, 'schedules are append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS draws_no_delete BEFORE DELETE ON draws
+BEGIN
+    SELECT RAISE(ABORT, 'ledger is append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS draws_reveal_once BEFORE UPDATE ON draws
+WHEN OLD.status != 'pending'
+    OR NEW.status != 'revealed'
+    OR NEW.commitment_hash != OLD.commitment_hash
+    OR NEW.timestamp != OLD.timestamp
+    OR NEW.commitment != OLD.commitment
+    OR NEW.created_at != OLD.created_at
+BEGIN
+    SELECT RAISE(ABORT, 'ledger rows can only move from pending to revealed once');
+END;
+"""
+
+
+def connect(path=DEFAULT_LEDGER):
+    """장부 열기 (없으면 생성). 스레드/프로세스마다 따로 연결하세요."""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _row_to_dict(row):
+    draw = dict(row)
+    draw["commitment"] = json.loads(draw["commitment"])
+    if draw["reveal"] is not None:
+        draw["reveal"] = json.loads(draw["reveal"])
+    return draw
+
+
+def add_commitment(conn, commitment_hash, commitment_data):
+    """새 Commitment 기록 → 추첨 ID"""
+    cur = conn.execute(
+        "INSERT INTO draws (commitment_hash, timestamp, commitment, created_at) VALUES (?, ?, ?, ?)",
+        (commitment_hash, commitment_data["timestamp"], json.dumps(commitment_data, sort_keys=True), time.time())
+    )
+    return cur.lastrowid
+
+
+def add_commitments(conn, items):
+    """(commitment_hash, commitment_data) 여러 건을 한 트랜잭션으로 기록 → 추첨 ID 범위
+
+    쓰기 잠금을 잡은 상태에서 연속으로 넣으므로 ID 는 빈틈없이 이어집니다.
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        first = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM draws").fetchone()[0]
+        cur = conn.executemany(
+            "INSERT INTO draws (commitment_hash, timestamp, commitment, created_at) VALUES (?, ?, ?, ?)",
+            ((h, data["timestamp"], json.dumps(data, sort_keys=True), now) for h, data in items)
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return range(first, first + cur.rowcount)
+
+
+def record_reveal(conn, draw_id, reveal_data):
+    """추첨 결과 기록 (pending → revealed). 이미 공개된 추첨이면 ValueError"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.execute(
+            "UPDATE draws SET status = 'revealed', revealed_at = ?, reveal = ? WHERE id = ? AND status = 'pending'",
+            (time.time(), json.dumps(reveal_data, sort_keys=True), draw_id)
+        )
+        if cur.rowcount != 1:
+            raise ValueError(f"공개할 수 없는 추첨입니다 (없거나 이미 공개됨): {draw_id}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def record_reveals(conn, items):
+    """(추첨 ID, reveal 데이터) 여러 건을 한 트랜잭션으로 기록
+
+    하나라도 공개할 수 없으면(없거나 이미 공개됨) 전부 되돌리고 ValueError 를 발생시킵니다.
+    """
+    items = list(items)
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.executemany(
+            "UPDATE draws SET status = 'revealed', revealed_at = ?, reveal = ? WHERE id = ? AND status = 'pending'",
+            ((now, json.dumps(reveal_data, sort_keys=True), draw_id) for draw_id, reveal_data in items)
+        )
+        if cur.rowcount != len(items):
+            raise ValueError(f"공개할 수 없는 추첨이 있습니다 (없거나 이미 공개됨): {len(items) - cur.rowcount}건")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def get_draw(conn, draw_ref):
+    """추첨 ID(정수) 또는 commitment hash(앞 MIN_PREFIX 자 이상)로 조회 → dict 또는 None
+
+    숫자만으로 된 짧은 값은 먼저 ID 로 찾고, 없으면 해시 앞부분으로 찾습니다.
+    해시 앞부분이 여러 추첨과 일치하면 ValueError 를 발생시킵니다.
+    """
+    draw_ref = str(draw_ref).strip().lower()
+    if draw_ref.isdigit() and len(draw_ref) < 16:
+        row = conn.execute("SELECT * FROM draws WHERE id = ?", (int(draw_ref),)).fetchone()
+        if row or len(draw_ref) < MIN_PREFIX:
+            return _row_to_dict(row) if row else None
+
+    if len(draw_ref) < MIN_PREFIX:
+        raise ValueError(f"commitment hash 는 {MIN_PREFIX}자 이상 입력하세요: {draw_ref}")
+    # 유니크 인덱스에서 범위 조회로 앞부분 일치 검색
+    rows = conn.execute(
+        "SELECT * FROM draws WHERE commitment_hash >= ? AND commitment_hash < ? LIMIT 2",
+        (draw_ref, draw_ref + "g")
+    ).fetchall()
+    if len(rows) > 1:
+        raise ValueError(f"여러 추첨과 일치합니다. 더 길게 입력하세요: {draw_ref}")
+    return _row_to_dict(rows[0]) if rows else None
+
+
+def find_draws(conn, status=None, since=None, until=None, limit=100):
+    """상태/생성 시각(epoch 초) 범위로 추첨 목록 조회 (생성 순)"""
+    clauses = []
+    params = []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("created_at < ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT * FROM draws {where} ORDER BY created_at, id LIMIT ?", (*params, limit)
+    ).fetchall()
+    return [_row_to_dict(row) for row in rows]
+
+
+def schedule_reveals(conn, items):
+    """(추첨 ID, 공개 시각(epoch 초), min_num, max_num, winners) 여러 건을 한 트랜잭션으로 예약
+
+    다시 예약하면 새 행이 추가되고 가장 최근 예약이 유효합니다. 하나라도 공개 대기(pending)
+    상태가 아니면 전부 되돌리고 ValueError 를 발생시킵니다. → 마지막 예약 ID
+    """
+    items = list(items)
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.executemany(
+            "INSERT INTO schedules (draw_id, reveal_at, min_num, max_num, winners, created_at) "
+            "SELECT id, ?, ?, ?, ?, ? FROM draws WHERE id = ? AND status = 'pending'",
+            ((reveal_at, min_num, max_num, winners, now, draw_id)
+             for draw_id, reveal_at, min_num, max_num, winners in items)
+        )
+        if cur.rowcount != len(items):
+            raise ValueError(f"예약할 수 없는 추첨이 있습니다 (없거나 이미 공개됨): {len(items) - cur.rowcount}건")
+        last_id = conn.execute("SELECT MAX(id) FROM schedules").fetchone()[0]
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return last_id
+
+
+def pending_schedules(conn, after_id=0):
+    """예약 ID 가 after_id 보다 큰 예약 중 아직 공개되지 않은 추첨의 예약 (예약 순)
+
+    after_id=0 이면 재시작 시 복구할 전체 목록입니다. 같은 추첨이 여러 번 나오면
+    뒤의 것이 유효합니다.
+    """
+    rows = conn.execute(
+        "SELECT s.id, s.draw_id, s.reveal_at, s.min_num, s.max_num, s.winners FROM schedules s "
+        "JOIN draws d ON d.id = s.draw_id WHERE s.id > ? AND d.status = 'pending' ORDER BY s.id",
+        (after_id,)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_draws(conn, draw_ids):
+    """추첨 ID 여러 개 조회 → {ID: dict} (없는 ID 는 빠짐)"""
+    draws = {}
+    draw_ids = list(draw_ids)
+    for i in range(0, len(draw_ids), 500):
+        part = draw_ids[i:i + 500]
+        rows = conn.execute(
+            f"SELECT * FROM draws WHERE id IN ({', '.join('?' * len(part))})", part
+        ).fetchall()
+        draws.update((row["id"], _row_to_dict(row)) for row in rows)
+    return draws
@@ -0,0 +1,168 @@
+"""
+Merkle tree 배치 Commitment
+
+- 추첨 N 건의 commitment hash 를 잎으로 하는 Merkle tree 를 만들고 루트만 공개합니다.
+- 각 reveal 은 O(log N) 개의 해시로 된 포함 증명(inclusion proof)을 함께 공개합니다.
+- 잎 해시는 0x00, 내부 노드는 0x01 접두사로 구분하며, 짝이 없는 마지막 노드는
+  그대로 위 단계로 올라갑니다.
+- 각 단계는 노드마다 파이썬 객체를 만들지 않고 32바이트씩 이어 붙인 bytes 로 보관하며,
+  잎을 청크 단위로 읽어 프로세스 풀에서 서브트리를 병렬로 만듭니다.
+"""
+
+import hashlib
+import json
+import mmap
+
+HASH_SIZE = 32
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+# 워커 하나가 처리하는 잎 수 (2의 거듭제곱이어야 서브트리가 전체 트리와 맞물림)
+CHUNK_LEAVES = 1 << 16
+
+TREE_MAGIC = b"MRKL1\n"
+
+
+def leaf_hash(commitment_hash):
+    """commitment hash(hex) 의 잎 해시(bytes)"""
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(commitment_hash)).digest()
+
+
+def node_hash(left, right):
+    """두 자식 해시(bytes) 로 부모 해시 계산"""
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _parent_level(level):
+    """한 단계(32바이트씩 이어 붙인 bytes) 의 부모 단계 계산"""
+    sha256 = hashlib.sha256
+    count = len(level) // HASH_SIZE
+    out = bytearray()
+    for i in range(0, count - 1, 2):
+        start = i * HASH_SIZE
+        out += sha256(NODE_PREFIX + level[start:start + 2 * HASH_SIZE]).digest()
+    if count % 2:
+        out += level[-HASH_SIZE:]  # 짝 없는 마지막 노드는 그대로 올림
+    return bytes(out)
+
+
+def _chunk_levels(commitment_hashes, height):
+    """잎 청크의 서브트리 단계들 (0 ~ height 단계, 마지막 단계는 노드 1개)"""
+    sha256 = hashlib.sha256
+    level = b"".join(sha256(LEAF_PREFIX + bytes.fromhex(h)).digest() for h in commitment_hashes)
+    levels = [level]
+    for _ in range(height):
+        level = _parent_level(level)
+        levels.append(level)
+    return levels
+
+
+def _chunks(commitment_hashes, size):
+    chunk = []
+    for h in commitment_hashes:
+        chunk.append(h)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_levels(commitment_hashes, workers=1, chunk_leaves=CHUNK_LEAVES):
+    """commitment hash(hex) 이터러블로 Merkle tree 의 모든 단계 생성 → [잎 단계, ..., 루트 단계]
+
+    잎은 chunk_leaves 개씩 스트리밍으로 읽어 workers 개 프로세스에서 서브트리를 만들고,
+    그 위 단계는 현재 프로세스에서 계산합니다.
+    """
+    if chunk_leaves & (chunk_leaves - 1):
+        raise ValueError("chunk_leaves 는 2의 거듭제곱이어야 합니다.")
+    height = chunk_leaves.bit_length() - 1
+
+    from functools import partial
+    func = partial(_chunk_levels, height=height)
+    chunks = _chunks(commitment_hashes, chunk_leaves)
+    if workers > 1:
+        from .batch import ordered_pool_map
+        results = ordered_pool_map(func, chunks, workers)
+    else:
+        results = map(func, chunks)
+
+    levels = [bytearray() for _ in range(height + 1)]
+    for chunk_levels in results:
+        for level, part in zip(levels, chunk_levels):
+            level += part
+    if not levels[0]:
+        raise ValueError("잎이 하나 이상 필요합니다.")
+
+    # 청크 루트들 위로 나머지 단계 계산
+    while len(levels[-1]) > HASH_SIZE:
+        levels.append(bytearray(_parent_level(bytes(levels[-1]))))
+    # 잎이 청크보다 적으면 생기는 중복 루트 단계 제거
+    while len(levels) > 1 and len(levels[-2]) == HASH_SIZE:
+        levels.pop()
+    return levels
+
+
+def root_of(levels):
+    """단계 목록의 루트 해시(hex)"""
+    return bytes(levels[-1]).hex()
+
+
+def save_levels(path, levels):
+    """단계 목록을 파일로 저장 (헤더 한 줄 + 단계별 해시를 이어 붙인 바이너리)"""
+    header = {"size": len(levels[0]) // HASH_SIZE,
+              "levels": [len(level) // HASH_SIZE for level in levels]}
+    with open(path, 'wb') as f:
+        f.write(TREE_MAGIC)
+        f.write(json.dumps(header).encode() + b"\n")
+        for level in levels:
+            f.write(level)
+
+
+def inclusion_proof(path, index):
+    """저장된 tree 파일에서 index 번째 잎의 포함 증명 읽기 → (루트 hex, 잎 수, 증명 hex 목록)
+
+    mmap 으로 필요한 O(log N) 개 해시만 읽습니다.
+    """
+    with open(path, 'rb') as f:
+        if f.readline() != TREE_MAGIC:
+            raise ValueError(f"Merkle tree 파일이 아닙니다: {path}")
+        header = json.loads(f.readline())
+        offset = f.tell()
+        counts = header["levels"]
+        size = header["size"]
+        if not 0 <= index < size:
+            raise IndexError(f"잎 번호 범위를 벗어났습니다: {index} (잎 {size}개)")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            proof = []
+            i = index
+            for count in counts[:-1]:
+                sibling = i ^ 1
+                if sibling < count:
+                    start = offset + sibling * HASH_SIZE
+                    proof.append(mm[start:start + HASH_SIZE].hex())
+                offset += count * HASH_SIZE
+                i //= 2
+            root = mm[offset:offset + HASH_SIZE].hex()
+    return root, size, proof
+
+
+def verify_proof(commitment_hash, index, size, proof, root):
+    """포함 증명 검증: commitment_hash 가 root 의 index 번째 잎인지 O(log N) 으로 확인"""
+    if not 0 <= index < size:
+        return False
+    h = leaf_hash(commitment_hash)
+    siblings = iter(proof)
+    i, count = index, size
+    try:
+        while count > 1:
+            if i % 2:
+                h = node_hash(bytes.fromhex(next(siblings)), h)
+            elif i + 1 < count:
+                h = node_hash(h, bytes.fromhex(next(siblings)))
+            i //= 2
+            count = (count + 1) // 2
+    except StopIteration:
+        return False
+    return next(siblings, None) is None and h.hex() == root
@@ -0,0 +1,171 @@
+"""
+추첨 단계별 계측 (opt-in)
+
+Commitment 생성, 추첨, 검증의 각 단계(JSON 정규화, SHA-256, 시드 축약, MT 시드 설정,
+randint, 파일 I/O)에 걸린 시간과 횟수를 모읍니다. 기본은 꺼져 있으며, 꺼져 있을 때
+계측 지점의 비용은 모듈 변수 하나를 확인하는 것뿐입니다.
+
+    from draw_core import metrics
+    metrics.enable()                       # 또는 환경 변수 DRAW_METRICS=1
+    metrics.add_hook(lambda kind, name, value: ...)
+    print(metrics.to_prometheus())
+
+계측 지점은 다음과 같이 씁니다 (꺼져 있으면 clock() 도 호출하지 않음).
+
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    ...
+    if tracing:
+        t = metrics.lap("sha256", t)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 계측 지점에서 직접 확인하는 플래그
+enabled = bool(os.environ.get("DRAW_METRICS"))
+
+clock = time.perf_counter
+
+_lock = threading.Lock()
+_spans = {}      # 이름 → [횟수, 합계(초), 최대(초)]
+_counters = {}   # 이름 → 값
+_hooks = []
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """모은 값 초기화 (훅은 유지)"""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def add_hook(callback):
+    """값이 기록될 때마다 callback(kind, name, value) 호출 ("span" 이면 초, "counter" 면 증가량)"""
+    _hooks.append(callback)
+
+
+def remove_hook(callback):
+    _hooks.remove(callback)
+
+
+def record(name, seconds):
+    """name 단계에 seconds 만큼 걸린 것으로 기록"""
+    with _lock:
+        span = _spans.get(name)
+        if span is None:
+            _spans[name] = [1, seconds, seconds]
+        else:
+            span[0] += 1
+            span[1] += seconds
+            if seconds > span[2]:
+                span[2] = seconds
+    for callback in _hooks:
+        callback("span", name, seconds)
+
+
+def lap(name, start):
+    """start 부터 지금까지를 name 단계로 기록하고 지금 시각 반환 (다음 단계의 시작)"""
+    now = clock()
+    record(name, now - start)
+    return now
+
+
+def count(name, amount=1):
+    """카운터 증가"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+    for callback in _hooks:
+        callback("counter", name, amount)
+
+
+@contextmanager
+def span(name):
+    """with 블록을 name 단계로 기록 (파일 I/O 처럼 드문 구간용)"""
+    if not enabled:
+        yield
+        return
+    start = clock()
+    try:
+        yield
+    finally:
+        record(name, clock() - start)
+
+
+def snapshot():
+    """현재 값 → {"spans": {이름: {"count", "total_s", "max_s"}}, "counters": {이름: 값}}"""
+    with _lock:
+        return {
+            "spans": {
+                name: {"count": c, "total_s": total, "max_s": peak}
+                for name, (c, total, peak) in sorted(_spans.items())
+            },
+            "counters": dict(sorted(_counters.items())),
+        }
+
+
+def merge(snap):
+    """다른 프로세스에서 모은 snapshot() 을 합침 (훅은 호출하지 않음)"""
+    with _lock:
+        for name, s in snap["spans"].items():
+            span = _spans.setdefault(name, [0, 0.0, 0.0])
+            span[0] += s["count"]
+            span[1] += s["total_s"]
+            span[2] = max(span[2], s["max_s"])
+        for name, value in snap["counters"].items():
+            _counters[name] = _counters.get(name, 0) + value
+
+
+def collect(func, *args):
+    """프로세스 풀 워커에서 계측을 켜고 func 실행 → (결과, 이번 호출의 snapshot)
+
+    워커는 작업을 하나씩 처리하므로 호출 전에 값을 비워 이번 호출분만 돌려줍니다.
+    """
+    enable()
+    reset()
+    result = func(*args)
+    return result, snapshot()
+
+
+def to_json():
+    return json.dumps(snapshot(), indent=2)
+
+
+def _label(value):
+    """Prometheus 텍스트 형식의 레이블 값 이스케이프 (\\, ", 줄바꿈)"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(prefix="draw"):
+    """Prometheus 텍스트 형식으로 내보내기"""
+    snap = snapshot()
+    lines = [
+        f"# HELP {prefix}_phase_seconds Time spent per draw phase.",
+        f"# TYPE {prefix}_phase_seconds summary",
+    ]
+    for name, s in snap["spans"].items():
+        lines.append(f'{prefix}_phase_seconds_count{{phase="{_label(name)}"}} {s["count"]}')
+        lines.append(f'{prefix}_phase_seconds_sum{{phase="{_label(name)}"}} {s["total_s"]:.9f}')
+    lines.append(f"# HELP {prefix}_phase_seconds_max Slowest single call per draw phase.")
+    lines.append(f"# TYPE {prefix}_phase_seconds_max gauge")
+    for name, s in snap["spans"].items():
+        lines.append(f'{prefix}_phase_seconds_max{{phase="{_label(name)}"}} {s["max_s"]:.9f}')
+    lines.append(f"# HELP {prefix}_events_total Draw event counters.")
+    lines.append(f"# TYPE {prefix}_events_total counter")
+    for name, value in snap["counters"].items():
+        lines.append(f'{prefix}_events_total{{event="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,460 @@
+"""
+NumPy 벡터화 추첨 엔진 (선택, 순수 Python 과 비트 단위로 동일)
+
+    python -m draw_core.npengine --check [레코드 수]
+
+대량 검증에서 시간 대부분은 레코드마다의 random.Random(seed) (MT19937 init_by_array)
+와 randint 입니다. 이 모듈은 여러 레코드의 시드를 배열로 받아 CPython 의
+init_by_array, 상태 갱신(twist), tempering, getrandbits 기반 거절 샘플링을
+레코드 방향으로 벡터화해 같은 결과를 냅니다.
+
+- NumPy 가 없으면 모든 함수가 draw._draw (순수 Python) 로 대신 계산합니다.
+- 범위 크기가 2^64 를 넘는 레코드, 가중치/해시 체인 레코드는 순수 Python 으로 처리합니다.
+- --check 는 무작위 코퍼스로 CPython 결과와 한 건씩 비교하는 차등 검사입니다.
+"""
+
+import json
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 는 선택 의존성
+    np = None
+
+from . import metrics
+from .commitment import derive_seed
+from .draw import _complete_record, _draw, _prepare_record, confine_record, verify_record
+
+# 한 번에 벡터화하는 레코드 수 (상태 배열 624 x BLOCK_SIZE x 4바이트 ≈ 40MB)
+BLOCK_SIZE = 16384
+
+_N = 624
+_M = 397
+_MATRIX_A = 0x9908B0DF
+_UPPER_MASK = 0x80000000
+_LOWER_MASK = 0x7FFFFFFF
+
+
+def available():
+    """NumPy 엔진 사용 가능 여부"""
+    return np is not None
+
+
+def _init_genrand_state(s=19650218):
+    """init_genrand(19650218): init_by_array 의 시작 상태 (모든 시드에 공통)"""
+    mt = [s]
+    for i in range(1, _N):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xFFFFFFFF)
+    return mt
+
+
+_BASE_STATE = _init_genrand_state()
+
+
+def _seed_states(seeds):
+    """32비트 시드 배열 → 시드 설정 직후의 MT 상태 (624 x 레코드 수, uint32)
+
+    random.seed(int) 는 시드를 32비트 단어 배열로 init_by_array 에 넘기며, 시드가
+    2^32 미만이면 키 길이는 1 입니다 (키 단어 = 시드, j 는 항상 0).
+    """
+    count = len(seeds)
+    mt = np.empty((_N, count), dtype=np.uint32)
+    tmp = np.empty(count, dtype=np.uint32)
+    mt[0] = _BASE_STATE[0]
+
+    # 첫 번째 루프: i = 1..623, 이후 mt[0] = mt[623] 으로 감고 i = 1 한 번 더
+    i = 1
+    for step in range(_N):
+        prev = mt[i - 1]
+        np.right_shift(prev, 30, out=tmp)
+        tmp ^= prev
+        tmp *= np.uint32(1664525)
+        if step == _N - 1:
+            tmp ^= mt[1]
+        else:
+            tmp ^= np.uint32(_BASE_STATE[i])
+        np.add(tmp, seeds, out=mt[i])
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+
+    # 두 번째 루프: 623번
+    for _ in range(_N - 1):
+        prev = mt[i - 1]
+        np.right_shift(prev, 30, out=tmp)
+        tmp ^= prev
+        tmp *= np.uint32(1566083941)
+        row = mt[i]
+        row ^= tmp
+        row -= np.uint32(i)
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+
+    mt[0] = _UPPER_MASK
+    return mt
+
+
+def _twisted(cur, nxt, far):
+    """twist 한 단어: (mt[kk] 상위 1비트 | mt[kk+1] 하위 31비트) 와 mt[kk+397] 로 새 mt[kk] 계산"""
+    y = (cur & np.uint32(_UPPER_MASK)) | (nxt & np.uint32(_LOWER_MASK))
+    return far ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(_MATRIX_A))
+
+
+def _twist_block(mt, dst, cur, nxt, far):
+    mt[dst] = _twisted(mt[cur], mt[nxt], mt[far])
+
+
+def _twist(mt):
+    """MT 상태 전체 갱신 (제자리). 앞쪽에서 새로 계산한 단어를 쓰는 구간은 나누어 처리"""
+    nm = _N - _M  # 227
+    # kk = 0..226: mt[kk + 397] 은 아직 이전 값
+    _twist_block(mt, slice(0, nm), slice(0, nm), slice(1, nm + 1), slice(_M, _N))
+    # kk = 227..453: mt[kk - 227] (0..226) 은 방금 갱신된 값
+    _twist_block(mt, slice(nm, 2 * nm), slice(nm, 2 * nm), slice(nm + 1, 2 * nm + 1), slice(0, nm))
+    # kk = 454..622: mt[kk - 227] (227..395) 도 바로 위에서 갱신된 값
+    _twist_block(mt, slice(2 * nm, _N - 1), slice(2 * nm, _N - 1), slice(2 * nm + 1, _N), slice(nm, _N - 1 - nm))
+    # kk = 623: mt[0] (갱신된 값) 과 mt[396]
+    _twist_block(mt, slice(_N - 1, _N), slice(_N - 1, _N), slice(0, 1), slice(_M - 1, _M))
+
+
+def _temper(y):
+    y = y ^ (y >> np.uint32(11))
+    y ^= (y << np.uint32(7)) & np.uint32(0x9D2C5680)
+    y ^= (y << np.uint32(15)) & np.uint32(0xEFC60000)
+    y ^= y >> np.uint32(18)
+    return y
+
+
+class _Generators:
+    """레코드마다 하나씩인 MT19937 생성기 묶음 (상태 624 x 레코드 수, 읽은 위치)
+
+    시드 설정 직후에는 mti = 624 라서 첫 출력 전에 상태 전체를 갱신(twist)해야 하지만,
+    대부분의 추첨은 단어 1~2개만 읽습니다. 앞쪽 227개 단어는 이전 상태만으로 계산되므로
+    그 범위에서는 필요한 단어만 그때그때 계산하고, 더 읽는 레코드만 전체를 갱신합니다.
+    """
+
+    def __init__(self, seeds, mt=None):
+        # mt: 이미 계산한 시드 설정 직후 상태 (여러 범위를 같은 시드로 추첨할 때 복사본을 넘김)
+        self.mt = _seed_states(seeds) if mt is None else mt
+        self.pos = np.zeros(len(seeds), dtype=np.intp)
+        self.twisted = np.zeros(len(seeds), dtype=bool)
+
+    def next_word(self, idx):
+        """idx 레코드들의 genrand_uint32() 한 번씩"""
+        pos = self.pos[idx]
+        lazy = ~self.twisted[idx]
+        full = np.where(lazy, pos >= _N - _M, pos >= _N)
+        if full.any():
+            rows = idx[full]
+            block = self.mt[:, rows]
+            _twist(block)
+            self.mt[:, rows] = block
+            self.pos[rows] = np.where(self.pos[rows] >= _N, 0, self.pos[rows])
+            self.twisted[rows] = True
+            pos = self.pos[idx]
+            lazy &= ~full
+
+        words = np.empty(len(idx), dtype=np.uint32)
+        if lazy.all():
+            words[:] = _twisted(self.mt[pos, idx], self.mt[pos + 1, idx], self.mt[pos + _M, idx])
+        else:
+            ready = ~lazy
+            words[ready] = self.mt[pos[ready], idx[ready]]
+            if lazy.any():
+                p, rows = pos[lazy], idx[lazy]
+                words[lazy] = _twisted(self.mt[p, rows], self.mt[p + 1, rows], self.mt[p + _M, rows])
+        self.pos[idx] = pos + 1
+        return _temper(words)
+
+    def randbelow(self, idx, n):
+        """CPython _randbelow_with_getrandbits 와 같은 거절 샘플링 (n < 2^64)
+
+        k = n.bit_length() 비트를 getrandbits 로 읽어 n 이상이면 다시 뽑습니다.
+        k > 32 이면 32비트 단어 두 개를 낮은 자리부터 채웁니다.
+        """
+        k = _bit_length(n)
+        out = np.empty(len(idx), dtype=np.uint64)
+        todo = np.arange(len(idx))
+        while todo.size:
+            sub = idx[todo]
+            bits = k[todo]
+            r = self.next_word(sub).astype(np.uint64)
+            wide = bits > 32
+            narrow = ~wide
+            r[narrow] >>= (np.uint64(32) - bits[narrow])
+            if wide.any():
+                high = self.next_word(sub[wide]).astype(np.uint64)
+                r[wide] |= (high >> (np.uint64(64) - bits[wide])) << np.uint64(32)
+            accepted = r < n[todo]
+            out[todo[accepted]] = r[accepted]
+            todo = todo[~accepted]
+        return out
+
+
+def _bit_length(n):
+    """uint64 배열의 비트 길이 (n >= 1)"""
+    k = np.zeros(len(n), dtype=np.uint64)
+    rest = n.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = rest >= (np.uint64(1) << np.uint64(shift))
+        k[big] += np.uint64(shift)
+        rest[big] >>= np.uint64(shift)
+    return k + (rest > 0)
+
+
+def _draw_block(seeds, min_nums, sizes, winners):
+    """한 블록의 레코드들을 벡터화 추첨 → 레코드별 결과 목록"""
+    tracing = metrics.enabled
+    if tracing:
+        t = metrics.clock()
+    gens = _Generators(np.asarray(seeds, dtype=np.uint32))
+    if tracing:
+        t = metrics.lap("mt_seed", t)
+
+    count = len(seeds)
+    size_arr = np.asarray(sizes, dtype=np.uint64)
+    winners_arr = np.asarray(winners, dtype=np.int64)
+    # 희소 Fisher-Yates 의 i 번째 단계: j = randint(i, size - 1) = i + randbelow(size - i)
+    picks = []
+    for step in range(int(winners_arr.max())):
+        idx = np.flatnonzero(winners_arr > step)
+        picks.append((idx, step + gens.randbelow(idx, size_arr[idx] - np.uint64(step))))
+
+    if winners_arr.max() == 1:
+        _, j = picks[0]
+        results = [[min_num + int(x)] for min_num, x in zip(min_nums, j.tolist())]
+    else:
+        draws = [[] for _ in range(count)]
+        for idx, j in picks:
+            for r, x in zip(idx.tolist(), j.tolist()):
+                draws[r].append(x)
+        results = []
+        for min_num, js in zip(min_nums, draws):
+            swapped = {}
+            drawn = []
+            for i, j in enumerate(js):
+                drawn.append(min_num + swapped.get(j, j))
+                swapped[j] = swapped.get(i, i)
+            results.append(drawn)
+    if tracing:
+        metrics.lap("randint", t)
+    return results
+
+
+def draw_many(seeds, min_nums, max_nums, winners=1):
+    """여러 추첨을 한 번에 → 레코드별 결과 목록 (draw._draw 와 같은 값)
+
+    winners 는 정수 하나 또는 레코드별 목록입니다. NumPy 가 없거나 범위 크기가
+    2^64 이상인 레코드는 순수 Python 으로 계산합니다.
+    """
+    count = len(seeds)
+    if isinstance(winners, int):
+        winners = [winners] * count
+    results = [None] * count
+    vector = []
+    for r, (min_num, max_num, w) in enumerate(zip(min_nums, max_nums, winners)):
+        size = max_num - min_num + 1
+        if w < 1 or w > size:
+            raise ValueError(f"당첨자 수는 1 ~ {size} 사이여야 합니다: {w}")
+        if np is not None and size < 2**64:
+            vector.append(r)
+        else:
+            results[r] = _draw(seeds[r], min_num, max_num, w)
+
+    for start in range(0, len(vector), BLOCK_SIZE):
+        rows = vector[start:start + BLOCK_SIZE]
+        block = _draw_block(
+            [seeds[r] for r in rows],
+            [min_nums[r] for r in rows],
+            [max_nums[r] - min_nums[r] + 1 for r in rows],
+            [winners[r] for r in rows],
+        )
+        for r, drawn in zip(rows, block):
+            results[r] = drawn
+    return results
+
+
+def _resolve_swaps(j):
+    """희소 Fisher-Yates 의 단계별 j (레코드 x winners) → 뽑힌 위치 (레코드 x winners)
+
+    draw.draw_numbers 의 swapped dict 를 레코드마다 (키, 값) 열로 들고 다닙니다.
+    단계마다 키가 많아야 하나 늘어나므로 i 번째 열에 두고, 이미 있는 키면 그 자리를 고칩니다.
+    """
+    count, winners = j.shape
+    rows = np.arange(count)
+    empty = np.uint64(2**64 - 1)   # 범위 크기 < 2^64 이므로 위치로 나올 수 없는 값
+    keys = np.full((count, winners), empty, dtype=np.uint64)
+    values = np.zeros((count, winners), dtype=np.uint64)
+    out = np.empty_like(j)
+    out[:, 0] = keys[:, 0] = j[:, 0]
+    for i in range(1, winners):
+        ji = j[:, i]
+        hit = keys[:, :i] == ji[:, None]
+        found = hit.any(axis=1)
+        col = hit.argmax(axis=1)
+        out[:, i] = np.where(found, values[rows, col], ji)
+        # swapped[j] = swapped.get(i, i)
+        hit_i = keys[:, :i] == np.uint64(i)
+        value_i = np.where(hit_i.any(axis=1), values[rows, hit_i.argmax(axis=1)], np.uint64(i))
+        values[rows[found], col[found]] = value_i[found]
+        keys[~found, i] = ji[~found]
+        values[~found, i] = value_i[~found]
+    return out
+
+
+def draw_offsets(seeds, sizes, winners=1):
+    """시드 배열 하나로 범위 크기마다 추첨 → 범위마다 (시드 수 x winners) uint64 배열
+
+    값은 0 ~ size-1 의 위치로, draw._draw(seed, min_num, min_num + size - 1, winners) 에서
+    min_num 을 뺀 것과 같습니다. 시드 설정(init_by_array)은 한 번만 하고 범위마다 상태를 복사해
+    씁니다 (공정성 감사처럼 같은 시드를 여러 범위로 추첨할 때). NumPy 가 필요합니다.
+    """
+    if np is None:
+        raise RuntimeError("NumPy 가 설치되어 있지 않습니다")
+    for size in sizes:
+        if size >= 2**64:
+            raise ValueError(f"범위 크기는 2^64 미만이어야 합니다: {size}")
+        if winners < 1 or winners > size:
+            raise ValueError(f"당첨자 수는 1 ~ {size} 사이여야 합니다: {winners}")
+    seeds = np.asarray(seeds, dtype=np.uint32)
+    mt = _seed_states(seeds)
+    idx = np.arange(len(seeds))
+    results = []
+    for r, size in enumerate(sizes):
+        gens = _Generators(seeds, mt if r == len(sizes) - 1 else mt.copy())
+        size_arr = np.full(len(seeds), size, dtype=np.uint64)
+        j = np.empty((len(seeds), winners), dtype=np.uint64)
+        for step in range(winners):
+            j[:, step] = step + gens.randbelow(idx, size_arr - np.uint64(step))
+        results.append(_resolve_swaps(j) if winners > 1 else j)
+    return results
+
+
+def verify_records(records):
+    """reveal 레코드들을 검증 → 결과 dict 목록 (verify_record 와 같은 값, 입력 순서)
+
+    해시/Merkle 검사는 레코드마다 하고, 추첨 재현만 모아서 벡터화합니다.
+    해시 체인과 가중치 레코드는 verify_record 로 처리합니다.
+    """
+    tracing = metrics.enabled
+    if tracing:
+        start = metrics.clock()
+    outcomes = [None] * len(records)
+    pending = []
+    for r, record in enumerate(records):
+        if "link" in record or "weights_sha256" in record:
+            outcomes[r] = verify_record(record)
+            continue
+        failure, params = _prepare_record(record)
+        if failure is not None:
+            outcomes[r] = failure
+        else:
+            pending.append((r, params))
+
+    if pending:
+        seeds = [params[1] for _, params in pending]
+        min_nums = [params[2] for _, params in pending]
+        max_nums = [params[3] for _, params in pending]
+        winners = [params[4] for _, params in pending]
+        try:
+            drawn = draw_many(seeds, min_nums, max_nums, winners)
+        except ValueError:
+            # 잘못된 당첨자 수가 섞여 있으면 레코드마다 순수 Python 경로의 오류를 그대로 냄
+            drawn = [None] * len(pending)
+        for (r, params), results in zip(pending, drawn):
+            if results is None:
+                outcomes[r] = verify_record(records[r])
+            else:
+                outcomes[r] = _complete_record(records[r], params, results)
+
+    if tracing:
+        metrics.lap("verify", start)
+        failed = sum(not o["ok"] for o in outcomes)
+        if failed:
+            metrics.count("verify_failed", failed)
+    return outcomes
+
+
+def verify_lines(numbered_lines, untrusted=False, data_dir=None):
+    """batch.verify_lines 의 NumPy 판: (줄 번호, JSONL 문자열) 묶음 → (실패 수, 결과 JSON 문자열 목록)
+
+    형식이 잘못되었거나 제한(당첨자 수/범위, 파일 경로)을 넘는 레코드가 섞인 묶음은 레코드별 오류를
+    내도록 순수 Python 경로로 검증합니다.
+    """
+    from .batch import verify_lines as verify_lines_py
+
+    numbered_lines = list(numbered_lines)
+    try:
+        records = [json.loads(line) for _, line in numbered_lines]
+        if untrusted:
+            records = [confine_record(record, data_dir) for record in records]
+        outcomes = verify_records(records)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return verify_lines_py(numbered_lines, untrusted=untrusted, data_dir=data_dir)
+
+    failed = 0
+    output = []
+    for (line_no, _), outcome in zip(numbered_lines, outcomes):
+        outcome["line"] = line_no
+        failed += not outcome["ok"]
+        output.append(json.dumps(outcome, ensure_ascii=False))
+    return failed, output
+
+
+def _random_corpus(count, rng):
+    """차등 검사용 무작위 (시드, 최소, 최대, 당첨자 수) 코퍼스
+
+    범위 크기는 1 부터 2^64 근처까지 비트 길이가 고르게 섞이도록 고르고,
+    2의 거듭제곱 경계(거절 확률이 가장 큰 곳)와 다수 당첨자도 포함합니다.
+    """
+    corpus = []
+    for _ in range(count):
+        seed = rng.getrandbits(32)
+        bits = rng.randint(1, 64)
+        size = rng.choice((rng.getrandbits(bits) or 1, 2 ** (bits - 1), 2 ** (bits - 1) + 1, 2**bits - 1 or 1))
+        size = min(size, 2**64 - 1)
+        min_num = rng.choice((1, 0, rng.randint(-10**6, 10**6)))
+        winners = 1 if rng.random() < 0.8 else rng.randint(1, min(size, 700))
+        corpus.append((seed, min_num, min_num + size - 1, winners))
+    return corpus
+
+
+def check(count=200000, seed=2025):
+    """무작위 코퍼스로 NumPy 엔진과 CPython(random.Random) 결과 비교 → 불일치 목록"""
+    import random
+
+    corpus = _random_corpus(count, random.Random(seed))
+    # derive_seed 로 만든 실제 시드도 섞음
+    corpus += [(derive_seed(f"2025-01-01T00:00:{i:02d}+09:00", f"{i:064x}"), 1, 10**i % 10**12 + 1, 1)
+               for i in range(100)]
+    seeds, min_nums, max_nums, winners = (list(col) for col in zip(*corpus))
+    got = draw_many(seeds, min_nums, max_nums, winners)
+    mismatches = []
+    for params, drawn in zip(corpus, got):
+        seed_value, min_num, max_num, w = params
+        rng = random.Random(seed_value)
+        expected = [rng.randint(min_num, max_num)] if w == 1 else _draw(seed_value, min_num, max_num, w)
+        if drawn != expected:
+            mismatches.append((params, drawn, expected))
+    return mismatches, len(corpus)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] != "--check":
+        print("사용법: python -m draw_core.npengine --check [레코드 수]")
+        sys.exit(2)
+    if not available():
+        print("❌ NumPy 가 설치되어 있지 않습니다 (pip install numpy)")
+        sys.exit(1)
+
+    mismatches, total = check(int(args[1])) if len(args) > 1 else check()
+    if mismatches:
+        for params, drawn, expected in mismatches[:10]:
+            print(f"❌ (seed, min, max, winners)={params}: numpy={drawn[:5]} python={expected[:5]}")
+        print(f"❌ 불일치 {len(mismatches)}건 / {total}건")
+        sys.exit(1)
+    print(f"✅ {total}건 모두 CPython random 과 일치 (NumPy {np.__version__})")
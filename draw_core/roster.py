@@ -0,0 +1,178 @@
+"""
+참가자 명단(roster) 추첨
+
+- 명단 파일은 한 줄에 참가자 한 명이며, 당첨 번호 k 는 k 번째 줄(1부터)입니다.
+- 명단 파일의 SHA-256 (청크 단위로 계산, 파일 전체를 메모리에 올리지 않음)과 줄 수를
+  Commitment 에 포함하여 사후 변경을 막습니다.
+- 줄 시작 위치 인덱스(줄마다 8바이트)를 사용자 캐시 디렉터리에 저장하고 명단 파일과 인덱스를 mmap 으로
+  열어, 수천만 줄짜리 명단에서도 당첨 번호 → 참가자 줄을 O(1) 에 찾습니다.
+  인덱스 길이가 헤더의 줄 수와 맞지 않으면(잘리거나 깨짐) 다시 만듭니다.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+
+
+def _user_cache_dir():
+    """사용자 캐시 디렉터리 아래 draw/roster (DRAW_CACHE_DIR > XDG_CACHE_HOME > LOCALAPPDATA > ~/.cache)"""
+    base = os.environ.get("DRAW_CACHE_DIR")
+    if base:
+        return os.path.join(base, "roster")
+    base = (os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "draw", "roster")
+
+
+# 빌드한 줄 인덱스를 저장하는 기본 디렉터리 (현재 디렉터리가 아니라 사용자 캐시)
+CACHE_DIR = _user_cache_dir()
+
+# 파일 해시/줄 위치 계산 시 한 번에 읽는 크기
+READ_CHUNK_SIZE = 1 << 20
+
+# 인덱스 파일 헤더: magic, 줄 수, 명단 파일 크기
+INDEX_MAGIC = b"RSTRIDX1"
+INDEX_HEADER = struct.Struct("<8sQQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def roster_digest(path):
+    """명단 파일을 청크 단위로 읽어 SHA-256 계산"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _line_starts(chunk, position):
+    """청크 안 줄바꿈 바로 다음 위치(파일 기준) → array('Q') (NumPy 가 있으면 벡터화)"""
+    starts = array('Q')
+    try:
+        import numpy as np
+    except ImportError:
+        i = chunk.find(b"\n")
+        while i != -1:
+            starts.append(position + i + 1)
+            i = chunk.find(b"\n", i + 1)
+        return starts
+    found = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 0x0A).astype(np.uint64)
+    starts.frombytes((found + np.uint64(position + 1)).tobytes())
+    return starts
+
+
+def _short_lines(offsets):
+    """줄바꿈 포함 2바이트 이하인 줄 번호 (빈 줄 후보)"""
+    try:
+        import numpy as np
+    except ImportError:
+        return [n for n in range(1, len(offsets)) if offsets[n] - offsets[n - 1] <= 2]
+    lengths = np.diff(np.frombuffer(offsets, dtype=np.uint64))
+    return (np.flatnonzero(lengths <= 2) + 1).tolist()
+
+
+def build_index(path):
+    """줄 시작 위치 인덱스 생성 → array('Q') (줄 수 + 1 개, 마지막은 파일 끝)
+
+    마지막 줄에 줄바꿈이 없어도 됩니다. 빈 줄이 있으면 번호와 참가자가 어긋나
+    보이지 않도록 ValueError 를 발생시킵니다.
+    """
+    offsets = array('Q', [0])
+    position = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            offsets.extend(_line_starts(chunk, position))
+            position += len(chunk)
+    if offsets[-1] != position:
+        offsets.append(position)  # 줄바꿈 없이 끝나는 마지막 줄
+    if len(offsets) < 2:
+        raise ValueError(f"명단 파일에 참가자가 없습니다: {path}")
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line_no in _short_lines(offsets):
+            if not mm[offsets[line_no - 1]:offsets[line_no]].strip():
+                raise ValueError(f"명단 파일에 빈 줄이 있습니다: {path}:{line_no}")
+    return offsets
+
+
+def _index_path(digest, cache_dir):
+    return os.path.join(cache_dir, f"{digest}.idx")
+
+
+def _save_index(offsets, size, path):
+    """임시 파일에 쓴 뒤 교체하여 동시 실행 시에도 깨진 인덱스가 보이지 않게 저장"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(offsets) - 1, size))
+        offsets.tofile(f)
+    os.replace(tmp_path, path)
+
+
+class Roster:
+    """mmap 으로 연 명단 파일과 줄 인덱스 (entry(k) 로 k 번째 참가자 조회)"""
+
+    def __init__(self, path, digest, index_path):
+        self.path = path
+        self.digest = digest
+        self._files = [open(path, 'rb'), open(index_path, 'rb')]
+        self._data = self._index = None
+        try:
+            self._data = mmap.mmap(self._files[0].fileno(), 0, access=mmap.ACCESS_READ)
+            if os.fstat(self._files[1].fileno()).st_size < INDEX_HEADER.size:
+                raise ValueError(f"명단 인덱스가 잘렸습니다: {index_path}")
+            self._index = mmap.mmap(self._files[1].fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.lines, size = INDEX_HEADER.unpack_from(self._index, 0)
+            # 헤더와 길이, 마지막 위치(파일 끝)까지 맞아야 entry() 가 인덱스 밖을 읽지 않음
+            if (magic != INDEX_MAGIC or size != len(self._data)
+                    or len(self._index) != INDEX_HEADER.size + _OFFSET.size * (self.lines + 1)
+                    or _OFFSET.unpack_from(self._index, len(self._index) - _OFFSET.size)[0] != size):
+                raise ValueError(f"명단 인덱스가 파일과 맞지 않습니다: {index_path}")
+        except Exception:
+            self.close()
+            raise
+
+    def __len__(self):
+        return self.lines
+
+    def entry(self, number):
+        """당첨 번호(1 ~ 줄 수) → 그 줄의 내용 (줄바꿈 제외)"""
+        if not 1 <= number <= self.lines:
+            raise IndexError(f"명단 범위를 벗어났습니다: {number} (참가자 {self.lines}명)")
+        at = INDEX_HEADER.size + (number - 1) * _OFFSET.size
+        start, = _OFFSET.unpack_from(self._index, at)
+        end, = _OFFSET.unpack_from(self._index, at + _OFFSET.size)
+        return self._data[start:end].rstrip(b"\r\n").decode('utf-8')
+
+    def close(self):
+        for mm in (self._data, self._index):
+            if mm is not None:
+                mm.close()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_roster(path, expected_digest=None, cache_dir=CACHE_DIR):
+    """명단 파일 열기 → Roster (해시를 다시 계산하고, 인덱스는 캐시에서 읽거나 만듦)
+
+    expected_digest 와 파일 해시가 다르면 ValueError 를 발생시킵니다.
+    """
+    digest = roster_digest(path)
+    if expected_digest is not None and digest != expected_digest:
+        raise ValueError(f"명단 파일 해시가 Commitment 와 다릅니다: {digest} != {expected_digest}")
+    index_path = _index_path(digest, cache_dir)
+    if os.path.exists(index_path):
+        try:
+            return Roster(path, digest, index_path)
+        except ValueError:
+            pass  # 잘리거나 깨진 인덱스: 다시 만듦
+    _save_index(build_index(path), os.path.getsize(path), index_path)
+    return Roster(path, digest, index_path)
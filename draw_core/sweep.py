@@ -0,0 +1,128 @@
+"""
+범위 스윕: 한 Commitment 로 여러 추첨 범위의 결과를 한 번에 재현
+
+"1 ~ N 으로 추첨했다면 결과가 무엇이었나?" 를 여러 N 에 대해 확인할 때 씁니다.
+해시 검증과 시드 생성(SHA-256), MT19937 시드 설정은 Commitment 마다 한 번만 하고,
+범위마다 저장해 둔 생성기 상태를 setstate 로 되돌려 추첨합니다 (시드 설정의 약 절반 비용).
+생성기 상태는 프로세스 전체가 함께 쓰는 LRU 에 보관하므로 자주 조회되는 Commitment 는
+다음 호출에서도 바로 재사용됩니다.
+"""
+
+import random
+import threading
+from collections import OrderedDict
+
+from . import metrics
+from .commitment import compute_commitment_hash, derive_seed
+from .draw import draw_numbers
+
+# 보관할 Commitment 생성기 상태 수 (상태 하나는 약 20KB)
+STATE_CACHE_SIZE = 1024
+
+_states = OrderedDict()  # (timestamp, nonce) → (계산된 hash, 시드, 생성기 상태)
+_states_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _seeded_state(timestamp, nonce):
+    """Commitment 의 (계산된 hash, 시드, 시드 설정 직후 생성기 상태) 를 LRU 에서 찾거나 계산"""
+    key = (timestamp, nonce)
+    with _states_lock:
+        entry = _states.get(key)
+        if entry is not None:
+            _states.move_to_end(key)
+            _stats["hits"] += 1
+            return entry
+        _stats["misses"] += 1
+
+    calculated_hash = compute_commitment_hash({"timestamp": timestamp, "nonce": nonce})
+    seed_value = derive_seed(timestamp, nonce)
+    entry = (calculated_hash, seed_value, random.Random(seed_value).getstate())
+
+    with _states_lock:
+        _states[key] = entry
+        _states.move_to_end(key)
+        while len(_states) > STATE_CACHE_SIZE:
+            _states.popitem(last=False)
+    return entry
+
+
+def cache_info():
+    """생성기 상태 LRU 현황 → {"hits", "misses", "size", "max_size"}"""
+    with _states_lock:
+        return {**_stats, "size": len(_states), "max_size": STATE_CACHE_SIZE}
+
+
+def clear_cache():
+    with _states_lock:
+        _states.clear()
+        _stats["hits"] = _stats["misses"] = 0
+
+
+def sweep_ranges(commitment_hash, timestamp, nonce, ranges, winners=1):
+    """ranges 의 (min_num, max_num) 마다 추첨 결과 재현 → 결과 dict
+
+    해시가 맞지 않으면 {"ok": False, "error": "hash_mismatch", ...} 를 반환합니다.
+    범위별 결과는 입력 순서대로 {"min_num", "max_num", "result"[, "results"]} 이며,
+    당첨자 수보다 작은 범위는 "error" 를 담습니다.
+    """
+    calculated_hash, seed_value, state = _seeded_state(timestamp, nonce)
+    outcome = {
+        "ok": calculated_hash == commitment_hash,
+        "commitment_hash": commitment_hash,
+        "calculated_hash": calculated_hash,
+    }
+    if not outcome["ok"]:
+        outcome["error"] = "hash_mismatch"
+        return outcome
+
+    tracing = metrics.enabled
+    rng = random.Random()
+    results = []
+    for min_num, max_num in ranges:
+        entry = {"min_num": min_num, "max_num": max_num}
+        if tracing:
+            t = metrics.clock()
+        rng.setstate(state)
+        if tracing:
+            t = metrics.lap("mt_restore", t)
+        try:
+            drawn = draw_numbers(rng, min_num, max_num, winners)
+        except ValueError as e:
+            entry["error"] = str(e)
+        else:
+            entry["result"] = drawn[0]
+            if winners > 1:
+                entry["results"] = drawn
+        if tracing:
+            metrics.lap("randint", t)
+        results.append(entry)
+
+    outcome["seed_value"] = seed_value
+    if winners > 1:
+        outcome["winners"] = winners
+    outcome["ranges"] = results
+    return outcome
+
+
+def parse_ranges(spec):
+    """범위 지정 문자열 → [(min_num, max_num), ...]
+
+    쉼표로 구분하며 각 항목은 "N" (1 ~ N), "A-B" (A ~ B), "A-B:S" (1 ~ A, 1 ~ A+S, ... 1 ~ B)
+    중 하나입니다. 예: "10,100,1-1000" / "10-1000:10"
+    """
+    ranges = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if ":" in item:
+            bounds, step = item.split(":")
+            start, stop = bounds.split("-")
+            ranges.extend((1, n) for n in range(int(start), int(stop) + 1, int(step)))
+        elif "-" in item:
+            start, stop = item.split("-")
+            ranges.append((int(start), int(stop)))
+        else:
+            ranges.append((1, int(item)))
+    return ranges
@@ -0,0 +1,246 @@
+"""
+가중치 추첨 (Alias Method)
+- 참가자별 티켓 수(가중치)에 비례하여 당첨자를 뽑습니다.
+- 가중치 파일(CSV 또는 JSONL)의 SHA-256 을 Commitment 에 포함하여 사후 변경을 막습니다.
+- 정수 가중치로 만든 alias table 은 샘플 하나당 O(1) 이며, 디스크에 캐시됩니다.
+- 여러 명을 뽑을 때 이미 뽑힌 참가자가 계속 나오면 남은 참가자의 가중치로 만든
+  Fenwick tree 로 넘어가므로, 가중치가 몇 명에게 몰려 있어도 추첨 시간이 제한됩니다.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from array import array
+from collections import namedtuple
+
+# 빌드한 alias table 을 저장하는 기본 디렉터리
+CACHE_DIR = ".alias_cache"
+CACHE_VERSION = 2
+
+# 파일 해시 계산 시 한 번에 읽는 크기
+READ_CHUNK_SIZE = 1 << 20
+
+# 한 명을 뽑을 때 이미 뽑힌 참가자가 연속으로 이만큼 나오면 Fenwick tree 로 전환
+# (전환 전의 추첨 결과는 단순 재추첨과 같음)
+MAX_REDRAWS = 32
+
+AliasTable = namedtuple("AliasTable", ["digest", "ids", "weights", "prob", "alias", "total", "positive"])
+
+
+def file_digest(path):
+    """파일 전체를 메모리에 올리지 않고 청크 단위로 SHA-256 계산"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _parse_weight(raw, entrant_id):
+    weight = int(raw)
+    if weight < 0 or str(weight) != str(raw).strip():
+        raise ValueError(f"가중치는 0 이상의 정수여야 합니다: {entrant_id}={raw}")
+    return weight
+
+
+def load_weights(path):
+    """가중치 파일 읽기 → (ids, weights)
+
+    - .jsonl: 한 줄에 {"id": ..., "weight": ...}
+    - 그 외: CSV (id, weight). 첫 줄이 "id,weight" 헤더면 건너뜁니다.
+    """
+    ids = []
+    weights = array('q')
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                entrant_id = str(row["id"])
+                ids.append(entrant_id)
+                weights.append(_parse_weight(row["weight"], entrant_id))
+        else:
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                if not ids and row[0].strip().lower() == "id":
+                    continue  # 헤더
+                entrant_id = row[0].strip()
+                ids.append(entrant_id)
+                weights.append(_parse_weight(row[1], entrant_id))
+
+    if not ids or sum(weights) == 0:
+        raise ValueError("가중치 파일에 유효한 참가자가 없습니다.")
+    return ids, weights
+
+
+def build_alias_table(weights):
+    """정수 가중치로 Vose alias table 생성 → (prob, alias, total)
+
+    칸 j 를 고른 뒤 r < prob[j] (r 은 0 ~ total-1) 이면 j, 아니면 alias[j] 를
+    선택합니다. 모든 연산이 정수라 플랫폼과 무관하게 결과가 재현됩니다.
+    """
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n for w in weights]  # 칸 하나의 용량은 total
+    prob = array('q', [0]) * n
+    alias = array('q', range(n))
+
+    small = [i for i, p in enumerate(scaled) if p < total]
+    large = [i for i, p in enumerate(scaled) if p >= total]
+    while small and large:
+        s = small.pop()
+        l = large[-1]
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= total - scaled[s]
+        if scaled[l] < total:
+            small.append(large.pop())
+    for i in large + small:
+        prob[i] = total
+
+    return prob, alias, total
+
+
+def _cache_path(digest, cache_dir):
+    return os.path.join(cache_dir, f"{digest}.alias")
+
+
+def _save_table(table, cache_dir):
+    """임시 파일에 쓴 뒤 교체하여 동시 실행 시에도 깨진 캐시가 보이지 않게 저장"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(table.digest, cache_dir)
+    header = {"version": CACHE_VERSION, "n": len(table.ids), "total": table.total,
+              "positive": table.positive}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        table.weights.tofile(f)
+        table.prob.tofile(f)
+        table.alias.tofile(f)
+        # id 에 줄바꿈 등이 있어도 깨지지 않도록 JSON 배열로 저장
+        f.write(json.dumps(table.ids, ensure_ascii=False).encode('utf-8'))
+    os.replace(tmp_path, path)
+
+
+def _load_cached_table(digest, cache_dir):
+    path = _cache_path(digest, cache_dir)
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        header = json.loads(f.readline())
+        if header.get("version") != CACHE_VERSION:
+            return None
+        n = header["n"]
+        weights = array('q')
+        weights.fromfile(f, n)
+        prob = array('q')
+        prob.fromfile(f, n)
+        alias = array('q')
+        alias.fromfile(f, n)
+        ids = json.loads(f.read().decode('utf-8'))
+    return AliasTable(digest, ids, weights, prob, alias, header["total"], header["positive"])
+
+
+def load_alias_table(path, cache_dir=CACHE_DIR, expected_digest=None):
+    """가중치 파일의 alias table 로드 (디스크 캐시 우선, 없으면 빌드 후 저장)
+
+    expected_digest 가 주어지면 파일 해시가 다를 때 ValueError 를 발생시킵니다.
+    """
+    digest = file_digest(path)
+    if expected_digest is not None and digest != expected_digest:
+        raise ValueError(f"가중치 파일 해시 불일치: {digest} != {expected_digest}")
+
+    if cache_dir:
+        table = _load_cached_table(digest, cache_dir)
+        if table is not None:
+            return table
+
+    ids, weights = load_weights(path)
+    prob, alias, total = build_alias_table(weights)
+    positive = sum(1 for w in weights if w > 0)
+    table = AliasTable(digest, ids, weights, prob, alias, total, positive)
+    if cache_dir:
+        _save_table(table, cache_dir)
+    return table
+
+
+def _fenwick(weights):
+    """가중치 배열로 Fenwick tree(1부터 시작) 생성, O(n)"""
+    n = len(weights)
+    tree = array('q', [0]) * (n + 1)
+    for i in range(1, n + 1):
+        tree[i] += weights[i - 1]
+        parent = i + (i & -i)
+        if parent <= n:
+            tree[parent] += tree[i]
+    return tree
+
+
+def _fenwick_find(tree, r):
+    """누적 가중치가 r 을 처음 넘는 위치 (0부터 시작), O(log n)"""
+    n = len(tree) - 1
+    pos = 0
+    step = 1 << n.bit_length()
+    while step:
+        nxt = pos + step
+        if nxt <= n and tree[nxt] <= r:
+            pos = nxt
+            r -= tree[nxt]
+        step >>= 1
+    return pos
+
+
+def _fenwick_remove(tree, i, weight):
+    i += 1
+    while i < len(tree):
+        tree[i] -= weight
+        i += i & -i
+
+
+def weighted_draw(table, rng, winners=1):
+    """alias table 로 서로 다른 당첨자 winners 명을 추첨 순서대로 반환 (id 목록)
+
+    이미 뽑힌 참가자가 나오면 다시 뽑습니다. 한 명을 뽑는 데 MAX_REDRAWS 번 연속으로
+    이미 뽑힌 참가자가 나오면, 남은 당첨자는 뽑힌 참가자를 뺀 가중치의 Fenwick tree 에서
+    rng.randrange(남은 가중치 합) 으로 뽑습니다 (당첨자 한 명당 O(log n)).
+    """
+    n = len(table.ids)
+    if winners < 1 or winners > table.positive:
+        raise ValueError(f"당첨자 수가 가중치가 있는 참가자 수를 넘습니다: {winners}")
+
+    chosen = set()
+    results = []
+    redraws = 0
+    while len(results) < winners:
+        j = rng.randrange(n)
+        if rng.randrange(table.total) >= table.prob[j]:
+            j = table.alias[j]
+        if j not in chosen:
+            chosen.add(j)
+            results.append(table.ids[j])
+            redraws = 0
+            continue
+        redraws += 1
+        if redraws >= MAX_REDRAWS:
+            break
+    if len(results) == winners:
+        return results
+
+    tree = _fenwick(table.weights)
+    remaining = table.total
+    for j in chosen:
+        _fenwick_remove(tree, j, table.weights[j])
+        remaining -= table.weights[j]
+    while len(results) < winners:
+        j = _fenwick_find(tree, rng.randrange(remaining))
+        results.append(table.ids[j])
+        _fenwick_remove(tree, j, table.weights[j])
+        remaining -= table.weights[j]
+    return results
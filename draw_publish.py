@@ -0,0 +1,594 @@
+"""
+공정한 추첨 시스템 공개(게시) 파이프라인 (asyncio)
+
+    python draw_publish.py <commitment.json|reveal.json|subdraws.jsonl|-> [--config publish.json]
+                           [--sink file:DIR] [--sink webhook:URL] [--sink queue:DIR]
+                           [--timeout 5] [--retries 2] [--receipts publish_receipts.jsonl] [--key publish.key]
+    python draw_publish.py --check-receipts [publish_receipts.jsonl] [--key publish.key]
+
+Commitment 해시와 reveal 을 참가자가 보는 여러 곳(sink)에 동시에 게시하고, 게시 결과를
+HMAC 으로 서명한 영수증 로그에 남깁니다. `random_draw.py commit|reveal --publish publish.json` 으로
+생성/추첨 직후 바로 게시할 수도 있습니다.
+
+- sink 마다 따로 제한 시간과 재시도를 두고 모든 sink 에 동시에 보내므로, 게시 시간은 sink 시간의
+  합이 아니라 가장 느린 sink 의 시간으로 정해집니다.
+- webhook 은 sink 마다 keep-alive 연결 풀을 두어 연결을 재사용합니다.
+- commitment.json 을 주면 Nonce 는 빼고 해시/타임스탬프(와 가중치/명단 해시)만 게시합니다.
+- 영수증은 직전 영수증의 MAC 을 포함하는 체인이므로 중간 줄을 고치거나 지우면 --check-receipts 가 찾아냅니다.
+  영수증은 로그 파일을 잠근 채 마지막 줄에 이어 쓰므로 여러 프로세스가 같은 로그에 게시해도 체인이 갈라지지 않습니다.
+- publish_sync 는 설정마다 Publisher 하나를 게시 전용 이벤트 루프 스레드에서 계속 쓰므로, 호출이 바뀌어도
+  webhook 연결을 재사용합니다.
+
+sink 설정 (publish.json, 문자열 또는 dict):
+
+    {"sinks": ["file:published",
+               {"type": "webhook", "url": "http://127.0.0.1:9000/hook", "timeout": 2, "retries": 3},
+               "queue:outbox"],
+     "timeout": 5, "retries": 2, "receipts": "publish_receipts.jsonl", "key_file": "publish.key"}
+
+새 sink 는 name / timeout / retries 속성과 `async send(body, message, headers)` / `async close()` 를 가진
+클래스를 SINK_TYPES 에 등록하면 됩니다.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from draw_core import KST, compute_commitment_hash, metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 추가
+    fcntl = None
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_RETRIES = 2
+# 재시도 대기 (초, 시도마다 두 배)
+DEFAULT_BACKOFF = 0.1
+DEFAULT_RECEIPTS = "publish_receipts.jsonl"
+DEFAULT_KEY_FILE = "publish.key"
+# webhook sink 하나가 동시에 여는 최대 연결 수
+DEFAULT_POOL_SIZE = 4
+# webhook 응답 본문 최대 크기
+MAX_RESPONSE = 1024 * 1024
+
+# commitment 게시 시 함께 공개하는 Commitment 필드 (nonce 는 추첨 전까지 비밀)
+PUBLIC_COMMITMENT_FIELDS = ("timestamp", "weights_sha256", "roster_sha256", "roster_lines")
+
+
+class PublishError(Exception):
+    """sink 가 게시를 거부함 (retry=False 이면 재시도하지 않음)"""
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+# ---------- 게시 메시지 ----------
+
+def make_message(data):
+    """commitment/reveal 데이터 → 게시 메시지 dict
+
+    Nonce 가 있고 추첨 결과가 없으면 Commitment 데이터로 보고 해시와 공개 필드만 담습니다.
+    """
+    if "result" in data or "link" in data:
+        return {"kind": "reveal", **data}
+    if "nonce" in data:
+        message = {"kind": "commitment", "commitment_hash": compute_commitment_hash(data)}
+        message.update((name, data[name]) for name in PUBLIC_COMMITMENT_FIELDS if name in data)
+        return message
+    if "commitment_hash" in data:
+        return {"kind": "commitment", **data}
+    raise ValueError("commitment 또는 reveal 데이터가 아닙니다")
+
+
+def message_name(message):
+    """파일/큐 항목 이름 (같은 메시지는 같은 이름)"""
+    name = f"{message['kind']}_{message.get('commitment_hash') or message.get('chain_tip', 'unknown')}"[:80]
+    for field in ("sub_index", "draw_index", "merkle_index"):
+        if field in message:
+            name += f"_{message[field]}"
+    return name
+
+
+def encode_message(message):
+    return json.dumps(message, sort_keys=True, ensure_ascii=False).encode()
+
+
+# ---------- sink ----------
+
+def _write_file(directory, final_name, body, tmp_dir=None):
+    """tmp 파일에 쓰고 fsync 후 rename (읽는 쪽은 완성된 파일만 봄)"""
+    tmp_path = os.path.join(tmp_dir or directory, f".{final_name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(directory, final_name))
+
+
+class FileSink:
+    """디렉터리에 메시지마다 JSON 파일 하나 (같은 메시지를 다시 게시하면 덮어씀)"""
+
+    def __init__(self, directory, timeout=None, retries=None):
+        self.directory = directory
+        self.name = f"file:{directory}"
+        self.timeout = timeout
+        self.retries = retries
+        os.makedirs(directory, exist_ok=True)
+
+    async def send(self, body, message, headers):
+        name = message_name(message) + ".json"
+        await asyncio.get_running_loop().run_in_executor(None, _write_file, self.directory, name, body)
+        return os.path.join(self.directory, name)
+
+    async def close(self):
+        pass
+
+
+class QueueSink:
+    """메시지 큐 대용: maildir 형식 스풀 (tmp/ 에 쓰고 new/ 로 옮김)
+
+    소비자는 new/ 의 파일을 처리한 뒤 cur/ 로 옮기거나 지웁니다. 이름은 게시 순서대로 정렬됩니다.
+    """
+
+    def __init__(self, directory, timeout=None, retries=None):
+        self.directory = directory
+        self.name = f"queue:{directory}"
+        self.timeout = timeout
+        self.retries = retries
+        self._seq = itertools.count()
+        for sub in ("tmp", "new", "cur"):
+            os.makedirs(os.path.join(directory, sub), exist_ok=True)
+
+    async def send(self, body, message, headers):
+        name = f"{time.time_ns()}.{os.getpid()}.{next(self._seq)}.{message_name(message)}.json"
+        await asyncio.get_running_loop().run_in_executor(
+            None, _write_file, os.path.join(self.directory, "new"), name, body, os.path.join(self.directory, "tmp"))
+        return name
+
+    async def close(self):
+        pass
+
+
+class WebhookSink:
+    """HTTP/1.1 POST (keep-alive 연결 풀, http:// 만 지원)
+
+    2xx 는 성공, 4xx(429 제외)는 재시도하지 않는 실패, 그 밖의 응답은 재시도할 실패입니다.
+    """
+
+    def __init__(self, url, timeout=None, retries=None, pool_size=DEFAULT_POOL_SIZE):
+        parsed = urlsplit(url)
+        if parsed.scheme != "http" or not parsed.hostname:
+            raise ValueError(f"webhook 은 http://호스트[:포트]/경로 형식이어야 합니다: {url}")
+        self.url = url
+        self.name = f"webhook:{url}"
+        self.timeout = timeout
+        self.retries = retries
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.target = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        self.idle = []  # 재사용할 (reader, writer)
+        self.slots = asyncio.Semaphore(pool_size)
+
+    async def send(self, body, message, headers):
+        async with self.slots:
+            while True:
+                reused = bool(self.idle)
+                reader, writer = self.idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+                try:
+                    status, keep_alive = await self._post(reader, writer, body, headers)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        continue  # 서버가 닫은 유휴 연결: 새 연결로 다시 보냄 (재시도 횟수에 포함하지 않음)
+                    raise
+                except BaseException:
+                    # 제한 시간 초과(취소) 등: 응답을 다 읽지 못한 연결은 버림
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self.idle.append((reader, writer))
+                else:
+                    writer.close()
+                break
+        if 200 <= status < 300:
+            return f"HTTP {status}"
+        raise PublishError(f"HTTP {status}", retry=status >= 500 or status == 429)
+
+    async def _post(self, reader, writer, body, headers):
+        """요청 하나 보내고 응답 읽기 → (상태 코드, 연결 재사용 가능 여부)"""
+        extra = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(
+            f"POST {self.target} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n{extra}\r\n".encode() + body
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("응답 없이 연결이 닫혔습니다")
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        length = None
+        keep_alive = version == "HTTP/1.1"
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection" and value.strip().lower() == "close":
+                keep_alive = False
+            elif name == "transfer-encoding":
+                keep_alive = False  # chunked 응답 본문은 읽지 않고 연결을 버림
+                length = 0
+        if length is None:
+            await reader.read(MAX_RESPONSE)
+            keep_alive = False
+        elif length:
+            await reader.readexactly(min(length, MAX_RESPONSE))
+            keep_alive = keep_alive and length <= MAX_RESPONSE
+        return int(status), keep_alive
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+
+# 설정의 "종류:대상" → sink 클래스 (새 sink 는 여기에 등록)
+SINK_TYPES = {"file": FileSink, "webhook": WebhookSink, "queue": QueueSink}
+
+
+def make_sink(spec):
+    """"file:DIR" / "webhook:URL" / "queue:DIR" 또는 {"type": ..., ...} → sink"""
+    if isinstance(spec, dict):
+        options = dict(spec)
+        kind = options.pop("type")
+        target = options.pop("url", None) or options.pop("path", None)
+    else:
+        kind, _, target = spec.partition(":")
+        options = {}
+    if kind not in SINK_TYPES or not target:
+        raise ValueError(f"알 수 없는 sink: {spec} (종류: {', '.join(SINK_TYPES)})")
+    return SINK_TYPES[kind](target, **options)
+
+
+# ---------- 서명 영수증 ----------
+
+def load_key(path=DEFAULT_KEY_FILE):
+    """영수증 HMAC 키 (없으면 256비트 키를 만들어 소유자만 읽을 수 있게 저장)"""
+    try:
+        with open(path, 'r') as f:
+            return bytes.fromhex(f.read().strip())
+    except FileNotFoundError:
+        pass
+    key = os.urandom(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(key.hex() + "\n")
+    return key
+
+
+def sign_receipt(receipt, key):
+    """mac 을 뺀 영수증의 정렬된 JSON 에 대한 HMAC-SHA256"""
+    payload = {name: value for name, value in receipt.items() if name != "mac"}
+    return hmac.new(key, json.dumps(payload, sort_keys=True, ensure_ascii=False).encode(), hashlib.sha256).hexdigest()
+
+
+def _last_mac(f, size):
+    """열린 영수증 로그(크기 size)의 마지막 줄의 mac (없으면 빈 문자열)"""
+    f.seek(max(0, size - 64 * 1024))
+    for line in reversed(f.read().splitlines()):
+        if line.strip():
+            return json.loads(line)["mac"]
+    return ""
+
+
+def _append_receipt(path, receipt, key, tail=None):
+    """로그를 잠그고 마지막 영수증의 mac 에 이어 서명한 receipt 를 추가 → (파일 크기, mac)
+
+    tail 은 이 프로세스가 마지막으로 쓴 (파일 크기, mac) 입니다. 파일 크기가 같으면 그 mac 을 쓰고,
+    다르면(다른 프로세스가 추가함) 잠근 상태에서 로그 끝을 다시 읽습니다.
+    """
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # 파일을 닫을 때 풀림
+        size = f.seek(0, os.SEEK_END)
+        receipt["prev_mac"] = tail[1] if tail and tail[0] == size else _last_mac(f, size)
+        receipt["mac"] = sign_receipt(receipt, key)
+        f.write((json.dumps(receipt, ensure_ascii=False) + "\n").encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell(), receipt["mac"]
+
+
+def verify_receipts(path, key):
+    """영수증 로그 검증 → (검증한 영수증 수, 오류 메시지 또는 None)"""
+    prev = ""
+    count = 0
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            receipt = json.loads(line)
+            if not hmac.compare_digest(sign_receipt(receipt, key), receipt.get("mac", "")):
+                return count, f"{line_no}번째 줄: 서명 불일치"
+            if receipt.get("prev_mac") != prev:
+                return count, f"{line_no}번째 줄: 직전 영수증과 이어지지 않음 (줄이 빠지거나 바뀜)"
+            prev = receipt["mac"]
+            count += 1
+    return count, None
+
+
+# ---------- 게시 ----------
+
+class Publisher:
+    """sink 들에 동시에 게시하고 서명 영수증을 남김 (sink 목록, 기본 제한 시간/재시도, 영수증 로그)"""
+
+    def __init__(self, sinks, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 receipts=DEFAULT_RECEIPTS, key=None):
+        self.sinks = list(sinks)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.receipts = receipts
+        self.key = key if key is not None else load_key()
+        self._tail = None    # 마지막으로 쓴 영수증의 (로그 크기, mac)
+        self._receipt_lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """publish.json 설정(dict 또는 경로) → Publisher"""
+        if isinstance(config, str):
+            with open(config, 'r') as f:
+                config = json.load(f)
+        return cls([make_sink(spec) for spec in config["sinks"]],
+                   timeout=float(config.get("timeout", DEFAULT_TIMEOUT)),
+                   retries=int(config.get("retries", DEFAULT_RETRIES)),
+                   backoff=float(config.get("backoff", DEFAULT_BACKOFF)),
+                   receipts=config.get("receipts", DEFAULT_RECEIPTS),
+                   key=load_key(config.get("key_file", DEFAULT_KEY_FILE)))
+
+    async def close(self):
+        await asyncio.gather(*(sink.close() for sink in self.sinks))
+
+    async def _send(self, sink, body, message, headers):
+        """sink 하나에 제한 시간/재시도를 적용해 게시 → 결과 dict"""
+        timeout = sink.timeout if sink.timeout is not None else self.timeout
+        retries = sink.retries if sink.retries is not None else self.retries
+        start = time.perf_counter()
+        outcome = {"sink": sink.name, "ok": False}
+        for attempt in range(1, retries + 2):
+            try:
+                outcome["detail"] = await asyncio.wait_for(sink.send(body, message, headers), timeout)
+                outcome["ok"] = True
+                outcome.pop("error", None)
+                break
+            except asyncio.TimeoutError:
+                outcome["error"] = f"timeout ({timeout}s)"
+            except PublishError as e:
+                outcome["error"] = str(e)
+                if not e.retry:
+                    break
+            except (OSError, ValueError) as e:
+                outcome["error"] = f"{type(e).__name__}: {e}"
+            if attempt <= retries:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        outcome["attempts"] = attempt
+        outcome["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return outcome
+
+    async def publish(self, data):
+        """commitment/reveal 하나를 모든 sink 에 동시에 게시 → 서명된 영수증 dict (ok: 모든 sink 성공)"""
+        tracing = metrics.enabled
+        if tracing:
+            t = metrics.clock()
+        message = make_message(data)
+        body = encode_message(message)
+        digest = hashlib.sha256(body).hexdigest()
+        headers = {
+            "X-Draw-Kind": message["kind"],
+            "X-Draw-Message-SHA256": digest,
+            "X-Draw-Signature": "sha256=" + hmac.new(self.key, body, hashlib.sha256).hexdigest(),
+        }
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(self._send(sink, body, message, headers) for sink in self.sinks))
+        receipt = {
+            "published_at": datetime.now(KST).isoformat(),
+            "kind": message["kind"],
+            "commitment_hash": message.get("commitment_hash"),
+            "message_sha256": digest,
+            "ok": all(outcome["ok"] for outcome in outcomes),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            "sinks": outcomes,
+        }
+        await self._record(receipt)
+        if tracing:
+            metrics.lap("publish", t)
+            if not receipt["ok"]:
+                metrics.count("publish_failed")
+        return receipt
+
+    async def _record(self, receipt):
+        """직전 영수증의 mac 을 이어 서명하고 로그에 추가 (동시 게시, 다른 프로세스와도 한 줄씩 순서대로)"""
+        loop = asyncio.get_running_loop()
+        async with self._receipt_lock:
+            self._tail = await loop.run_in_executor(None, _append_receipt, self.receipts, receipt, self.key,
+                                                    self._tail)
+
+
+async def publish_all(publisher, items):
+    """여러 commitment/reveal 을 동시에 게시 → 영수증 목록 (입력 순서)"""
+    try:
+        return await asyncio.gather(*(publisher.publish(data) for data in items))
+    finally:
+        await publisher.close()
+
+
+# publish_sync 가 쓰는 게시 전용 이벤트 루프와 설정별 공유 Publisher
+_loop = None
+_loop_lock = threading.Lock()
+_publishers = {}   # 설정 키 → Publisher
+_publishers_lock = threading.Lock()
+
+
+def _publish_loop():
+    """게시 전용 이벤트 루프 (처음 호출 때 데몬 스레드에서 시작)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="draw-publish", daemon=True).start()
+        return _loop
+
+
+def _forget_after_fork():
+    # fork 된 자식에는 루프 스레드가 없으므로 처음부터 다시 시작
+    global _loop, _loop_lock, _publishers_lock
+    _loop = None
+    _loop_lock = threading.Lock()
+    _publishers_lock = threading.Lock()
+    _publishers.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_after_fork)
+
+
+def _run(coro, timeout=None):
+    """게시 루프에서 coro 를 실행하고 결과를 기다림"""
+    return asyncio.run_coroutine_threadsafe(coro, _publish_loop()).result(timeout)
+
+
+async def _create_publisher(config):
+    # 게시 루프 안에서 만들어 잠금/연결 풀이 그 루프에 묶이게 함
+    return Publisher.from_config(config)
+
+
+def get_publisher(config):
+    """설정(dict 또는 경로)별 공유 Publisher. 설정 파일이 바뀌면 새로 만들고 이전 것은 닫습니다."""
+    if isinstance(config, str):
+        path = os.path.abspath(config)
+        key = (path, os.path.getmtime(path))
+    else:
+        key = json.dumps(config, sort_keys=True)
+    with _publishers_lock:
+        publisher = _publishers.get(key)
+        if publisher is None:
+            stale = [_publishers.pop(k) for k in list(_publishers) if isinstance(k, tuple) and k[0] == key[0]]
+            for old in stale:
+                _run(old.close())
+            publisher = _publishers[key] = _run(_create_publisher(config))
+    return publisher
+
+
+def close_publishers(timeout=5.0):
+    """공유 Publisher 들의 연결을 닫음 (프로세스 종료 시 자동 호출)"""
+    with _publishers_lock:
+        publishers = list(_publishers.values())
+        _publishers.clear()
+    if _loop is None or not publishers:
+        return
+
+    async def close_all():
+        await asyncio.gather(*(publisher.close() for publisher in publishers))
+    _run(close_all(), timeout)
+
+
+atexit.register(close_publishers)
+
+
+def publish_sync(config, items, publisher=None):
+    """동기 코드(CLI, Streamlit)에서 게시 → 영수증 목록
+
+    publisher 를 주지 않으면 설정별 공유 Publisher(get_publisher)를 써서 호출이 바뀌어도
+    webhook 연결 풀과 영수증 체인을 이어 씁니다. 여러 스레드에서 동시에 호출해도 됩니다.
+    """
+    publisher = publisher or get_publisher(config)
+
+    async def run():
+        return await asyncio.gather(*(publisher.publish(data) for data in items))
+    return _run(run())
+
+
+def print_receipt(receipt, file=sys.stderr):
+    mark = "✅" if receipt["ok"] else "❌"
+    print(f"{mark} {receipt['kind']} {(receipt['commitment_hash'] or '')[:16]}... 게시 "
+          f"({receipt['elapsed_ms']:.1f}ms, sink {len(receipt['sinks'])}개)", file=file)
+    for outcome in receipt["sinks"]:
+        status = outcome.get("detail", "") if outcome["ok"] else outcome["error"]
+        print(f"   {'✓' if outcome['ok'] else '✗'} {outcome['sink']}: {status} "
+              f"(시도 {outcome['attempts']}회, {outcome['latency_ms']:.1f}ms)", file=file)
+
+
+def _read_items(source):
+    """JSON 파일 하나 또는 JSONL(여러 줄) → 데이터 목록 ("-" 이면 표준 입력)"""
+    text = sys.stdin.read() if source == "-" else open(source, 'r').read()
+    try:
+        return [json.loads(text)]
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    key_path = _take_option(args, "--key")
+    if "--check-receipts" in args:
+        args.remove("--check-receipts")
+        path = args[0] if args else DEFAULT_RECEIPTS
+        count, error = verify_receipts(path, load_key(key_path or DEFAULT_KEY_FILE))
+        print(f"{'❌' if error else '✅'} 영수증 {count}건 검증{': ' + error if error else ''} ({path})")
+        sys.exit(1 if error else 0)
+
+    config_path = _take_option(args, "--config")
+    sink_specs = []
+    while "--sink" in args:
+        sink_specs.append(_take_option(args, "--sink"))
+    timeout = _take_option(args, "--timeout")
+    retries = _take_option(args, "--retries")
+    receipts = _take_option(args, "--receipts")
+    if "--metrics" in args:
+        args.remove("--metrics")
+        metrics.enable()
+    if len(args) != 1 or not (config_path or sink_specs):
+        print("사용법: python draw_publish.py <commitment.json|reveal.json|reveals.jsonl|-> "
+              "--config publish.json | --sink file:DIR --sink webhook:URL --sink queue:DIR")
+        print("        [--timeout 5] [--retries 2] [--receipts publish_receipts.jsonl] [--key publish.key]")
+        print("        python draw_publish.py --check-receipts [publish_receipts.jsonl] [--key publish.key]")
+        sys.exit(2)
+
+    config = {}
+    if config_path:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    config["sinks"] = list(config.get("sinks", [])) + sink_specs
+    for name, value in (("timeout", timeout), ("retries", retries), ("receipts", receipts), ("key_file", key_path)):
+        if value is not None:
+            config[name] = value
+
+    receipts_list = publish_sync(config, _read_items(args[0]))
+    for receipt in receipts_list:
+        print_receipt(receipt)
+    if metrics.enabled:
+        print(metrics.to_json(), file=sys.stderr)
+    sys.exit(0 if all(receipt["ok"] for receipt in receipts_list) else 1)
@@ -0,0 +1,267 @@
+"""
+공정한 추첨 시스템 예약 공개 데몬 (asyncio)
+
+    python draw_scheduler.py [--ledger draws.db] [--concurrency 4] [--poll 1.0] [--until-idle] [--metrics]
+
+장부(schedules)에 예약된 추첨을 공개 시각에 자동으로 공개하고 결과를 장부에 기록합니다.
+예약은 `python random_draw.py schedule ...` 로 추가하며, 데몬이 실행 중이어도 됩니다.
+
+- 모든 예약을 타이머 힙 하나에 넣고 가장 이른 공개 시각(또는 새 예약 확인 주기)까지만 잠듭니다.
+  추첨마다 스레드나 타이머를 두지 않으므로 예약 10만 건도 가볍게 유지됩니다.
+- 같은 때 도래한 추첨은 REVEAL_BATCH 건씩 묶어 스레드에서 추첨하고 한 트랜잭션으로 기록하며,
+  동시에 처리하는 묶음 수는 --concurrency 로 제한합니다.
+- 결과는 트랜잭션으로 기록되므로 중간에 죽어도 기록된 추첨은 revealed, 나머지는 pending 으로
+  남습니다. 재시작하면 pending 예약으로 힙을 복구하고, 공개 시각이 지난 추첨은 바로 공개합니다.
+  추첨 결과는 Commitment 와 범위로만 정해지므로 늦게 공개해도 결과는 같습니다.
+- 묶음 공개나 기록이 실패하면(장부 잠금 등) 그 묶음을 RETRY_BACKOFF 초부터 두 배씩(최대 RETRY_BACKOFF_MAX 초)
+  늦춰 힙에 다시 넣고, RETRY_LIMIT 번 실패하면 pending 으로 남겨 재시작 때 다시 공개합니다.
+"""
+
+import asyncio
+import heapq
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+from draw_core import draw_reveal
+from draw_core import ledger, metrics
+
+DEFAULT_CONCURRENCY = 4
+# 새 예약을 장부에서 확인하는 주기(초)
+DEFAULT_POLL = 1.0
+# 한 트랜잭션으로 공개하는 최대 추첨 수
+REVEAL_BATCH = 1000
+# 공개에 실패한 묶음의 재시도 횟수와 대기 시간(초, 두 배씩 늘림)
+RETRY_LIMIT = 5
+RETRY_BACKOFF = 1.0
+RETRY_BACKOFF_MAX = 60.0
+
+
+class RevealScheduler:
+    """예약 타이머 힙과 공개 워커 (장부 경로, 동시 처리 묶음 수)"""
+
+    def __init__(self, ledger_path=ledger.DEFAULT_LEDGER, concurrency=DEFAULT_CONCURRENCY, poll=DEFAULT_POLL,
+                 verbose=True):
+        self.ledger_path = ledger_path
+        self.verbose = verbose
+        self.concurrency = concurrency
+        self.poll = poll
+        self.heap = []       # (공개 시각, 예약 ID, 추첨 ID, min_num, max_num, winners)
+        self.current = {}    # 추첨 ID → 유효한(가장 최근) 예약 ID
+        self.last_schedule_id = 0
+        self.retries = {}    # 예약 ID → (실패 횟수, 원래 공개 시각)
+        self.stats = {"revealed": 0, "skipped": 0, "failed": 0, "retried": 0, "max_delay": 0.0, "total_delay": 0.0}
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def close(self):
+        self.pool.shutdown()
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    # ---------- 예약 ----------
+
+    def _read_schedules(self, after_id):
+        with closing(ledger.connect(self.ledger_path)) as conn:
+            return ledger.pending_schedules(conn, after_id)
+
+    async def refresh(self):
+        """장부에서 새 예약을 읽어 힙에 추가 → 추가된 수 (처음 호출은 재시작 복구)"""
+        rows = await self._in_thread(self._read_schedules, self.last_schedule_id)
+        for row in rows:
+            self.current[row["draw_id"]] = row["id"]
+            heapq.heappush(self.heap, (row["reveal_at"], row["id"], row["draw_id"],
+                                       row["min_num"], row["max_num"], row["winners"]))
+        if rows:
+            self.last_schedule_id = rows[-1]["id"]
+        return len(rows)
+
+    def _pop_due(self, now):
+        """공개 시각이 된 예약을 꺼냄 (다시 예약되어 무효가 된 항목은 버림)"""
+        due = []
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self.current.get(entry[2]) == entry[1]:
+                del self.current[entry[2]]
+                due.append(entry)
+        return due
+
+    # ---------- 공개 ----------
+
+    def _reveal_due(self, due):
+        """예약 묶음을 추첨하여 한 트랜잭션으로 기록 (스레드에서 실행) → (공개, 건너뜀, 실패, 기록 시각)"""
+        tracing = metrics.enabled
+        if tracing:
+            t = metrics.clock()
+        with closing(ledger.connect(self.ledger_path)) as conn:
+            reveals, skipped, failed = self._record_due(conn, due)
+        if tracing:
+            metrics.lap("scheduled_reveal", t)
+        return reveals, skipped, failed, time.time()
+
+    def _record_due(self, conn, due):
+        draws = ledger.get_draws(conn, [entry[2] for entry in due])
+        reveals = []
+        skipped = failed = 0
+        for reveal_at, _, draw_id, min_num, max_num, winners in due:
+            draw = draws.get(draw_id)
+            if draw is None or draw["status"] != "pending":
+                skipped += 1
+                continue
+            if "weights_sha256" in draw["commitment"] or "roster_sha256" in draw["commitment"]:
+                print(f"❌ 추첨 {draw_id}: 가중치/명단 추첨은 예약 공개할 수 없습니다.", file=sys.stderr)
+                failed += 1
+                continue
+            try:
+                reveals.append((draw_id, reveal_at, draw_reveal(draw["commitment"], min_num, max_num, winners)))
+            except ValueError as e:
+                print(f"❌ 추첨 {draw_id}: {e}", file=sys.stderr)
+                failed += 1
+
+        try:
+            ledger.record_reveals(conn, [(draw_id, reveal_data) for draw_id, _, reveal_data in reveals])
+        except ValueError:
+            # 그사이 다른 프로세스가 공개한 추첨이 있으면 한 건씩 기록
+            recorded = []
+            for draw_id, reveal_at, reveal_data in reveals:
+                try:
+                    ledger.record_reveal(conn, draw_id, reveal_data)
+                    recorded.append((draw_id, reveal_at, reveal_data))
+                except ValueError:
+                    skipped += 1
+            reveals = recorded
+        return reveals, skipped, failed
+
+    def _retry(self, due, error):
+        """실패한 묶음을 늦춰 힙에 다시 넣음 (RETRY_LIMIT 번 넘게 실패한 예약은 pending 으로 남김)"""
+        now = time.time()
+        retried = gave_up = 0
+        for entry in due:
+            reveal_at, schedule_id, draw_id = entry[:3]
+            attempts, first_due = self.retries.pop(schedule_id, (0, reveal_at))
+            attempts += 1
+            if attempts > RETRY_LIMIT:
+                gave_up += 1
+                continue
+            if draw_id in self.current:
+                continue  # 그사이 다시 예약됨: 새 예약이 공개
+            self.retries[schedule_id] = (attempts, first_due)
+            self.current[draw_id] = schedule_id
+            backoff = min(RETRY_BACKOFF * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+            heapq.heappush(self.heap, (now + backoff, *entry[1:]))
+            retried += 1
+        self.stats["retried"] += retried
+        self.stats["failed"] += gave_up
+        print(f"❌ 공개 실패 ({len(due)}건, 재시도 {retried}건, 재시작 시 다시 시도 {gave_up}건): {error}",
+              file=sys.stderr)
+
+    async def _reveal(self, due, slot):
+        try:
+            reveals, skipped, failed, recorded_at = await self._in_thread(self._reveal_due, due)
+        except Exception as e:
+            # 장부 오류 등: 이 묶음은 pending 으로 남으므로 잠시 뒤 다시 시도
+            self._retry(due, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            slot.release()
+        retries = self.retries
+        if retries:
+            first_due = {entry[2]: retries.pop(entry[1])[1] for entry in due if entry[1] in retries}
+            reveals = [(draw_id, first_due.get(draw_id, reveal_at), reveal_data)
+                       for draw_id, reveal_at, reveal_data in reveals]
+        stats = self.stats
+        stats["revealed"] += len(reveals)
+        stats["skipped"] += skipped
+        stats["failed"] += failed
+        if reveals:
+            # 재시도한 추첨도 원래 공개 시각부터의 지연
+            delays = [recorded_at - reveal_at for _, reveal_at, _ in reveals]
+            stats["total_delay"] += sum(delays)
+            stats["max_delay"] = max(stats["max_delay"], max(delays))
+        if reveals and self.verbose:
+            print(f"🎲 {len(reveals)}건 공개 (추첨 ID {reveals[0][0]}..., 최대 지연 {max(delays) * 1000:.1f}ms)",
+                  file=sys.stderr)
+
+    async def run(self, stop=None, until_idle=False):
+        """stop 이벤트가 set 될 때까지(until_idle 이면 예약이 모두 공개될 때까지) 실행"""
+        stop = stop or asyncio.Event()
+        slot = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        loop = asyncio.get_running_loop()
+
+        recovered = await self.refresh()
+        print(f"⏰ 예약 공개 데몬: 대기 중인 예약 {recovered}건 (장부: {self.ledger_path})", file=sys.stderr)
+        next_poll = loop.time() + self.poll
+        while not stop.is_set():
+            due = self._pop_due(time.time())
+            for i in range(0, len(due), REVEAL_BATCH):
+                await slot.acquire()
+                task = asyncio.create_task(self._reveal(due[i:i + REVEAL_BATCH], slot))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if loop.time() >= next_poll:
+                await self.refresh()
+                next_poll = loop.time() + self.poll
+                continue
+            if until_idle and not self.heap and not tasks:
+                break
+            delay = next_poll - loop.time()
+            if self.heap:
+                delay = min(delay, self.heap[0][0] - time.time())
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return self.stats
+
+
+async def serve(ledger_path=ledger.DEFAULT_LEDGER, concurrency=DEFAULT_CONCURRENCY, poll=DEFAULT_POLL,
+                until_idle=False):
+    """데몬 실행 (SIGINT/SIGTERM 을 받으면 진행 중인 공개를 마치고 종료) → 통계"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: KeyboardInterrupt 로 종료
+    scheduler = RevealScheduler(ledger_path, concurrency, poll)
+    try:
+        stats = await scheduler.run(stop, until_idle)
+    finally:
+        scheduler.close()
+    mean = stats["total_delay"] / stats["revealed"] if stats["revealed"] else 0.0
+    print(f"⏹️  공개 {stats['revealed']}건, 건너뜀 {stats['skipped']}건, 실패 {stats['failed']}건, "
+          f"재시도 {stats['retried']}건, "
+          f"지연 평균 {mean * 1000:.1f}ms / 최대 {stats['max_delay'] * 1000:.1f}ms", file=sys.stderr)
+    return stats
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    ledger_path = _take_option(args, "--ledger", ledger.DEFAULT_LEDGER)
+    concurrency = int(_take_option(args, "--concurrency", DEFAULT_CONCURRENCY))
+    poll = float(_take_option(args, "--poll", DEFAULT_POLL))
+    if "--metrics" in args:
+        metrics.enable()
+    try:
+        asyncio.run(serve(ledger_path, concurrency, poll, "--until-idle" in args))
+    except KeyboardInterrupt:
+        pass
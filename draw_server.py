@@ -0,0 +1,379 @@
+"""
+공정한 추첨 시스템 HTTP API 서버 (asyncio)
+
+    python draw_server.py [--host 127.0.0.1] [--port 8600] [--workers N] [--ledger draws.db] [--data-dir DIR] [--metrics]
+
+엔드포인트 (요청/응답 모두 JSON):
+- POST /commit        {"weights_sha256"? | "roster_sha256", "roster_lines"} → Commitment 생성
+- POST /reveal        {"draw_id" | "commitment", "min_num", "max_num", "winners"?}
+- POST /verify        reveal 레코드 하나                            → 검증 결과
+- POST /verify-batch  {"records": [...]} 또는 JSONL 본문             → 검증 결과 목록 (입력 순서)
+- GET  /health
+- GET  /metrics       단계별 시간/횟수 (Prometheus 텍스트, ?format=json 이면 JSON). --metrics 필요
+
+해시 계산과 추첨은 프로세스 풀에서, 장부(SQLite) 접근은 스레드에서 실행하므로
+이벤트 루프는 막히지 않습니다. 서버에 --ledger 를 주면 /commit 은 Nonce 를 돌려주지 않고
+장부에 보관하며 추첨 ID 를 반환합니다.
+
+요청 본문은 JSON 객체여야 합니다. 검증 레코드의 weights_path / roster_path 는 기본적으로 거부하며,
+--data-dir 를 주면 그 디렉터리 안의 파일(상대 경로)만 허용합니다. 당첨자 수는 MAX_UNTRUSTED_WINNERS(10,000),
+범위 크기는 2^64 이하만 받습니다 (넘으면 400, 배치 검증은 레코드별 error: limit_exceeded).
+/commit 의 파일 해시는 64자리 소문자 hex, roster_lines 는 1 이상의 정수여야 합니다.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from contextlib import closing
+from http import HTTPStatus
+
+from draw_core import draw_reveal, make_commitment, verify_record
+from draw_core.draw import check_limits, confine_record
+from draw_core import ledger, metrics
+from draw_core.batch import records_to_jsonl, split_jsonl, verify_jsonl_bytes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+
+# 요청 본문 최대 크기 (배치 검증 고려)
+MAX_BODY = 64 * 1024 * 1024
+# 계측 구간 이름으로 쓰는 경로 (그 밖의 경로는 "http other" 로 묶어 구간 수가 늘지 않게 함)
+ENDPOINTS = frozenset({"/commit", "/reveal", "/verify", "/verify-batch", "/health", "/metrics"})
+# 요청 하나의 최대 헤더 줄 수 (줄 하나는 StreamReader 한도인 64KiB 까지)
+MAX_HEADERS = 100
+# 배치 검증 시 워커 하나에 보내는 본문 크기 (약 500 레코드)
+BATCH_CHUNK_BYTES = 128 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+def _sha256_field(body, key):
+    """요청의 파일 해시 값 (64자리 소문자 hex 가 아니면 400)"""
+    value = body[key]
+    if not (isinstance(value, str) and _SHA256_HEX.fullmatch(value)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{key} must be a 64-character lowercase hex SHA-256")
+    return value
+
+
+def _reveal_from_ledger(ledger_path, draw_ref, min_num, max_num, winners):
+    """장부의 추첨을 공개하고 결과 기록 (스레드에서 실행)"""
+    with closing(ledger.connect(ledger_path)) as conn:
+        draw = ledger.get_draw(conn, draw_ref)
+        if draw is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"draw not found: {draw_ref}")
+        if draw["status"] != "pending":
+            raise HTTPError(HTTPStatus.CONFLICT, f"draw already revealed: {draw['id']}")
+        reveal_data = draw_reveal(draw["commitment"], min_num, max_num, winners)
+        ledger.record_reveal(conn, draw["id"], reveal_data)
+    reveal_data["draw_id"] = draw["id"]
+    return reveal_data
+
+
+def _add_to_ledger(ledger_path, commitment_hash, commitment_data):
+    with closing(ledger.connect(ledger_path)) as conn:
+        return ledger.add_commitment(conn, commitment_hash, commitment_data)
+
+
+class DrawServer:
+    """추첨 API 서버 상태 (워커 풀, 장부 경로)"""
+
+    def __init__(self, workers=None, ledger_path=None, data_dir=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.ledger_path = ledger_path
+        # 검증 레코드가 가리킬 수 있는 가중치/명단 파일 디렉터리 (없으면 파일 경로 거부)
+        self.data_dir = data_dir
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # 워커를 지금 띄움: 요청 처리 중에 fork 되면 자식이 열린 클라이언트 소켓을 물려받아
+        # Connection: close 응답 뒤에도 연결이 닫히지 않음
+        self.pool.submit(int).result()
+
+    def close(self):
+        self.pool.shutdown()
+
+    async def _in_pool(self, func, *args):
+        loop = asyncio.get_running_loop()
+        if not metrics.enabled:
+            return await loop.run_in_executor(self.pool, func, *args)
+        # 워커 프로세스에서 모은 단계별 계측을 이 프로세스에 합침
+        result, snap = await loop.run_in_executor(self.pool, metrics.collect, func, *args)
+        metrics.merge(snap)
+        return result
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # ---------- 엔드포인트 ----------
+
+    async def commit(self, body):
+        extra = {}
+        if body.get("weights_sha256") is not None:
+            extra["weights_sha256"] = _sha256_field(body, "weights_sha256")
+        if body.get("roster_sha256") is not None:
+            extra["roster_sha256"] = _sha256_field(body, "roster_sha256")
+            roster_lines = body.get("roster_lines")
+            if isinstance(roster_lines, bool) or not isinstance(roster_lines, int) or roster_lines < 1:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "roster_lines must be an integer >= 1")
+            extra["roster_lines"] = roster_lines
+        commitment_hash, commitment_data = make_commitment(extra)
+        if self.ledger_path:
+            draw_id = await self._in_thread(_add_to_ledger, self.ledger_path, commitment_hash, commitment_data)
+            return {"draw_id": draw_id, "commitment_hash": commitment_hash,
+                    "timestamp": commitment_data["timestamp"]}
+        return {"commitment_hash": commitment_hash, "commitment": commitment_data}
+
+    async def reveal(self, body):
+        min_num = int(body.get("min_num", 1))
+        max_num = int(body.get("max_num", 10))
+        winners = int(body.get("winners", 1))
+        check_limits(min_num, max_num, winners)
+        if "draw_id" in body:
+            if not self.ledger_path:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "server started without --ledger")
+            return await self._in_thread(_reveal_from_ledger, self.ledger_path, body["draw_id"],
+                                         min_num, max_num, winners)
+        if "commitment" not in body:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "draw_id or commitment is required")
+        return await self._in_pool(draw_reveal, body["commitment"], min_num, max_num, winners)
+
+    async def verify(self, body):
+        return await self._in_pool(verify_record, confine_record(body, self.data_dir))
+
+    async def verify_batch(self, raw_body):
+        """본문을 줄 단위 조각으로 나눠 워커에 분산 → 입력 순서대로 결과를 내보내는 응답 조각 생성기
+
+        {"records": [...]} 본문의 파싱과 디코드/줄 분할/결과 직렬화는 모두 워커에서 하므로
+        64MB 본문도 이벤트 루프를 막지 않습니다.
+        """
+        data = raw_body
+        if raw_body[:1024].lstrip()[:1] == b"{":
+            data = await self._in_pool(records_to_jsonl, raw_body) or raw_body
+        return self._stream_batch(data)
+
+    async def _stream_batch(self, data):
+        # 워커마다 두 조각까지만 미리 보내 결과가 메모리에 쌓이지 않게 함
+        pending = deque()
+        total = failed = 0
+        line_no = 1
+        separator = b""
+
+        def result(part):
+            nonlocal total, failed, separator
+            part_failed, lines = part
+            total += len(lines)
+            failed += part_failed
+            piece = separator + ",".join(lines).encode('utf-8') if lines else b""
+            if lines:
+                separator = b","
+            return piece
+
+        try:
+            yield b'{"results": ['
+            for start, end in split_jsonl(data, BATCH_CHUNK_BYTES):
+                pending.append(asyncio.ensure_future(
+                    self._in_pool(verify_jsonl_bytes, data[start:end], line_no, True, self.data_dir)))
+                line_no += data.count(b"\n", start, end)
+                if len(pending) >= self.workers * 2:
+                    yield result(await pending.popleft())
+            while pending:
+                yield result(await pending.popleft())
+            yield f'], "total": {total}, "failed": {failed}}}'.encode()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    # ---------- HTTP 처리 ----------
+
+    async def dispatch(self, method, path, raw_body, query=""):
+        if method == "GET" and path == "/health":
+            return {"ok": True, "workers": self.workers}
+        if method == "GET" and path == "/metrics":
+            if not metrics.enabled:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "metrics disabled (start with --metrics)")
+            return metrics.snapshot() if "format=json" in query else metrics.to_prometheus()
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+        if path == "/verify-batch":
+            return await self.verify_batch(raw_body)
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid JSON body")
+        if not isinstance(body, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON body must be an object")
+        if path == "/commit":
+            return await self.commit(body)
+        if path == "/reveal":
+            return await self.reveal(body)
+        if path == "/verify":
+            return await self.verify(body)
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"unknown endpoint: {path}")
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode(), "application/json; charset=utf-8"
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _write_stream(self, writer, pieces, keep_alive, method, path):
+        """응답 조각을 chunked 로 보냄 → 연결 유지 여부 (도중에 실패하면 끝 조각 없이 연결을 끊음)"""
+        writer.write(
+            f"HTTP/1.1 200 OK\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+        )
+        try:
+            async for piece in pieces:
+                if piece:  # 빈 조각은 응답 끝 표시이므로 건너뜀
+                    writer.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+                    await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # 상태 코드는 이미 보냈으므로 끝 조각 없이 끊어 클라이언트가 불완전한 응답임을 알게 함
+            print(f"❌ {method} {path}: {type(e).__name__}: {e}", file=sys.stderr)
+            if metrics.enabled:
+                metrics.count("http_errors")
+            return False
+        finally:
+            await pieces.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return keep_alive
+
+    async def handle(self, reader, writer):
+        """연결 하나 처리 (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    # 줄이 StreamReader 한도(64KiB)를 넘음 (LimitOverrunError)
+                    await self._respond(writer, HTTPStatus.REQUEST_URI_TOO_LONG, {"error": "request line too long"},
+                                        False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                try:
+                    for _ in range(MAX_HEADERS + 1):
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode('latin-1').partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    else:
+                        raise ValueError("too many headers")
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                        {"error": "request headers too large"}, False)
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", "0" if method != "POST" else ""))
+                except ValueError:
+                    length = -1
+                tracing = False
+                if length < 0:
+                    # 본문 길이를 알 수 없으면 다음 요청의 경계도 알 수 없으므로 연결을 닫음
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "valid Content-Length required"}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    raw_body = await reader.readexactly(length) if length else b""
+                    path, _, query = path.partition("?")
+                    tracing = metrics.enabled
+                    if tracing:
+                        start = metrics.clock()
+                    try:
+                        status, payload = HTTPStatus.OK, await self.dispatch(method, path, raw_body, query)
+                    except HTTPError as e:
+                        status, payload = e.status, {"error": e.message}
+                    except (KeyError, TypeError, ValueError) as e:
+                        status, payload = HTTPStatus.BAD_REQUEST, {"error": f"{type(e).__name__}: {e}"}
+                    except Exception as e:
+                        # 예상하지 못한 오류도 응답 없이 연결을 끊지 않음
+                        print(f"❌ {method} {path}: {type(e).__name__}: {e}", file=sys.stderr)
+                        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}
+
+                if hasattr(payload, "__aiter__"):
+                    # 배치 검증: 결과를 만드는 대로 보냄 (계측은 응답을 다 보낸 시점까지)
+                    keep_alive = await self._write_stream(writer, payload, keep_alive, method, path)
+                else:
+                    await self._respond(writer, status, payload, keep_alive)
+                if tracing:
+                    metrics.lap(f"http {path}" if path in ENDPOINTS else "http other", start)
+                    if status != HTTPStatus.OK:
+                        metrics.count("http_errors")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, ledger_path=None, ready=None, data_dir=None):
+    """서버 실행 (취소될 때까지). ready 이벤트가 있으면 대기 시작 후 set 합니다."""
+    app = DrawServer(workers, ledger_path, data_dir)
+    server = await asyncio.start_server(app.handle, host, port, backlog=1024)
+    print(f"🎲 추첨 API 서버: http://{host}:{port}  (워커 {app.workers}개)", file=sys.stderr)
+    try:
+        async with server:
+            if ready is not None:
+                ready.set()
+            await server.serve_forever()
+    finally:
+        app.close()
+
+
+def _take_option(args, name, default=None):
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    host = _take_option(args, "--host", DEFAULT_HOST)
+    port = int(_take_option(args, "--port", DEFAULT_PORT))
+    workers = _take_option(args, "--workers")
+    ledger_path = _take_option(args, "--ledger")
+    data_dir = _take_option(args, "--data-dir")
+    if "--metrics" in args:
+        metrics.enable()
+    try:
+        asyncio.run(serve(host, port, int(workers) if workers else None, ledger_path, data_dir=data_dir))
+    except KeyboardInterrupt:
+        pass
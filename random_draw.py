@@ -1,16 +1,37 @@
 # %%
-import random
-import hashlib
+import atexit
 import json
 import os
-from datetime import datetime, timezone, timedelta
+import random
+import sys
+from contextlib import closing
+from datetime import datetime
+from itertools import islice
 
-# 한국 타임존 (KST = UTC+9)
-KST = timezone(timedelta(hours=9))
+from draw_core import (
+    KST,
+    compute_commitment_hash,
+    derive_seed,
+    draw_numbers,
+    draw_reveal,
+    draw_subdraws,
+    make_commitment,
+    verify_record,
+)
+from draw_core.commitment import derive_subseed, make_commitments
+from draw_core import archive, audit, hashchain, ledger, merkle, metrics, sweep, weighted
+from draw_core.roster import open_roster
+from draw_core.batch import iter_verify
 
 #%%
-def generate_commitment():
-    """1단계: Commitment 생성 (추첨 전)"""
+def generate_commitment(weights=None, ledger_path=None, roster=None, publish=None):
+    """1단계: Commitment 생성 (추첨 전)
+
+    weights 로 가중치 파일을 주면 그 파일의 SHA-256 을 Commitment 에 포함합니다.
+    roster 로 명단 파일(한 줄에 참가자 한 명)을 주면 그 파일의 SHA-256 과 줄 수를 포함합니다.
+    ledger_path 를 주면 commitment.json 대신 추첨 장부에 기록하고 추첨 ID 를 알려줍니다.
+    publish 로 게시 설정 파일(publish.json)을 주면 해시를 설정된 곳에 바로 게시합니다 (Nonce 제외).
+    """
 
     # 한국 시간으로 현재 시간 생성
     draw_time = datetime.now(KST)
@@ -21,15 +42,26 @@ def generate_commitment():
         "timestamp": draw_time.isoformat(),
         "nonce": nonce
     }
+    if weights:
+        commitment_data["weights_sha256"] = weighted.file_digest(weights)
+    if roster:
+        # 명단 해시와 함께 줄 인덱스도 미리 만들어 둠 (.roster_cache)
+        with open_roster(roster) as entrants:
+            commitment_data["roster_sha256"] = entrants.digest
+            commitment_data["roster_lines"] = len(entrants)
 
     # 해시 계산 (SHA-256)
-    data_string = json.dumps(commitment_data, sort_keys=True)
-    commitment_hash = hashlib.sha256(data_string.encode()).hexdigest()
+    commitment_hash = compute_commitment_hash(commitment_data)
     timestamp_str = commitment_data["timestamp"]
 
     # Commitment 저장
-    with open('commitment.json', 'w') as f:
-        json.dump(commitment_data, f, indent=2)
+    draw_id = None
+    if ledger_path:
+        with closing(ledger.connect(ledger_path)) as conn:
+            draw_id = ledger.add_commitment(conn, commitment_hash, commitment_data)
+    else:
+        with metrics.span("file_io"), open('commitment.json', 'w') as f:
+            json.dump(commitment_data, f, indent=2)
 
     print("=" * 70)
     print("🔒 1단계: COMMITMENT 생성 완료")
@@ -38,39 +70,118 @@ def generate_commitment():
     print(f"\n📌 Commitment Hash (먼저 공개할 값):")
     print(f"{commitment_hash}")
     print(f"\nTimestamp (먼저 공개할 값, KST 포함): {timestamp_str}")
+    if weights:
+        print(f"\n가중치 파일 SHA-256 (먼저 공개할 값): {commitment_data['weights_sha256']}")
+    if roster:
+        print(f"\n명단 파일 SHA-256 (먼저 공개할 값): {commitment_data['roster_sha256']}")
+        print(f"명단 참가자 수: {commitment_data['roster_lines']}")
+    if draw_id is not None:
+        print(f"\n🗂️  추첨 ID: {draw_id} (장부: {ledger_path})")
     print("\n" + "=" * 70)
     print("⚠️  이 해시값과 타임스탬프를 먼저 공개하세요!")
     print("⚠️  추첨 후 원본 데이터를 공개하면 검증이 가능합니다.")
     print("💡 모든 시각은 한국 표준시(KST, UTC+9)입니다.")
     print("=" * 70)
+    if publish:
+        _publish(publish, [commitment_data])
 
     return commitment_hash
 
-def reveal_and_draw(min_num=1, max_num=10):
-    """2단계: 추첨 및 검증 (추첨 시)"""
+def reveal_and_draw(min_num=1, max_num=10, winners=1, weights=None, draw_id=None, ledger_path=None, roster=None,
+                    sub_index=None, subdraws=None, start=0, out="subdraws.jsonl", engine="python", publish=None):
+    """2단계: 추첨 및 검증 (추첨 시)
 
-    # Commitment 데이터 읽기
-    try:
-        with open('commitment.json', 'r') as f:
-            commitment_data = json.load(f)
-    except FileNotFoundError:
-        print("❌ 에러: commitment.json 파일을 찾을 수 없습니다.")
-        print("먼저 1단계(commitment 생성)를 실행하세요.")
+    winners 가 2 이상이면 같은 시드로 중복 없이 여러 명을 순서대로 추첨합니다.
+    Commitment 에 가중치 파일 해시가 있으면 weights 파일로 가중치 추첨을 합니다.
+    Commitment 에 명단 파일 해시가 있으면 1 ~ 명단 줄 수에서 추첨하고 roster 파일에서 당첨자 줄을 찾습니다.
+    draw_id 를 주면 commitment.json 대신 추첨 장부에서 읽고 결과도 장부에 기록합니다.
+    sub_index 를 주면 counter 방식(seed_scheme 2)의 하위 추첨 하나를 reveal.json 에 기록하고,
+    subdraws 를 주면 하위 추첨 start ~ start + subdraws - 1 을 모두 out(JSONL)에 기록합니다.
+    publish 로 게시 설정 파일을 주면 reveal 을 설정된 곳에 바로 게시합니다 (하위 추첨 JSONL 은 draw_publish.py 로).
+    """
+
+    # 하위 추첨은 Commitment 하나에 결과가 여러 개이므로 장부(추첨당 공개 1회)에 기록하지 않음
+    if draw_id is not None and (sub_index is not None or subdraws is not None):
+        print("❌ 에러: 하위 추첨(--index/--draws)은 commitment.json 으로만 실행할 수 있습니다.")
         return
 
-    # 해시 재계산으로 검증
-    data_string = json.dumps(commitment_data, sort_keys=True)
-    commitment_hash = hashlib.sha256(data_string.encode()).hexdigest()
+    # Commitment 데이터 읽기
+    if draw_id is not None:
+        ledger_path = ledger_path or ledger.DEFAULT_LEDGER
+        with closing(ledger.connect(ledger_path)) as conn:
+            draw = ledger.get_draw(conn, draw_id)
+        if draw is None:
+            print(f"❌ 에러: 추첨 장부에서 {draw_id} 를 찾을 수 없습니다.")
+            return
+        if draw["status"] != "pending":
+            print(f"❌ 에러: 추첨 {draw['id']} 은(는) 이미 공개되었습니다.")
+            return
+        commitment_data = draw["commitment"]
+    else:
+        try:
+            with metrics.span("file_io"), open('commitment.json', 'r') as f:
+                commitment_data = json.load(f)
+        except FileNotFoundError:
+            print("❌ 에러: commitment.json 파일을 찾을 수 없습니다.")
+            print("먼저 1단계(commitment 생성)를 실행하세요.")
+            return
+
+    # 가중치 추첨이면 가중치 파일이 commitment 와 일치하는지 확인
+    table = None
+    if "weights_sha256" in commitment_data:
+        if not weights:
+            print("❌ 에러: 가중치 추첨입니다. --weights <파일> 을 지정하세요.")
+            return
+        try:
+            table = weighted.load_alias_table(weights, expected_digest=commitment_data["weights_sha256"])
+        except ValueError as e:
+            print(f"❌ 에러: {e}")
+            return
 
-    # 시드 생성 (timestamp + nonce)
-    timestamp_str = commitment_data["timestamp"]
-    nonce = commitment_data["nonce"]
-    seed_string = timestamp_str + nonce
-    seed_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16) % (2**32)
+    # 명단 추첨이면 명단 파일이 commitment 와 일치하는지 확인
+    entrants = None
+    if "roster_sha256" in commitment_data:
+        if not roster:
+            print("❌ 에러: 명단 추첨입니다. --roster <파일> 을 지정하세요.")
+            return
+        try:
+            entrants = open_roster(roster, expected_digest=commitment_data["roster_sha256"])
+        except ValueError as e:
+            print(f"❌ 에러: {e}")
+            return
+        min_num, max_num = 1, len(entrants)
+
+    if subdraws is not None:
+        try:
+            return _reveal_subdraws(commitment_data, subdraws, start, min_num, max_num, winners, table, entrants,
+                                    out, engine)
+        finally:
+            if entrants is not None:
+                entrants.close()
 
-    # 랜덤 추첨
-    random.seed(seed_value)
-    result = random.randint(min_num, max_num)
+    # 추첨 (해시 재계산 + 시드 생성 + 추첨)
+    try:
+        reveal_data = draw_reveal(commitment_data, min_num, max_num, winners, table, entrants, sub_index)
+    finally:
+        if entrants is not None:
+            entrants.close()
+
+    # 검증용 정보 저장
+    if draw_id is not None:
+        try:
+            with closing(ledger.connect(ledger_path)) as conn:
+                ledger.record_reveal(conn, draw["id"], reveal_data)
+        except ValueError as e:
+            print(f"❌ 에러: {e}")
+            return
+    else:
+        with metrics.span("file_io"), open('reveal.json', 'w') as f:
+            json.dump(reveal_data, f, indent=2)
+    commitment_hash = reveal_data["commitment_hash"]
+    timestamp_str = reveal_data["timestamp"]
+    nonce = reveal_data["nonce"]
+    results = reveal_data.get("results", [reveal_data["result"]])
+    result = reveal_data["result"]
 
     # 결과 출력
     print("=" * 70)
@@ -82,60 +193,125 @@ def reveal_and_draw(min_num=1, max_num=10):
     print(f"✅ Timestamp (KST 한국시간): {timestamp_str}")
     print(f"\n🔓 원본 데이터 공개:")
     print(f"  - Nonce: {nonce}")
-    print(f"\n📌 추첨 범위: {min_num} ~ {max_num}")
-    print(f"\n🎯 당첨 번호: {result}")
+    if table is not None:
+        print(f"\n📌 가중치 추첨: 참가자 {len(table.ids)}명, 전체 가중치 {table.total}")
+        print(f"  - 가중치 파일 SHA-256: {table.digest}")
+    else:
+        print(f"\n📌 추첨 범위: {min_num} ~ {max_num}")
+    if sub_index is not None:
+        print(f"📌 하위 추첨: #{sub_index} (seed_scheme 2, 시드 {reveal_data['seed_value']})")
+    if winners > 1:
+        print(f"\n🎯 당첨 번호 ({winners}명, 추첨 순서): {', '.join(map(str, results))}")
+    else:
+        print(f"\n🎯 당첨 번호: {result}")
+    if entrants is not None:
+        print(f"\n👤 당첨자 (명단 {len(entrants)}명 중, SHA-256 {reveal_data['roster_sha256'][:16]}...):")
+        for number, entry in zip(results, reveal_data["roster_entries"]):
+            print(f"  {number}번째 줄: {entry}")
     print("\n" + "=" * 70)
     print("✅ 누구나 위 원본 데이터로 동일한 해시값과 추첨 결과를 재현할 수 있습니다!")
     print("💡 모든 시각은 한국 표준시(KST, UTC+9)입니다.")
     print("=" * 70)
+    if publish:
+        _publish(publish, [reveal_data])
 
-    # 검증용 정보 저장
-    reveal_data = {
-        "commitment_hash": commitment_hash,
-        "timestamp": timestamp_str,
-        "nonce": nonce,
-        "seed_value": seed_value,
-        "min_num": min_num,
-        "max_num": max_num,
-        "result": result
-    }
+    return results if winners > 1 else result
 
-    with open('reveal.json', 'w') as f:
-        json.dump(reveal_data, f, indent=2)
+# _reveal_subdraws 가 한 번에 계산해 기록하는 하위 추첨 수
+SUBDRAW_CHUNK = 65536
+
+
+def _reveal_subdraws(commitment_data, count, start, min_num, max_num, winners, table, entrants, out, engine):
+    """하위 추첨 start ~ start + count - 1 을 SUBDRAW_CHUNK 개씩 계산해 out(JSONL)에 기록 → 기록한 수"""
+    with metrics.span("file_io"), open(out, 'w') as f:
+        for chunk_start in range(start, start + count, SUBDRAW_CHUNK):
+            chunk = min(SUBDRAW_CHUNK, start + count - chunk_start)
+            reveals = draw_subdraws(commitment_data, chunk, min_num, max_num, winners, table, entrants,
+                                    chunk_start, engine)
+            f.write("".join(json.dumps(reveal_data) + "\n" for reveal_data in reveals))
 
-    return result
+    print("=" * 70)
+    print("🎲 2단계: 하위 추첨 실행 및 공개 (seed_scheme 2)")
+    print("=" * 70)
+    print(f"\n✅ Commitment Hash: {compute_commitment_hash(commitment_data)}")
+    print(f"✅ Timestamp (KST 한국시간): {commitment_data['timestamp']}")
+    print(f"🔓 Nonce: {commitment_data['nonce']}")
+    if table is not None:
+        print(f"\n📌 가중치 추첨: 참가자 {len(table.ids)}명, 전체 가중치 {table.total}")
+    else:
+        print(f"\n📌 추첨 범위: {min_num} ~ {max_num}, 당첨자 {winners}명")
+    print(f"📌 하위 추첨: #{start} ~ #{start + count - 1} ({count:,}개, 엔진: {engine})")
+    print(f"\n💾 {out} 에 저장했습니다.")
+    print("\n" + "=" * 70)
+    print("✅ 하위 추첨 i 의 시드는 SHA256(timestamp + nonce + \":\" + i) 로 바로 계산되므로,")
+    print("   python random_draw.py verify <hash> <timestamp> <nonce> ... --index i 로 하나만 검증할 수 있습니다.")
+    print("=" * 70)
+    return count
+
+def verify(commitment_hash, timestamp, nonce, min_num=None, max_num=None, winners=None, weights=None, roster=None,
+           sub_index=None):
+    """검증 함수: 제3자가 결과를 검증할 수 있음
 
-def verify(commitment_hash, timestamp, nonce):
-    """검증 함수: 제3자가 결과를 검증할 수 있음"""
+    min_num / max_num / winners 를 생략하면 reveal.json 의 값(하위 추첨 번호 포함)을 사용합니다.
+    sub_index 를 주면 counter 방식(seed_scheme 2)의 그 하위 추첨만 재현합니다.
+    weights 로 가중치 파일을 주면 그 파일 해시를 포함해 검증하고 가중치 추첨을 재현합니다.
+    roster 로 명단 파일을 주면 그 파일 해시와 줄 수를 포함해 검증하고 당첨자 줄까지 찾습니다.
+    """
 
     # 해시 재계산
     commitment_data = {
         "timestamp": timestamp,
         "nonce": nonce
     }
-    data_string = json.dumps(commitment_data, sort_keys=True)
-    calculated_hash = hashlib.sha256(data_string.encode()).hexdigest()
+    if weights:
+        commitment_data["weights_sha256"] = weighted.file_digest(weights)
+    entrants = None
+    if roster:
+        entrants = open_roster(roster)
+        commitment_data["roster_sha256"] = entrants.digest
+        commitment_data["roster_lines"] = len(entrants)
+        min_num, max_num = 1, len(entrants)
+    calculated_hash = compute_commitment_hash(commitment_data)
 
     # 해시 검증
     if calculated_hash != commitment_hash:
+        if entrants is not None:
+            entrants.close()
         print("❌ 검증 실패: 해시값이 일치하지 않습니다!")
         return False
 
-    # reveal.json에서 추첨 범위 읽기 (있으면)
-    min_num, max_num = 1, 10  # 기본값
-    try:
-        with open('reveal.json', 'r') as f:
-            reveal_data = json.load(f)
+    # 범위가 주어지지 않으면 reveal.json에서 추첨 범위 읽기 (있으면)
+    if min_num is None or max_num is None or winners is None:
+        reveal_data = {}
+        try:
+            with metrics.span("file_io"), open('reveal.json', 'r') as f:
+                reveal_data = json.load(f)
+        except FileNotFoundError:
+            pass  # reveal.json 없으면 기본값 사용
+        if min_num is None or max_num is None:
             min_num = reveal_data.get('min_num', 1)
             max_num = reveal_data.get('max_num', 10)
-    except FileNotFoundError:
-        pass  # reveal.json 없으면 기본값 사용
+        if winners is None:
+            winners = reveal_data.get('winners', 1)
+        if sub_index is None and reveal_data.get('seed_scheme') == 2:
+            sub_index = reveal_data['sub_index']
 
-    # 추첨 결과 재현
-    seed_string = timestamp + nonce
-    seed_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16) % (2**32)
-    random.seed(seed_value)
-    result = random.randint(min_num, max_num)
+    # 추첨 결과 재현 (전역 random 대신 검증마다 별도 생성기 사용)
+    if sub_index is None:
+        seed_value = derive_seed(timestamp, nonce)
+    else:
+        seed_value = derive_subseed(timestamp, nonce, sub_index)
+    table = None
+    if weights:
+        table = weighted.load_alias_table(weights, expected_digest=commitment_data["weights_sha256"])
+    with metrics.span("mt_seed"):
+        rng = random.Random(seed_value)
+    with metrics.span("randint"):
+        if table is not None:
+            results = weighted.weighted_draw(table, rng, winners)
+        else:
+            results = draw_numbers(rng, min_num, max_num, winners)
+    result = ', '.join(map(str, results))
 
     print("=" * 70)
     print("✅ 검증 성공!")
@@ -144,40 +320,835 @@ def verify(commitment_hash, timestamp, nonce):
     print(f"계산된 Hash: {calculated_hash}")
     print(f"Timestamp (KST): {timestamp}")
     print(f"seed: {seed_value}")
-    print(f"추첨 범위: {min_num} ~ {max_num}")
+    if sub_index is not None:
+        print(f"하위 추첨: #{sub_index} (seed_scheme 2)")
+    if weights:
+        print(f"가중치 파일 SHA-256: {commitment_data['weights_sha256']}")
+    else:
+        print(f"추첨 범위: {min_num} ~ {max_num}")
+    if entrants is not None:
+        print(f"명단 파일 SHA-256: {entrants.digest}")
+    if winners > 1:
+        print(f"당첨자 수: {winners}")
     print(f"추첨 결과: {result}")
+    if entrants is not None:
+        for number in results:
+            print(f"  {number}번째 줄: {entrants.entry(number)}")
+        entrants.close()
     print("\n💡 타임스탬프는 한국 표준시(KST, UTC+9)입니다.")
     print("=" * 70)
 
     return True
 
+def verify_batch(source="-", workers=None, quiet=False, out=None, engine="python"):
+    """배치 검증: JSONL reveal 레코드를 프로세스 풀로 검증하고 입력 순서대로 결과 출력
+
+    source 가 "-" 이면 표준 입력에서 읽습니다. 결과는 레코드당 한 줄의 JSON 으로
+    out(기본: 표준 출력)에 기록되며, 모든 레코드가 통과하면 True 를 반환합니다.
+    engine="numpy" 이면 추첨 재현을 NumPy 로 벡터화합니다 (결과는 같음).
+    """
+    out = out or sys.stdout
+    stream = sys.stdin if source == "-" else open(source, 'r', encoding='utf-8')
+
+    total = failed = 0
+    try:
+        for chunk_failed, lines in iter_verify(stream, workers, engine=engine):
+            total += len(lines)
+            failed += chunk_failed
+            out.write("\n".join(lines) + "\n")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    out.flush()
+
+    if not quiet:
+        print("=" * 70, file=sys.stderr)
+        print("📋 배치 검증 완료", file=sys.stderr)
+        print("=" * 70, file=sys.stderr)
+        print(f"전체: {total}  성공: {total - failed}  실패: {failed}", file=sys.stderr)
+        print("=" * 70, file=sys.stderr)
+
+    return failed == 0
+
+
+def commit_batch(count, out_dir="batch", workers=None):
+    """배치 Commitment: count 건의 Commitment 를 만들고 Merkle 루트만 공개
+
+    out_dir 에 비밀 보관용 commitments.jsonl (한 줄에 한 건), 포함 증명을 꺼낼
+    tree.bin, 공개용 root.json 을 저장합니다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    commitments_path = os.path.join(out_dir, 'commitments.jsonl')
+
+    def commitment_hashes(f):
+        for commitment_hash, commitment_data in make_commitments(count):
+            f.write(json.dumps(commitment_data) + "\n")
+            yield commitment_hash
+
+    with open(commitments_path, 'w') as f:
+        levels = merkle.build_levels(commitment_hashes(f), workers or os.cpu_count() or 1)
+    merkle.save_levels(os.path.join(out_dir, 'tree.bin'), levels)
+
+    root = merkle.root_of(levels)
+    root_data = {
+        "merkle_root": root,
+        "merkle_size": count,
+        "timestamp": datetime.now(KST).isoformat()
+    }
+    with open(os.path.join(out_dir, 'root.json'), 'w') as f:
+        json.dump(root_data, f, indent=2)
+
+    print("=" * 70)
+    print("🔒 1단계: 배치 COMMITMENT 생성 완료")
+    print("=" * 70)
+    print(f"\n추첨 수: {count}")
+    print(f"\n📌 Merkle Root (먼저 공개할 값):")
+    print(f"{root}")
+    print("\n" + "=" * 70)
+    print("⚠️  이 루트값과 추첨 수를 먼저 공개하세요!")
+    print(f"⚠️  {commitments_path} 의 Nonce 는 추첨 전까지 공개하지 마세요.")
+    print("=" * 70)
+
+    return root
+
+
+def reveal_batch(index, min_num=1, max_num=10, winners=1, out_dir="batch"):
+    """배치 Commitment 의 index 번째(0부터) 추첨 실행 및 포함 증명과 함께 공개"""
+    with open(os.path.join(out_dir, 'commitments.jsonl'), 'r') as f:
+        line = next(islice(f, index, None), None)
+    if line is None:
+        print(f"❌ 에러: {index} 번째 Commitment 가 없습니다.")
+        return
+
+    reveal_data = draw_reveal(json.loads(line), min_num, max_num, winners)
+    root, size, proof = merkle.inclusion_proof(os.path.join(out_dir, 'tree.bin'), index)
+    reveal_data.update({
+        "merkle_root": root,
+        "merkle_index": index,
+        "merkle_size": size,
+        "merkle_proof": proof
+    })
+
+    reveal_path = os.path.join(out_dir, f'reveal_{index}.json')
+    with open(reveal_path, 'w') as f:
+        json.dump(reveal_data, f, indent=2)
+
+    print("=" * 70)
+    print(f"🎲 2단계: 배치 추첨 #{index} 실행 및 공개")
+    print("=" * 70)
+    print(f"\n✅ Merkle Root: {root}")
+    print(f"✅ Commitment Hash: {reveal_data['commitment_hash']}")
+    print(f"✅ Timestamp (KST 한국시간): {reveal_data['timestamp']}")
+    print(f"\n🔓 원본 데이터 공개:")
+    print(f"  - Nonce: {reveal_data['nonce']}")
+    print(f"  - 포함 증명: 해시 {len(proof)}개 ({reveal_path})")
+    print(f"\n📌 추첨 범위: {min_num} ~ {max_num}")
+    print(f"\n🎯 당첨 번호: {', '.join(map(str, reveal_data.get('results', [reveal_data['result']])))}")
+    print("=" * 70)
+
+    return reveal_data
+
+
+# 캠페인 파일 쓰기 버퍼 (JSONL 을 한 줄씩 바로 쓰지 않고 모아서 기록)
+CAMPAIGN_BUFFER = 1 << 20
+
+
+def commit_campaign(count, out_dir="campaign", ledger_path=None):
+    """캠페인: 서로 독립인 Commitment count 건을 한 번에 생성
+
+    난수는 큰 블록으로 읽고(make_commitments), 결과는 out_dir 의 JSONL 두 개
+    (비밀 보관용 commitments.jsonl, 공개용 hashes.jsonl) 또는 추첨 장부에
+    한 트랜잭션으로 기록합니다. 줄 번호(0부터)가 캠페인 안의 추첨 번호입니다.
+    """
+    if ledger_path:
+        with closing(ledger.connect(ledger_path)) as conn:
+            draw_ids = ledger.add_commitments(conn, make_commitments(count))
+        where = f"추첨 ID {draw_ids[0]} ~ {draw_ids[-1]} (장부: {ledger_path})" if draw_ids else ledger_path
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+        with metrics.span("file_io"), \
+                open(os.path.join(out_dir, 'commitments.jsonl'), 'w', buffering=CAMPAIGN_BUFFER) as secret, \
+                open(os.path.join(out_dir, 'hashes.jsonl'), 'w', buffering=CAMPAIGN_BUFFER) as public:
+            for index, (commitment_hash, commitment_data) in enumerate(make_commitments(count)):
+                secret.write(json.dumps(commitment_data) + "\n")
+                public.write(json.dumps({
+                    "index": index,
+                    "commitment_hash": commitment_hash,
+                    "timestamp": commitment_data["timestamp"]
+                }) + "\n")
+        where = f"{out_dir}/hashes.jsonl (공개), {out_dir}/commitments.jsonl (비밀)"
+
+    print("=" * 70)
+    print("🔒 1단계: 캠페인 COMMITMENT 생성 완료")
+    print("=" * 70)
+    print(f"\n추첨 수: {count}")
+    print(f"저장 위치: {where}")
+    print("\n" + "=" * 70)
+    print("⚠️  Commitment Hash 와 타임스탬프 목록을 먼저 공개하세요!")
+    print("⚠️  Nonce 는 각 추첨 전까지 공개하지 마세요.")
+    print("=" * 70)
+
+    return count
+
+
+def _read_range_spec(path):
+    """추첨별 범위 파일 읽기 → [(추첨 번호 또는 ID, min_num, max_num, winners), ...]
+
+    한 줄에 "추첨,min_num,max_num[,winners]" 이며 빈 줄과 # 로 시작하는 줄은 건너뜁니다.
+    """
+    spec = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = [field.strip() for field in line.split(",")]
+            if len(fields) not in (3, 4):
+                raise ValueError(f"{path}:{line_no}: '추첨,min_num,max_num[,winners]' 형식이 아닙니다")
+            winners = int(fields[3]) if len(fields) == 4 else 1
+            spec.append((fields[0], int(fields[1]), int(fields[2]), winners))
+    return spec
+
+
+def reveal_campaign(spec, out_dir="campaign", ledger_path=None):
+    """캠페인 추첨 일괄 실행: spec 의 (추첨, min_num, max_num, winners) 마다 추첨하여 공개
+
+    추첨은 파일 모드에서 commitments.jsonl 의 줄 번호(0부터), 장부 모드에서
+    추첨 ID 또는 commitment hash 입니다. 결과는 out_dir/reveals.jsonl (verify-batch
+    로 바로 검증 가능) 뒤에 덧붙이거나 장부에 한 트랜잭션으로 기록합니다.
+    spec 에 같은 추첨이 두 번 있거나 이미 공개된 추첨이 있으면 아무것도 기록하지 않습니다.
+    """
+    reveals = []
+    seen = set()
+    if ledger_path:
+        with closing(ledger.connect(ledger_path)) as conn:
+            for ref, min_num, max_num, winners in spec:
+                draw = ledger.get_draw(conn, ref)
+                if draw is None or draw["status"] != "pending":
+                    print(f"❌ 에러: 공개할 수 없는 추첨입니다 (없거나 이미 공개됨): {ref}")
+                    return None
+                if draw["id"] in seen:
+                    print(f"❌ 에러: 같은 추첨이 두 번 있습니다: {ref}")
+                    return None
+                seen.add(draw["id"])
+                if "weights_sha256" in draw["commitment"] or "roster_sha256" in draw["commitment"]:
+                    print(f"❌ 에러: 추첨 {draw['id']} 은(는) 가중치/명단 추첨입니다. reveal --weights / --roster 로 공개하세요.")
+                    return None
+                reveals.append((draw["id"], draw_reveal(draw["commitment"], min_num, max_num, winners)))
+            try:
+                ledger.record_reveals(conn, reveals)
+            except ValueError as e:
+                print(f"❌ 에러: {e}")
+                return None
+        where = f"장부: {ledger_path}"
+    else:
+        reveals_path = os.path.join(out_dir, 'reveals.jsonl')
+        with metrics.span("file_io"):
+            with open(os.path.join(out_dir, 'commitments.jsonl'), 'r') as f:
+                commitments = f.readlines()
+            # 이미 공개한 추첨 (다른 범위로 다시 공개하면 결과를 고를 수 있으므로 거부)
+            revealed = set()
+            if os.path.exists(reveals_path):
+                with open(reveals_path, 'r') as f:
+                    revealed = {json.loads(line)["commitment_hash"] for line in f if line.strip()}
+        for ref, min_num, max_num, winners in spec:
+            index = int(ref)
+            if not 0 <= index < len(commitments):
+                print(f"❌ 에러: {index} 번째 Commitment 가 없습니다.")
+                return None
+            if index in seen:
+                print(f"❌ 에러: 같은 추첨이 두 번 있습니다: {index}")
+                return None
+            seen.add(index)
+            commitment_data = json.loads(commitments[index])
+            if compute_commitment_hash(commitment_data) in revealed:
+                print(f"❌ 에러: {index} 번째 추첨은 이미 공개되었습니다 ({reveals_path}).")
+                return None
+            reveals.append((index, draw_reveal(commitment_data, min_num, max_num, winners)))
+        with metrics.span("file_io"), open(reveals_path, 'a', buffering=CAMPAIGN_BUFFER) as f:
+            for _, reveal_data in reveals:
+                f.write(json.dumps(reveal_data) + "\n")
+        where = reveals_path
+
+    print("=" * 70)
+    print("🎲 2단계: 캠페인 추첨 일괄 실행 및 공개")
+    print("=" * 70)
+    print(f"\n추첨 수: {len(reveals)}")
+    print(f"저장 위치: {where}")
+    for ref, reveal_data in reveals[:5]:
+        results = reveal_data.get("results", [reveal_data["result"]])
+        print(f"  #{ref}: {reveal_data['min_num']} ~ {reveal_data['max_num']} → {', '.join(map(str, results))}")
+    if len(reveals) > 5:
+        print(f"  ... 외 {len(reveals) - 5}건")
+    print("=" * 70)
+
+    return reveals
+
+
+def schedule_draws(draw_refs, reveal_at, min_num=1, max_num=10, winners=1, every=0.0, ledger_path=None):
+    """장부의 추첨들을 reveal_at(ISO 시각, 시간대가 없으면 KST)에 공개하도록 예약
+
+    every(초)를 주면 두 번째 추첨부터 공개 시각을 그만큼씩 늦춥니다.
+    실제 공개는 draw_scheduler.py 데몬이 합니다.
+    """
+    if not min_num <= max_num or winners < 1 or winners > max_num - min_num + 1:
+        print(f"❌ 에러: {min_num} ~ {max_num} 에서 {winners}명을 뽑을 수 없습니다.")
+        return None
+    start = datetime.fromisoformat(reveal_at)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=KST)
+    start = start.timestamp()
+
+    ledger_path = ledger_path or ledger.DEFAULT_LEDGER
+    with closing(ledger.connect(ledger_path)) as conn:
+        if isinstance(draw_refs, range):
+            draws = ledger.get_draws(conn, draw_refs)
+        else:
+            draws = {}
+            for ref in draw_refs:
+                draw = ledger.get_draw(conn, ref)
+                if draw is not None:
+                    draws[draw["id"]] = draw
+        items = []
+        for draw_id in sorted(draws):
+            draw = draws[draw_id]
+            if draw["status"] != "pending":
+                print(f"❌ 에러: 추첨 {draw_id} 은(는) 이미 공개되었습니다.")
+                return None
+            if "weights_sha256" in draw["commitment"] or "roster_sha256" in draw["commitment"]:
+                print(f"❌ 에러: 추첨 {draw_id} 은(는) 가중치/명단 추첨입니다. reveal --weights / --roster 로 공개하세요.")
+                return None
+            items.append((draw_id, start + every * len(items), min_num, max_num, winners))
+        if len(items) != len(draw_refs):
+            print(f"❌ 에러: 추첨 장부에 없는 추첨이 있습니다 ({len(draw_refs) - len(items)}건).")
+            return None
+        ledger.schedule_reveals(conn, items)
+
+    print("=" * 70)
+    print("⏰ 추첨 공개 예약")
+    print("=" * 70)
+    print(f"\n추첨 수: {len(items)} (장부: {ledger_path})")
+    print(f"범위: {min_num} ~ {max_num}, 당첨자 {winners}명")
+    for draw_id, at, *_ in items[:5]:
+        print(f"  추첨 {draw_id}: {datetime.fromtimestamp(at, KST).strftime('%Y-%m-%d %H:%M:%S')} 공개")
+    if len(items) > 5:
+        last = datetime.fromtimestamp(items[-1][1], KST).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"  ... 외 {len(items) - 5}건 (마지막 {last})")
+    print(f"\n💡 공개는 예약 데몬이 합니다: python draw_scheduler.py --ledger {ledger_path}")
+    print("=" * 70)
+
+    return items
+
+
+def archive_import(sources, archive_path):
+    """JSON / JSONL 레코드 파일들을 바이너리 아카이브 하나로 저장 ("-" 는 표준 입력)"""
+    def records():
+        for source in sources:
+            if source == "-":
+                yield from archive.iter_json_records(sys.stdin)
+                continue
+            with open(source, 'r', encoding='utf-8') as f:
+                yield from archive.iter_json_records(f)
+
+    with metrics.span("file_io"):
+        count = archive.write_archive(archive_path, records())
+    size = os.path.getsize(archive_path)
+    print(f"🗄️  {count}건 → {archive_path} ({size:,} 바이트, 건당 {size / max(count, 1):.0f} 바이트)")
+    return count
+
+
+def archive_export(archive_path, out_path="-"):
+    """바이너리 아카이브를 원래 형식의 JSONL 로 내보내기 ("-" 는 표준 출력)"""
+    out = sys.stdout if out_path == "-" else open(out_path, 'w', encoding='utf-8', buffering=CAMPAIGN_BUFFER)
+    try:
+        with metrics.span("file_io"), archive.Archive(archive_path) as arc:
+            for record in arc:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count = len(arc)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if out_path != "-":
+        print(f"📤 {count}건 → {out_path}")
+    return count
+
+
+def archive_info(archive_path):
+    """바이너리 아카이브 요약 출력 (전체 스캔)"""
+    info = archive.summary(archive_path)
+    print("=" * 70)
+    print(f"🗄️  아카이브: {archive_path}")
+    print("=" * 70)
+    print(f"레코드: {info['count']:,}건 (공개된 추첨 {info['revealed']:,}건, 추가 항목 포함 {info['with_extras']:,}건)")
+    print(f"크기: {info['bytes']:,} 바이트")
+    if info["first"]:
+        print(f"기간 (KST): {info['first']} ~ {info['last']}")
+    print("=" * 70)
+    return info
+
+
+def chain_init(length, chain_path="chain.json"):
+    """해시 체인 생성: length 번의 정기 추첨을 위한 체인을 만들고 tip 만 공개"""
+    chain = hashchain.new_chain(length)
+    with open(chain_path, 'w') as f:
+        json.dump(chain, f, indent=2)
+
+    print("=" * 70)
+    print("🔒 1단계: 해시 체인 COMMITMENT 생성 완료")
+    print("=" * 70)
+    print(f"\n추첨 횟수: {length}  (체크포인트 {len(chain['checkpoints'])}개, 간격 {chain['step']})")
+    print(f"\n📌 Chain Tip (먼저 공개할 값):")
+    print(f"{chain['tip']}")
+    print(f"\nTimestamp (먼저 공개할 값, KST 포함): {chain['timestamp']}")
+    print("\n" + "=" * 70)
+    print("⚠️  Tip 과 타임스탬프를 먼저 공개하세요!")
+    print(f"⚠️  {chain_path} 에는 비밀값이 들어 있으니 절대 공개하지 마세요.")
+    print("=" * 70)
+
+    return chain["tip"]
+
+
+def chain_reveal(draw_index, min_num=1, max_num=10, winners=1, chain_path="chain.json"):
+    """해시 체인의 draw_index 번째(1부터) 추첨 실행 및 링크 공개"""
+    with open(chain_path, 'r') as f:
+        chain = json.load(f)
+
+    reveal_data = hashchain.chain_draw(chain, draw_index, min_num, max_num, winners)
+    reveal_path = f'chain_reveal_{draw_index}.json'
+    with open(reveal_path, 'w') as f:
+        json.dump(reveal_data, f, indent=2)
+
+    print("=" * 70)
+    print(f"🎲 2단계: 해시 체인 추첨 #{draw_index} 실행 및 공개")
+    print("=" * 70)
+    print(f"\n✅ Chain Tip: {chain['tip']}")
+    print(f"✅ 직전 링크: {reveal_data['prev_link']}")
+    print(f"\n🔓 이번 링크 공개: {reveal_data['link']}")
+    print(f"  - SHA256(이번 링크) == 직전 링크 이면 검증 완료")
+    print(f"\n📌 추첨 범위: {min_num} ~ {max_num}")
+    print(f"\n🎯 당첨 번호: {', '.join(map(str, reveal_data.get('results', [reveal_data['result']])))}")
+    print(f"\n💾 {reveal_path} 저장")
+    print("=" * 70)
+
+    return reveal_data
+
+
+def verify_draw(draw_id, ledger_path=None, weights=None, roster=None):
+    """추첨 장부에 기록된 추첨을 ID(또는 commitment hash)로 검증"""
+    with closing(ledger.connect(ledger_path or ledger.DEFAULT_LEDGER)) as conn:
+        draw = ledger.get_draw(conn, draw_id)
+    if draw is None:
+        print(f"❌ 에러: 추첨 장부에서 {draw_id} 를 찾을 수 없습니다.")
+        return False
+    if draw["reveal"] is None:
+        print(f"❌ 에러: 추첨 {draw['id']} 은(는) 아직 공개되지 않았습니다.")
+        return False
+
+    record = dict(draw["reveal"])
+    if weights:
+        record["weights_path"] = weights
+    if roster:
+        record["roster_path"] = roster
+    return _print_outcome(verify_record(record))
+
+
+def list_draws(ledger_path=None, status=None, since=None, until=None, limit=100):
+    """추첨 장부 조회 (상태, 생성 시각 범위)"""
+    with closing(ledger.connect(ledger_path or ledger.DEFAULT_LEDGER)) as conn:
+        draws = ledger.find_draws(conn, status, since, until, limit)
+    for draw in draws:
+        created = datetime.fromtimestamp(draw["created_at"], KST).strftime('%Y-%m-%d %H:%M:%S')
+        result = draw["reveal"]["result"] if draw["reveal"] else "-"
+        print(f"{draw['id']:>8}  {draw['status']:<8}  {created}  {draw['commitment_hash'][:16]}  {result}")
+    return draws
+
+
+def _print_outcome(outcome):
+    """verify_record 결과 출력"""
+    print("=" * 70)
+    if outcome["ok"]:
+        print("✅ 검증 성공!")
+    else:
+        print(f"❌ 검증 실패: {outcome['error']}")
+    print("=" * 70)
+    for key, value in outcome.items():
+        if key != "ok":
+            print(f"{key}: {value}")
+    print("=" * 70)
+
+    return outcome["ok"]
+
+
+def verify_sweep(commitment_hash, timestamp, nonce, range_spec, winners=1, as_json=False):
+    """범위 스윕: 한 Commitment 로 여러 추첨 범위의 결과를 재현
+
+    range_spec 예: "10,100,1-1000" 또는 "10-1000:10" (1~10, 1~20, ..., 1~1000)
+    """
+    outcome = sweep.sweep_ranges(commitment_hash, timestamp, nonce, sweep.parse_ranges(range_spec), winners)
+    if as_json:
+        print(json.dumps(outcome, ensure_ascii=False, indent=2))
+        return outcome["ok"]
+
+    print("=" * 70)
+    if not outcome["ok"]:
+        print("❌ 검증 실패: 해시값이 일치하지 않습니다!")
+        print(f"계산된 Hash: {outcome['calculated_hash']}")
+        print("=" * 70)
+        return False
+    print("✅ 해시 검증 성공 - 범위별 추첨 결과")
+    print("=" * 70)
+    print(f"Commitment Hash: {commitment_hash}")
+    print(f"seed: {outcome['seed_value']}")
+    if winners > 1:
+        print(f"당첨자 수: {winners}")
+    print("-" * 70)
+    for entry in outcome["ranges"]:
+        label = f"{entry['min_num']} ~ {entry['max_num']}"
+        if "error" in entry:
+            print(f"{label:>30}  ⚠️ {entry['error']}")
+        else:
+            print(f"{label:>30}  {', '.join(map(str, entry.get('results', [entry['result']])))}")
+    print("=" * 70)
+    return True
+
+
+def audit_fairness(trials, range_spec=audit.DEFAULT_RANGES, bins=audit.DEFAULT_BINS, workers=None,
+                   engine="python", label=audit.DEFAULT_LABEL, checkpoint=None, out=None, alpha=audit.DEFAULT_ALPHA,
+                   winners=1):
+    """공정성 감사: 모의 추첨 trials 번으로 범위마다 결과가 균등한지 검정
+
+    winners 가 2 이상이면 추첨마다 당첨 번호 winners 개를 모두 셉니다. checkpoint 파일이 있으면
+    이어서 실행합니다. 보고서 JSON 은 out 에 저장하며, 의심스러운 범위가 없으면 True 를 반환합니다.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    def progress(done, total):
+        print(f"\r진행: {done:,} / {total:,} ({done / total:.1%})", end="", file=sys.stderr, flush=True)
+
+    try:
+        config = audit.make_config(trials, sweep.parse_ranges(range_spec), bins, label, winners=winners)
+        state = audit.run_audit(config, workers, engine, checkpoint, progress)
+    except ValueError as e:
+        print(f"❌ 에러: {e}")
+        return False
+    except KeyboardInterrupt:
+        print(f"\n⏸️  중단됨. 같은 명령을 다시 실행하면 이어서 합니다 (체크포인트: {checkpoint})"
+              if checkpoint else "\n⏸️  중단됨 (--checkpoint 를 주면 이어서 할 수 있습니다)", file=sys.stderr)
+        return False
+    print(file=sys.stderr)
+    report = audit.make_report(state, alpha)
+    if out:
+        with open(out, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print("=" * 70)
+    print("📊 추첨 공정성 감사")
+    print("=" * 70)
+    print(f"\n모의 추첨: {state['done']:,}회 × 당첨 {winners}개 (label: {label}, 엔진: {engine}, {state['elapsed_s']:.1f}초)")
+    print(f"파이프라인: {report['pipeline']}")
+    print(f"유의수준: {alpha} (범위당 {report['alpha_per_range']:.2g})\n")
+    print(f"{'범위':<24} {'구간':>6} {'카이제곱 p':>11} {'KS p':>8} {'최대 |z|':>9}")
+    for r in report["ranges"]:
+        mark = "  ⚠️" if r["suspicious"] else ""
+        print(f"{r['min_num']} ~ {r['max_num']:<{22 - len(str(r['min_num']))}} {r['buckets']:>6} "
+              f"{r['chi2_p']:>11.4f} {r['ks_p']:>8.4f} {r['max_abs_z']:>9.2f}{mark}")
+    print(f"\ncounts_sha256: {report['counts_sha256']}")
+    if out:
+        print(f"보고서: {out}")
+    print("=" * 70)
+    if report["passed"]:
+        print("✅ 모든 범위에서 균등 분포와 구별되지 않습니다.")
+    else:
+        print("❌ 균등 분포에서 벗어난 범위가 있습니다 (⚠️ 표시).")
+    print("=" * 70)
+
+    return report["passed"]
+
+
+def verify_reveal(path):
+    """reveal JSON 파일 하나를 검증 (Merkle 포함 증명이 있으면 함께 확인)"""
+    with open(path, 'r') as f:
+        return _print_outcome(verify_record(json.load(f)))
+
+
+def _publish(config_path, items):
+    """게시 설정 파일의 sink 들에 동시에 게시하고 영수증 출력 → 모두 성공했는지"""
+    from draw_publish import print_receipt, publish_sync
+
+    print("\n📢 게시 중...")
+    receipts = publish_sync(config_path, items)
+    for receipt in receipts:
+        print_receipt(receipt, file=sys.stdout)
+    return all(receipt["ok"] for receipt in receipts)
+
+
+def _take_option(args, name, default=None):
+    """args 에서 "name 값" 옵션을 꺼내 값을 반환 (없으면 default)"""
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+def _write_metrics(path):
+    """계측 결과 저장 (.prom 이면 Prometheus 텍스트, 그 외는 JSON)"""
+    text = metrics.to_prometheus() if path.endswith(".prom") else metrics.to_json()
+    if path == "-":
+        print(text, file=sys.stderr)
+        return
+    with open(path, 'w') as f:
+        f.write(text)
+
+def _take_flag(args, name):
+    """args 에서 플래그를 꺼내 존재 여부 반환"""
+    if name not in args:
+        return False
+    args.remove(name)
+    return True
+
 # %%
 if __name__ == "__main__":
-    import sys
 
     if len(sys.argv) > 1:
+        args = sys.argv[2:]
+        weights = _take_option(args, "--weights")
+        roster = _take_option(args, "--roster")
+        ledger_path = _take_option(args, "--ledger")
+        draw_id = _take_option(args, "--id")
+        publish = _take_option(args, "--publish")
+        metrics_path = _take_option(args, "--metrics")
+        if metrics_path:
+            # 종료 시(sys.exit 포함) 단계별 시간 기록
+            metrics.enable()
+            atexit.register(_write_metrics, metrics_path)
+
         if sys.argv[1] == "commit":
-            generate_commitment()
+            # python random_draw.py commit [--count N [--out DIR]] [--ledger draws.db] [--publish publish.json]
+            count = _take_option(args, "--count")
+            out_dir = _take_option(args, "--out", "campaign")
+            if count is not None:
+                commit_campaign(int(count), out_dir, ledger_path)
+            else:
+                generate_commitment(weights, ledger_path, roster, publish)
         elif sys.argv[1] == "reveal":
-            # python random_draw.py reveal [min_num] [max_num]
-            if len(sys.argv) >= 4:
-                min_num = int(sys.argv[2])
-                max_num = int(sys.argv[3])
-                reveal_and_draw(min_num, max_num)
-            elif len(sys.argv) == 2:
+            # python random_draw.py reveal [min_num] [max_num] [winners] [--id ID] [--ledger draws.db]
+            # python random_draw.py reveal [winners] --weights <weights.csv>
+            # python random_draw.py reveal [winners] --roster <entrants.txt>
+            # 하위 추첨: ... --index I  /  ... --draws N [--start S] [--out subdraws.jsonl] [--engine numpy]
+            sub_index = _take_option(args, "--index")
+            subdraws = _take_option(args, "--draws")
+            reveal_options = {
+                "sub_index": int(sub_index) if sub_index is not None else None,
+                "subdraws": int(float(subdraws)) if subdraws is not None else None,
+                "start": int(_take_option(args, "--start", 0)),
+                "out": _take_option(args, "--out", "subdraws.jsonl"),
+                "engine": _take_option(args, "--engine", "python"),
+                "publish": publish,
+            }
+            if reveal_options["engine"] not in ("python", "numpy"):
+                print(f"❌ 알 수 없는 엔진: {reveal_options['engine']} (python 또는 numpy)")
+                sys.exit(2)
+            if weights or roster:
+                winners = int(args[0]) if args else 1
+                reveal_and_draw(winners=winners, weights=weights, draw_id=draw_id, ledger_path=ledger_path,
+                                roster=roster, **reveal_options)
+            elif len(args) >= 2:
+                min_num = int(args[0])
+                max_num = int(args[1])
+                winners = int(args[2]) if len(args) >= 3 else 1
+                reveal_and_draw(min_num, max_num, winners, draw_id=draw_id, ledger_path=ledger_path, **reveal_options)
+            elif not args:
                 # 기본값 사용
-                reveal_and_draw()
+                reveal_and_draw(draw_id=draw_id, ledger_path=ledger_path, **reveal_options)
             else:
-                print("사용법: python random_draw.py reveal [min_num] [max_num]")
+                print("사용법: python random_draw.py reveal [min_num] [max_num] [winners]")
                 print("예시: python random_draw.py reveal 1 9")
+                print("하위 추첨: python random_draw.py reveal 1 100 --index 73512")
+                print("           python random_draw.py reveal 1 100 --draws 100000 [--out subdraws.jsonl] [--engine numpy]")
         elif sys.argv[1] == "verify":
-            if len(sys.argv) != 5:
-                print("사용법: python random_draw.py verify <commitment_hash> <timestamp> <nonce>")
+            # ... [--index I]: counter 방식 하위 추첨 I 만 검증
+            sub_index = _take_option(args, "--index")
+            sub_index = int(sub_index) if sub_index is not None else None
+            if draw_id is not None and not args:
+                sys.exit(0 if verify_draw(draw_id, ledger_path, weights, roster) else 1)
+            elif (weights or roster) and len(args) in (3, 4):
+                winners = int(args[3]) if len(args) == 4 else 1
+                verify(args[0], args[1], args[2], winners=winners, weights=weights, roster=roster,
+                       sub_index=sub_index)
+            elif len(args) == 3:
+                verify(args[0], args[1], args[2], sub_index=sub_index)
+            elif len(args) in (5, 6):
+                winners = int(args[5]) if len(args) == 6 else 1
+                verify(args[0], args[1], args[2], int(args[3]), int(args[4]), winners, sub_index=sub_index)
+            else:
+                print("사용법: python random_draw.py verify <commitment_hash> <timestamp> <nonce> [min_num max_num [winners]]")
+                print("        python random_draw.py verify <commitment_hash> <timestamp> <nonce> [winners] --weights <weights.csv>")
+                print("        python random_draw.py verify <commitment_hash> <timestamp> <nonce> [winners] --roster <entrants.txt>")
+                print("        python random_draw.py verify --id <draw_id> [--ledger draws.db]")
+                print("        python random_draw.py verify <commitment_hash> <timestamp> <nonce> [...] --index <i>")
+        elif sys.argv[1] == "ledger":
+            # python random_draw.py ledger [--status pending|revealed] [--since ISO] [--until ISO] [--limit N]
+            status = _take_option(args, "--status")
+            since = _take_option(args, "--since")
+            until = _take_option(args, "--until")
+            limit = int(_take_option(args, "--limit", 100))
+            list_draws(ledger_path, status,
+                       datetime.fromisoformat(since).timestamp() if since else None,
+                       datetime.fromisoformat(until).timestamp() if until else None,
+                       limit)
+        elif sys.argv[1] == "verify-batch":
+            # python random_draw.py verify-batch [reveals.jsonl|-] [--workers N] [--quiet] [--engine numpy]
+            quiet = _take_flag(args, "--quiet")
+            workers = _take_option(args, "--workers")
+            engine = _take_option(args, "--engine") or "python"
+            if engine not in ("python", "numpy"):
+                print(f"❌ 알 수 없는 엔진: {engine} (python 또는 numpy)")
+                sys.exit(2)
+            source = args[0] if args else "-"
+            sys.exit(0 if verify_batch(source, workers=int(workers) if workers else None,
+                                       quiet=quiet, engine=engine) else 1)
+        elif sys.argv[1] == "sweep":
+            # python random_draw.py sweep <hash> <timestamp> <nonce> <ranges> [winners] [--json]
+            as_json = _take_flag(args, "--json")
+            if len(args) in (4, 5):
+                winners = int(args[4]) if len(args) == 5 else 1
+                sys.exit(0 if verify_sweep(args[0], args[1], args[2], args[3], winners, as_json) else 1)
+            else:
+                print("사용법: python random_draw.py sweep <hash> <timestamp> <nonce> <ranges> [winners] [--json]")
+                print("예시: python random_draw.py sweep <hash> <timestamp> <nonce> 10,100,1-1000")
+                print("      python random_draw.py sweep <hash> <timestamp> <nonce> 10-1000:10")
+        elif sys.argv[1] == "verify-reveal" and len(args) == 1:
+            sys.exit(0 if verify_reveal(args[0]) else 1)
+        elif sys.argv[1] == "commit-batch":
+            # python random_draw.py commit-batch <count> [--out DIR] [--workers N]
+            out_dir = _take_option(args, "--out", "batch")
+            workers = _take_option(args, "--workers")
+            if len(args) == 1:
+                commit_batch(int(args[0]), out_dir, int(workers) if workers else None)
+            else:
+                print("사용법: python random_draw.py commit-batch <count> [--out DIR] [--workers N]")
+        elif sys.argv[1] == "reveal-batch":
+            # python random_draw.py reveal-batch <index> <min_num> <max_num> [winners] [--out DIR]
+            out_dir = _take_option(args, "--out", "batch")
+            if len(args) in (3, 4):
+                winners = int(args[3]) if len(args) == 4 else 1
+                reveal_batch(int(args[0]), int(args[1]), int(args[2]), winners, out_dir)
+            else:
+                print("사용법: python random_draw.py reveal-batch <index> <min_num> <max_num> [winners] [--out DIR]")
+        elif sys.argv[1] == "reveal-bulk":
+            # python random_draw.py reveal-bulk <min_num> <max_num> [winners] [--out DIR | --ledger draws.db --id A-B]
+            # python random_draw.py reveal-bulk --spec ranges.csv [--out DIR | --ledger draws.db]
+            spec_path = _take_option(args, "--spec")
+            out_dir = _take_option(args, "--out", "campaign")
+            if spec_path:
+                spec = _read_range_spec(spec_path)
+            elif len(args) in (2, 3):
+                min_num, max_num = int(args[0]), int(args[1])
+                winners = int(args[2]) if len(args) == 3 else 1
+                if ledger_path and draw_id and "-" in draw_id:
+                    first, last = map(int, draw_id.split("-"))
+                    refs = range(first, last + 1)
+                elif ledger_path:
+                    refs = [draw_id] if draw_id else []
+                else:
+                    with open(os.path.join(out_dir, 'commitments.jsonl'), 'r') as f:
+                        refs = range(sum(1 for _ in f))
+                spec = [(ref, min_num, max_num, winners) for ref in refs]
+            else:
+                spec = None
+            if spec:
+                sys.exit(0 if reveal_campaign(spec, out_dir, ledger_path) is not None else 1)
+            print("사용법: python random_draw.py reveal-bulk <min_num> <max_num> [winners] [--out DIR]")
+            print("        python random_draw.py reveal-bulk <min_num> <max_num> [winners] --ledger draws.db --id A-B")
+            print("        python random_draw.py reveal-bulk --spec ranges.csv [--out DIR | --ledger draws.db]")
+        elif sys.argv[1] == "schedule":
+            # python random_draw.py schedule <reveal_at> <min_num> <max_num> [winners] --id ID|A-B [--every SECONDS] [--ledger draws.db]
+            every = float(_take_option(args, "--every", 0))
+            if draw_id and len(args) in (3, 4):
+                if "-" in draw_id:
+                    first, last = map(int, draw_id.split("-"))
+                    refs = range(first, last + 1)
+                else:
+                    refs = [draw_id]
+                winners = int(args[3]) if len(args) == 4 else 1
+                sys.exit(0 if schedule_draws(refs, args[0], int(args[1]), int(args[2]), winners, every,
+                                             ledger_path) is not None else 1)
+            print("사용법: python random_draw.py schedule <reveal_at> <min_num> <max_num> [winners] --id ID|A-B "
+                  "[--every SECONDS] [--ledger draws.db]")
+            print("  예시: python random_draw.py schedule 2025-06-01T20:00 1 100 --id 1-720 --every 3600")
+        elif sys.argv[1] == "audit":
+            # python random_draw.py audit <trials> [--ranges 7,10,1000000007] [--winners 1] [--bins 1000] [--workers N]
+            #     [--engine python|numpy] [--label L] [--checkpoint audit.ckpt] [--out report.json] [--alpha 0.001]
+            range_spec = _take_option(args, "--ranges", audit.DEFAULT_RANGES)
+            bins = int(_take_option(args, "--bins", audit.DEFAULT_BINS))
+            workers = _take_option(args, "--workers")
+            engine = _take_option(args, "--engine", "python")
+            label = _take_option(args, "--label", audit.DEFAULT_LABEL)
+            checkpoint = _take_option(args, "--checkpoint")
+            out = _take_option(args, "--out")
+            alpha = float(_take_option(args, "--alpha", audit.DEFAULT_ALPHA))
+            winners = int(_take_option(args, "--winners", 1))
+            if len(args) == 1:
+                sys.exit(0 if audit_fairness(int(float(args[0])), range_spec, bins, int(workers) if workers else None,
+                                             engine, label, checkpoint, out, alpha, winners) else 1)
+            print("사용법: python random_draw.py audit <trials> [--ranges 7,10,1000000007] [--winners 1] [--bins 1000] [--workers N]")
+            print("        [--engine python|numpy] [--label L] [--checkpoint audit.ckpt] [--out report.json] [--alpha 0.001]")
+        elif sys.argv[1] == "archive":
+            # python random_draw.py archive import <in.jsonl|reveal.json|->... <out.drawarc>
+            # python random_draw.py archive export <in.drawarc> [out.jsonl|-]
+            # python random_draw.py archive info <in.drawarc>
+            action = args[0] if args else None
+            if action == "import" and len(args) >= 3:
+                archive_import(args[1:-1], args[-1])
+            elif action == "export" and len(args) in (2, 3):
+                archive_export(args[1], args[2] if len(args) == 3 else "-")
+            elif action == "info" and len(args) == 2:
+                archive_info(args[1])
+            else:
+                print("사용법: python random_draw.py archive import <in.jsonl|reveal.json|->... <out.drawarc>")
+                print("        python random_draw.py archive export <in.drawarc> [out.jsonl|-]")
+                print("        python random_draw.py archive info <in.drawarc>")
+        elif sys.argv[1] == "chain-init":
+            # python random_draw.py chain-init <length> [--chain chain.json]
+            chain_path = _take_option(args, "--chain", "chain.json")
+            if len(args) == 1:
+                chain_init(int(args[0]), chain_path)
+            else:
+                print("사용법: python random_draw.py chain-init <length> [--chain chain.json]")
+        elif sys.argv[1] == "chain-reveal":
+            # python random_draw.py chain-reveal <draw_index> <min_num> <max_num> [winners] [--chain chain.json]
+            chain_path = _take_option(args, "--chain", "chain.json")
+            if len(args) in (3, 4):
+                winners = int(args[3]) if len(args) == 4 else 1
+                chain_reveal(int(args[0]), int(args[1]), int(args[2]), winners, chain_path)
             else:
-                verify(sys.argv[2], sys.argv[3], sys.argv[4])
+                print("사용법: python random_draw.py chain-reveal <draw_index> <min_num> <max_num> [winners] [--chain chain.json]")
     else:
         print("사용법:")
-        print("  1단계 (추첨 전): python random_draw.py commit")
-        print("  2단계 (추첨): python random_draw.py reveal [min_num] [max_num]")
+        print("  1단계 (추첨 전): python random_draw.py commit [--weights <weights.csv> | --roster <entrants.txt>] [--ledger draws.db]")
+        print("  2단계 (추첨): python random_draw.py reveal [min_num] [max_num] [winners]")
         print("  예시: python random_draw.py reveal 1 9")
-        print("  검증: python random_draw.py verify <hash> <timestamp> <nonce>")
+        print("  예시 (500명): python random_draw.py reveal 1 1000000000 500")
+        print("  가중치 추첨: python random_draw.py reveal [winners] --weights <weights.csv>")
+        print("  명단 추첨: python random_draw.py commit --roster <entrants.txt>  /  reveal [winners] --roster <entrants.txt>")
+        print("  검증: python random_draw.py verify <hash> <timestamp> <nonce> [min_num max_num [winners]]")
+        print("  하위 추첨 (counter 방식): python random_draw.py reveal 1 100 --index I | --draws N [--engine numpy]"
+              "  /  verify ... --index I")
+        print("  장부 사용: python random_draw.py reveal 1 100 --id <draw_id>  /  verify --id <draw_id>")
+        print("  장부 조회: python random_draw.py ledger [--status pending] [--since 2025-01-01T00:00+09:00]")
+        print("  배치 검증: python random_draw.py verify-batch [reveals.jsonl|-] [--workers N] [--quiet] [--engine numpy]")
+        print("  reveal 파일 검증: python random_draw.py verify-reveal <reveal.json>")
+        print("  범위 스윕: python random_draw.py sweep <hash> <timestamp> <nonce> 10,100,1-1000 [winners]")
+        print("  캠페인 (여러 추첨 한 번에): python random_draw.py commit --count 720 [--out DIR | --ledger draws.db]")
+        print("  캠페인 추첨: python random_draw.py reveal-bulk <min_num> <max_num> [winners]  /  reveal-bulk --spec ranges.csv")
+        print("  예약 공개: python random_draw.py schedule <reveal_at> <min_num> <max_num> [winners] --id A-B [--every SECONDS]")
+        print("  공정성 감사: python random_draw.py audit 1e7 [--ranges 7,10,1000000007] [--engine numpy] [--checkpoint audit.ckpt]")
+        print("  바이너리 아카이브: python random_draw.py archive import|export|info ...")
+        print("  Merkle 배치 Commitment: python random_draw.py commit-batch <count> [--out DIR]")
+        print("  Merkle 배치 추첨: python random_draw.py reveal-batch <index> <min_num> <max_num> [winners] [--out DIR]")
+        print("  해시 체인 생성: python random_draw.py chain-init <length> [--chain chain.json]")
+        print("  해시 체인 추첨: python random_draw.py chain-reveal <draw_index> <min_num> <max_num> [winners] [--chain chain.json]")
+        print("  단계별 계측: 모든 명령에 --metrics <out.json|out.prom|-> 추가")
+        print("  바로 게시: commit / reveal 에 --publish publish.json 추가 (python draw_publish.py 참고)")
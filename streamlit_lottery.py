@@ -4,10 +4,16 @@
 """
 
 import streamlit as st
-import random
-import hashlib
+import csv
+import io
 import json
-from datetime import datetime, timezone, timedelta
+import math
+import os
+from datetime import datetime
+
+from draw_core import draw_reveal, make_commitment, metrics, verify_drawing
+from draw_core.cache import verify_cache
+from draw_core.batch import JOB_MAX_RECORDS, VerifyJob, iter_upload_records
 
 # 페이지 설정
 st.set_page_config(
@@ -17,8 +23,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS 스타일
-st.markdown("""
+# CSS 스타일 (전체 실행 때만 주입. 탭 안의 상호작용은 fragment 만 다시 실행되므로 재주입되지 않음)
+CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -71,101 +77,19 @@ st.markdown("""
         text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
     }
 </style>
-""", unsafe_allow_html=True)
-
-# 한국 타임존 (KST = UTC+9)
-KST = timezone(timedelta(hours=9))
+"""
+st.markdown(CSS, unsafe_allow_html=True)
 
 # 세션 상태 초기화
-if 'commitment_data' not in st.session_state:
-    st.session_state.commitment_data = None
-if 'reveal_data' not in st.session_state:
-    st.session_state.reveal_data = None
-
-
-def generate_commitment():
-    """Commitment 생성"""
-    import os
-
-    # 한국 시간으로 현재 시간 생성
-    draw_time = datetime.now(KST)
-    nonce = os.urandom(32).hex()
-
-    # Commitment 데이터
-    commitment_data = {
-        "timestamp": draw_time.isoformat(),
-        "nonce": nonce
-    }
-
-    # 해시 계산
-    data_string = json.dumps(commitment_data, sort_keys=True)
-    commitment_hash = hashlib.sha256(data_string.encode()).hexdigest()
-
-    return commitment_hash, commitment_data
-
-
-def reveal_and_draw(commitment_data, min_num, max_num):
-    """추첨 실행"""
-    # 해시 재계산
-    data_string = json.dumps(commitment_data, sort_keys=True)
-    commitment_hash = hashlib.sha256(data_string.encode()).hexdigest()
-
-    # 시드 생성
-    timestamp_str = commitment_data["timestamp"]
-    nonce = commitment_data["nonce"]
-    seed_string = timestamp_str + nonce
-    seed_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16) % (2**32)
-
-    # 랜덤 추첨
-    random.seed(seed_value)
-    result = random.randint(min_num, max_num)
-
-    reveal_data = {
-        "commitment_hash": commitment_hash,
-        "timestamp": timestamp_str,
-        "nonce": nonce,
-        "seed_value": seed_value,
-        "min_num": min_num,
-        "max_num": max_num,
-        "result": result
-    }
-
-    return reveal_data
-
-
-def verify_drawing(commitment_hash, timestamp, nonce, min_num, max_num):
-    """검증"""
-    # 해시 재계산
-    commitment_data = {
-        "timestamp": timestamp,
-        "nonce": nonce
-    }
-    data_string = json.dumps(commitment_data, sort_keys=True)
-    calculated_hash = hashlib.sha256(data_string.encode()).hexdigest()
-
-    # 해시 검증
-    if calculated_hash != commitment_hash:
-        return False, None, calculated_hash
-
-    # 추첨 결과 재현
-    seed_string = timestamp + nonce
-    seed_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16) % (2**32)
-    random.seed(seed_value)
-    result = random.randint(min_num, max_num)
-
-    return True, result, calculated_hash
-
-
-# ========== 메인 앱 ==========
+# *_json 은 다운로드용 직렬화 결과로, 데이터가 바뀔 때 한 번만 만듭니다.
+for key in ("commitment_data", "commitment_json", "reveal_data", "reveal_json", "reveal_file_name"):
+    if key not in st.session_state:
+        st.session_state[key] = None
 
-st.markdown('<div class="main-header">🎲 공정한 추첨 시스템</div>', unsafe_allow_html=True)
-st.markdown('<div class="subtitle">Commitment Scheme 기반 검증 가능한 추첨</div>', unsafe_allow_html=True)
-
-# 탭 생성
-tab1, tab2, tab3, tab4 = st.tabs(["📖 사용법", "🔒 1단계: Commitment 생성", "🎲 2단계: 추첨 실행", "✅ 3단계: 검증"])
 
 # ========== Tab 1: 사용법 ==========
-with tab1:
+def render_guide_tab():
+    """사용법 탭 (정적 내용)"""
     st.markdown("""
     <div class="info-box">
         <h3>🎯 이 시스템의 목적</h3>
@@ -233,7 +157,31 @@ with tab1:
 
 
 # ========== Tab 2: Commitment 생성 ==========
-with tab2:
+# 게시 설정 파일 (draw_publish.py). 파일이 있을 때만 게시 버튼을 보여줌
+PUBLISH_CONFIG = os.environ.get("DRAW_PUBLISH_CONFIG", "publish.json")
+
+
+def publish_button(data, key):
+    """설정된 sink(파일/webhook/큐)에 동시에 게시하는 버튼과 결과"""
+    if not os.path.exists(PUBLISH_CONFIG):
+        return
+    if st.button("📢 설정된 곳에 게시하기", key=key):
+        from draw_publish import publish_sync
+
+        with st.spinner("게시 중..."):
+            receipt = publish_sync(PUBLISH_CONFIG, [data])[0]
+        lines = "\n".join(
+            f"- {'✅' if outcome['ok'] else '❌'} {outcome['sink']} "
+            f"({outcome['latency_ms']:.0f}ms, 시도 {outcome['attempts']}회){'' if outcome['ok'] else ': ' + outcome['error']}"
+            for outcome in receipt["sinks"])
+        if receipt["ok"]:
+            st.success(f"게시 완료 ({receipt['elapsed_ms']:.0f}ms)\n\n{lines}")
+        else:
+            st.error(f"일부 게시 실패 (영수증 기록됨)\n\n{lines}")
+
+
+def render_commit_tab():
+    """1단계 탭: 안내문은 전체 실행 때만 그리고, 생성 영역은 fragment 로 그림"""
     st.markdown("## 🔒 1단계: Commitment 생성")
 
     st.markdown("""
@@ -248,13 +196,21 @@ with tab2:
     </div>
     """, unsafe_allow_html=True)
 
+    commit_panel()
+
+
+@st.fragment
+def commit_panel():
+    """Commitment 생성 버튼과 결과"""
     col1, col2, col3 = st.columns([1, 2, 1])
 
     with col2:
         if st.button("🎲 Commitment 생성하기", key="gen_commit", use_container_width=True):
-            commitment_hash, commitment_data = generate_commitment()
+            commitment_hash, commitment_data = make_commitment()
             st.session_state.commitment_data = commitment_data
             st.session_state.commitment_hash = commitment_hash
+            st.session_state.commitment_json = json.dumps(commitment_data, indent=2, ensure_ascii=False)
+            # 2단계 탭도 새 Commitment 를 보도록 앱 전체를 다시 실행
             st.rerun()
 
     if st.session_state.commitment_data:
@@ -270,6 +226,8 @@ with tab2:
         # Commitment Hash
         st.markdown("**📌 Commitment Hash:**")
         st.code(st.session_state.commitment_hash, language=None)
+        # Nonce 는 빼고 해시/타임스탬프만 게시
+        publish_button(st.session_state.commitment_data, "publish_commit")
 
         # Timestamp
         timestamp = st.session_state.commitment_data['timestamp']
@@ -295,18 +253,18 @@ with tab2:
             st.code(st.session_state.commitment_data['nonce'], language=None)
             st.markdown("**📝 이 값을 안전하게 복사해두세요. 추첨 실행 시 필요합니다.**")
 
-        # 다운로드 버튼
-        commitment_json = json.dumps(st.session_state.commitment_data, indent=2, ensure_ascii=False)
+        # 다운로드 버튼 (생성할 때 한 번 직렬화한 값 사용)
         st.download_button(
             label="💾 Commitment 데이터 다운로드 (JSON)",
-            data=commitment_json,
+            data=st.session_state.commitment_json,
             file_name=f"commitment_{draw_time.strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json"
         )
 
 
 # ========== Tab 3: 추첨 실행 ==========
-with tab3:
+def render_draw_tab():
+    """2단계 탭: 입력/추첨 영역은 fragment 로 그림"""
     st.markdown("## 🎲 2단계: 추첨 실행")
 
     st.markdown("""
@@ -321,6 +279,12 @@ with tab3:
     </div>
     """, unsafe_allow_html=True)
 
+    draw_panel()
+
+
+@st.fragment
+def draw_panel():
+    """Commitment 입력, 추첨 범위 설정, 추첨 결과"""
     # Commitment 데이터 입력 방법 선택
     input_method = st.radio(
         "Commitment 데이터 입력 방법:",
@@ -366,14 +330,19 @@ with tab3:
         with col2:
             max_num = st.number_input("최대값", min_value=min_num, value=100, step=1)
 
-        st.info(f"📌 추첨 범위: **{min_num}** ~ **{max_num}** ({max_num - min_num + 1}명)")
+        winners = st.number_input("당첨자 수", min_value=1, max_value=max_num - min_num + 1, value=1, step=1)
+
+        st.info(f"📌 추첨 범위: **{min_num}** ~ **{max_num}** ({max_num - min_num + 1}명), 당첨자 **{winners}**명")
 
         # 추첨 실행 버튼
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("🎲 추첨 실행하기", key="do_draw", use_container_width=True, type="primary"):
-                reveal_data = reveal_and_draw(commitment_data_to_use, min_num, max_num)
+                reveal_data = draw_reveal(commitment_data_to_use, min_num, max_num, winners)
                 st.session_state.reveal_data = reveal_data
+                st.session_state.reveal_json = json.dumps(reveal_data, indent=2, ensure_ascii=False)
+                st.session_state.reveal_file_name = f"reveal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                # 3단계 탭도 새 결과를 보도록 앱 전체를 다시 실행
                 st.rerun()
 
         if st.session_state.reveal_data:
@@ -383,7 +352,12 @@ with tab3:
             st.markdown("## 🎊 추첨 결과")
 
             # 당첨 번호 크게 표시
-            st.markdown(f'<div class="result-number">{st.session_state.reveal_data["result"]}</div>', unsafe_allow_html=True)
+            if "results" in st.session_state.reveal_data:
+                st.markdown(f'<div class="result-number">{st.session_state.reveal_data["result"]}</div>', unsafe_allow_html=True)
+                st.markdown("**🏆 전체 당첨 번호 (추첨 순서):**")
+                st.code(", ".join(map(str, st.session_state.reveal_data["results"])), language=None)
+            else:
+                st.markdown(f'<div class="result-number">{st.session_state.reveal_data["result"]}</div>', unsafe_allow_html=True)
             st.markdown(f"<p style='text-align: center; font-size: 1.5em; color: #666;'>추첨 범위: {st.session_state.reveal_data['min_num']} ~ {st.session_state.reveal_data['max_num']}</p>", unsafe_allow_html=True)
 
             st.markdown("---")
@@ -411,22 +385,24 @@ with tab3:
             st.markdown("**📊 추첨 정보:**")
             st.json({
                 "추첨 범위": f"{st.session_state.reveal_data['min_num']} ~ {st.session_state.reveal_data['max_num']}",
-                "당첨 번호": st.session_state.reveal_data['result'],
+                "당첨자 수": st.session_state.reveal_data.get('winners', 1),
+                "당첨 번호": st.session_state.reveal_data.get('results', st.session_state.reveal_data['result']),
                 "시드 값": st.session_state.reveal_data['seed_value']
             })
 
-            # 다운로드
-            reveal_json = json.dumps(st.session_state.reveal_data, indent=2, ensure_ascii=False)
+            # 다운로드 (추첨할 때 한 번 직렬화한 값 사용)
             st.download_button(
                 label="💾 검증 데이터 다운로드 (JSON)",
-                data=reveal_json,
-                file_name=f"reveal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                data=st.session_state.reveal_json,
+                file_name=st.session_state.reveal_file_name,
                 mime="application/json"
             )
+            publish_button(st.session_state.reveal_data, "publish_reveal")
 
 
 # ========== Tab 4: 검증 ==========
-with tab4:
+def render_verify_tab():
+    """3단계 탭: 검증 영역은 fragment 로 그림 (검증하기를 눌러도 이 영역만 다시 실행)"""
     st.markdown("## ✅ 3단계: 검증")
 
     st.markdown("""
@@ -439,6 +415,12 @@ with tab4:
     </div>
     """, unsafe_allow_html=True)
 
+    verify_panel()
+
+
+@st.fragment
+def verify_panel():
+    """검증 데이터 입력과 검증 결과"""
     # 검증 데이터 입력 방법
     verify_method = st.radio(
         "검증 데이터 입력 방법:",
@@ -474,6 +456,7 @@ with tab4:
             verify_min = st.number_input("최소값", min_value=1, value=1, step=1, key="verify_min")
         with col2:
             verify_max = st.number_input("최대값", min_value=verify_min, value=100, step=1, key="verify_max")
+        verify_winners = st.number_input("당첨자 수", min_value=1, max_value=verify_max - verify_min + 1, value=1, step=1, key="verify_winners")
 
         if verify_hash and verify_timestamp and verify_nonce:
             verify_data = {
@@ -481,7 +464,8 @@ with tab4:
                 "timestamp": verify_timestamp.strip(),
                 "nonce": verify_nonce.strip(),
                 "min_num": verify_min,
-                "max_num": verify_max
+                "max_num": verify_max,
+                "winners": verify_winners
             }
 
     if verify_data:
@@ -495,7 +479,10 @@ with tab4:
                     verify_data["timestamp"],
                     verify_data["nonce"],
                     verify_data["min_num"],
-                    verify_data["max_num"]
+                    verify_data["max_num"],
+                    verify_data.get("winners", 1),
+                    # counter 방식 하위 추첨 reveal 이면 그 하위 추첨의 시드로 재현
+                    verify_data.get("sub_index") if verify_data.get("seed_scheme") == 2 else None
                 )
 
                 st.markdown("---")
@@ -504,8 +491,13 @@ with tab4:
                     st.success("### ✅ 검증 성공! 추첨이 공정하게 진행되었습니다.")
                     st.balloons()
 
-                    st.markdown(f'<div class="result-number">{result}</div>', unsafe_allow_html=True)
-                    st.markdown(f"<p style='text-align: center; font-size: 1.5em; color: #666;'>재현된 당첨 번호</p>", unsafe_allow_html=True)
+                    if isinstance(result, list):
+                        st.markdown(f'<div class="result-number">{result[0]}</div>', unsafe_allow_html=True)
+                        st.markdown(f"<p style='text-align: center; font-size: 1.5em; color: #666;'>재현된 당첨 번호 ({len(result)}명, 추첨 순서)</p>", unsafe_allow_html=True)
+                        st.code(", ".join(map(str, result)), language=None)
+                    else:
+                        st.markdown(f'<div class="result-number">{result}</div>', unsafe_allow_html=True)
+                        st.markdown(f"<p style='text-align: center; font-size: 1.5em; color: #666;'>재현된 당첨 번호</p>", unsafe_allow_html=True)
 
                     st.markdown("---")
 
@@ -549,8 +541,139 @@ with tab4:
                     """)
 
 
-# 사이드바
-with st.sidebar:
+# ========== Tab 5: 대량 검증 ==========
+# 결과 표 한 페이지의 행 수
+BULK_PAGE_SIZE = 50
+
+
+def render_bulk_tab():
+    """대량 검증 탭: 검증이 진행 중인 동안 fragment 가 1초마다 진행 상황만 다시 그림"""
+    st.markdown("## 📦 대량 검증")
+
+    st.markdown("""
+    <div class="info-box">
+        <h3>📌 한 시즌의 추첨을 한 번에 검증</h3>
+        <p>
+        한 줄에 reveal 레코드 하나씩 있는 <strong>JSONL</strong> 파일이나 reveal JSON 파일들을 묶은
+        <strong>ZIP</strong> 파일을 올리세요.<br>
+        파일은 조금씩 읽어 백그라운드에서 묶음 단위로 검증하므로, 수십만 건이어도 화면이 멈추지 않습니다.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    job = st.session_state.get("bulk_job")
+    st.session_state.bulk_polling = job is not None and not job.finished
+    st.fragment(run_every=1.0 if st.session_state.bulk_polling else None)(bulk_panel)()
+
+
+def _bulk_row(outcome):
+    """검증 결과 dict → 결과 표의 한 행"""
+    result = outcome.get("results", outcome.get("result", ""))
+    return {
+        "위치": str(outcome.get("line", "")),
+        "검증": "✅" if outcome["ok"] else "❌",
+        "당첨 번호": ", ".join(map(str, result)) if isinstance(result, list) else str(result),
+        "오류": outcome.get("error", ""),
+        "Commitment Hash": outcome.get("commitment_hash", outcome.get("chain_tip", ""))[:16],
+    }
+
+
+def _failures_csv(failures):
+    """실패한 검증 결과 → CSV 문자열"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["line", "error", "commitment_hash", "expected", "result", "detail"])
+    for outcome in failures:
+        writer.writerow([
+            outcome.get("line", ""),
+            outcome.get("error", ""),
+            outcome.get("commitment_hash", outcome.get("chain_tip", "")),
+            json.dumps(outcome["expected"]) if "expected" in outcome else "",
+            json.dumps(outcome.get("results", outcome.get("result", ""))),
+            outcome.get("detail", ""),
+        ])
+    return out.getvalue()
+
+
+def bulk_panel():
+    """업로드, 진행률, 결과 표(페이지), 실패 CSV 다운로드"""
+    job = st.session_state.get("bulk_job")
+    idle = job is None or job.finished
+
+    uploaded = st.file_uploader("JSONL 또는 ZIP 파일 선택", type=["jsonl", "zip"], key="bulk_upload", disabled=not idle)
+    if idle and uploaded and st.button("📦 검증 시작", key="bulk_start", type="primary"):
+        # 업로드 버퍼를 복사하지 않고 감싸서 백그라운드 스레드가 읽음
+        buffer = io.BytesIO(uploaded.getbuffer())
+        # 업로드한 레코드는 신뢰할 수 없으므로 서버 파일 경로(weights_path / roster_path)와 큰 추첨을 거부.
+        # 모든 세션이 프로세스 풀 하나를 함께 쓰고, 레코드 수와 보관하는 결과 수는 제한됨
+        st.session_state.bulk_job = VerifyJob(iter_upload_records(buffer, uploaded.name), untrusted=True)
+        st.session_state.bulk_source = (buffer, uploaded.size)
+        st.session_state.bulk_csv = None
+        st.session_state.bulk_page = 1
+        # 진행 중 자동 갱신(run_every)을 켜려면 앱 전체를 다시 실행
+        st.rerun()
+
+    if job is None:
+        return
+
+    buffer, size = st.session_state.bulk_source
+    if job.finished:
+        st.progress(1.0, text=f"완료: {job.done:,}건 검증")
+        if st.session_state.get("bulk_polling"):
+            # 자동 갱신 끄기
+            st.rerun()
+    else:
+        # 읽은 바이트 비율로 진행률 추정 (전체 레코드 수는 끝까지 읽어야 알 수 있음)
+        st.progress(min(buffer.tell() / size, 0.99) if size else 0.0,
+                    text=f"검증 중... {job.done:,}건 (실패 {job.failed:,}건)")
+        if st.button("⏹️ 중지", key="bulk_cancel"):
+            job.cancel()
+    if job.error:
+        st.error(f"❌ 파일을 읽는 중 오류: {job.error}")
+    if job.truncated:
+        st.warning(f"⚠️ 레코드가 {JOB_MAX_RECORDS:,}건을 넘어 앞의 {JOB_MAX_RECORDS:,}건만 검증했습니다. 파일을 나눠 올려 주세요.")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("검증한 레코드", f"{job.done:,}")
+    col2.metric("성공", f"{job.done - job.failed:,}")
+    col3.metric("실패", f"{job.failed:,}")
+
+    only_failed = st.checkbox("실패만 보기", key="bulk_only_failed")
+    rows = job.failures if only_failed else job.results
+    pages = max(1, math.ceil(len(rows) / BULK_PAGE_SIZE))
+    if st.session_state.get("bulk_page", 1) > pages:
+        st.session_state.bulk_page = pages
+    page = st.number_input(f"페이지 (전체 {pages:,})", min_value=1, max_value=pages, step=1, key="bulk_page")
+    page_rows = rows[(page - 1) * BULK_PAGE_SIZE:page * BULK_PAGE_SIZE]
+    if not only_failed:
+        page_rows = [json.loads(line) for line in page_rows]  # 보이는 페이지만 파싱
+    st.dataframe([_bulk_row(outcome) for outcome in page_rows], hide_index=True, use_container_width=True)
+    shown = job.failed if only_failed else job.done
+    if len(rows) < shown:
+        st.caption(f"결과 표와 CSV 에는 앞의 {len(rows):,}건만 보관합니다 (전체 {shown:,}건). "
+                   "전체 결과는 `python random_draw.py verify-batch` 로 확인하세요.")
+
+    if job.finished and job.failures:
+        if st.session_state.bulk_csv is None:
+            st.session_state.bulk_csv = _failures_csv(job.failures)
+        st.download_button(
+            label="💾 실패 목록 다운로드 (CSV)",
+            data=st.session_state.bulk_csv,
+            file_name="verify_failures.csv",
+            mime="text/csv"
+        )
+
+
+# ========== 사이드바 ==========
+def _toggle_metrics():
+    """사이드바 계측 토글을 바꿨을 때만 프로세스 전체 계측을 켜고 끔"""
+    if st.session_state.metrics_on:
+        metrics.enable()
+    else:
+        metrics.disable()
+
+
+def render_sidebar():
     st.markdown("### 📚 추가 정보")
 
     st.markdown("""
@@ -571,9 +694,62 @@ with st.sidebar:
 
     st.markdown("---")
 
+    # 계측 스위치는 프로세스 전체 공유라서 토글은 현재 상태를 보여주고, 사용자가 바꿀 때만 켜고 끔
+    st.session_state.metrics_on = metrics.enabled
+    st.toggle("⏱️ 단계별 계측", key="metrics_on", on_change=_toggle_metrics,
+              help="Commitment 생성/추첨/검증의 단계별 시간을 모읍니다. 같은 서버의 모든 세션이 함께 집계되며, "
+                   "끄면 모든 세션의 계측이 꺼집니다. 시작할 때 켜려면 DRAW_METRICS=1 로 실행하세요.")
+    if metrics.enabled:
+        snap = metrics.snapshot()
+        if snap["spans"]:
+            st.dataframe(
+                [
+                    {"단계": name, "횟수": s["count"],
+                     "평균 (µs)": round(s["total_s"] / s["count"] * 1e6, 1),
+                     "최대 (µs)": round(s["max_s"] * 1e6, 1)}
+                    for name, s in snap["spans"].items()
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.caption("아직 기록된 단계가 없습니다.")
+        cache = verify_cache.info()
+        lookups = cache["hits"] + cache["misses"]
+        hit_rate = f"{cache['hits'] / lookups:.0%}" if lookups else "-"
+        st.caption(f"검증 캐시: {cache['size']:,} / {cache['max_size']:,}건, 적중률 {hit_rate} (전체 세션 공유)")
+        st.download_button("📥 Prometheus 형식", metrics.to_prometheus(), "draw_metrics.prom", mime="text/plain")
+        st.download_button("📥 JSON", metrics.to_json(), "draw_metrics.json", mime="application/json")
+        if st.button("계측 초기화"):
+            metrics.reset()
+
+    st.markdown("---")
+
     st.markdown("""
     <div style="text-align: center; color: #666; font-size: 0.9em;">
         Made with ❤️ using Streamlit<br>
         © 2025 공정한 추첨 시스템
     </div>
     """, unsafe_allow_html=True)
+
+
+# ========== 메인 앱 ==========
+
+st.markdown('<div class="main-header">🎲 공정한 추첨 시스템</div>', unsafe_allow_html=True)
+st.markdown('<div class="subtitle">Commitment Scheme 기반 검증 가능한 추첨</div>', unsafe_allow_html=True)
+
+# 탭 생성. 각 탭의 상호작용 영역은 fragment 라서 버튼/입력이 바뀌어도 그 영역만 다시
+# 실행됩니다. 다른 탭이 쓰는 세션 상태를 바꿀 때(Commitment 생성, 추첨 실행)만 전체를 다시 실행합니다.
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📖 사용법", "🔒 1단계: Commitment 생성", "🎲 2단계: 추첨 실행", "✅ 3단계: 검증", "📦 대량 검증"])
+with tab1:
+    render_guide_tab()
+with tab2:
+    render_commit_tab()
+with tab3:
+    render_draw_tab()
+with tab4:
+    render_verify_tab()
+with tab5:
+    render_bulk_tab()
+with st.sidebar:
+    render_sidebar()
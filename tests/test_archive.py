@@ -0,0 +1,47 @@
+"""아카이브 저장 (중간 오류 시 기존 파일 유지)"""
+
+import json
+
+import pytest
+
+from draw_core import draw_reveal, make_commitment
+from draw_core.archive import Archive, write_archive
+
+
+def _reveals(count):
+    return [draw_reveal(make_commitment()[1], 1, 100) for _ in range(count)]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "draws.drawarc"
+    records = _reveals(5)
+    assert write_archive(str(path), records) == 5
+    with Archive(str(path)) as arc:
+        assert [r["commitment_hash"] for r in arc] == [r["commitment_hash"] for r in records]
+    assert [p.name for p in tmp_path.iterdir()] == ["draws.drawarc"]
+
+
+def test_bad_input_keeps_previous_archive(tmp_path):
+    path = tmp_path / "draws.drawarc"
+    write_archive(str(path), _reveals(3))
+    before = path.read_bytes()
+
+    good = [json.dumps(r) for r in _reveals(4)]
+    lines = good[:2] + ["{not json"] + good[2:]
+    with pytest.raises(json.JSONDecodeError):
+        write_archive(str(path), (json.loads(line) for line in lines))
+
+    assert path.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["draws.drawarc"]
+
+
+def test_interrupted_write_creates_nothing(tmp_path):
+    path = tmp_path / "new.drawarc"
+
+    def records():
+        yield from _reveals(2)
+        raise OSError("입력 끊김")
+
+    with pytest.raises(OSError):
+        write_archive(str(path), records())
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,41 @@
+"""공정성 감사: 엔진 간 재현성과 여러 당첨자 분포 검정"""
+
+import pytest
+
+from draw_core import audit, draw
+
+RANGES = [(1, 7), (1, 10), (0, 99)]
+
+
+def _report(config, engine="python"):
+    return audit.make_report(audit.run_audit(config, 1, engine))
+
+
+def test_multiple_winners_counts_every_winner():
+    config = audit.make_config(2000, RANGES, winners=3)
+    report = _report(config)
+    assert [r["trials"] for r in report["ranges"]] == [6000] * len(RANGES)
+    assert report["passed"]
+
+
+def test_numpy_engine_matches_python():
+    pytest.importorskip("numpy")
+    for winners in (1, 4):
+        config = audit.make_config(3000, RANGES, winners=winners)
+        assert _report(config, "numpy")["counts_sha256"] == _report(config)["counts_sha256"]
+
+
+def test_bias_in_later_winners_is_detected(monkeypatch):
+    # 첫 번째 당첨 번호는 정상이고 두 번째부터 범위 앞쪽으로 쏠리는 추첨
+    def biased(rng, min_num, max_num, winners=1):
+        results = draw.draw_numbers(rng, min_num, max_num, winners)
+        return results[:1] + [min_num + (x - min_num) // 2 for x in results[1:]]
+
+    monkeypatch.setattr(audit, "draw_numbers", biased)
+    assert _report(audit.make_config(2000, RANGES, winners=1))["passed"]
+    assert not _report(audit.make_config(2000, RANGES, winners=3))["passed"]
+
+
+def test_winners_larger_than_range_rejected():
+    with pytest.raises(ValueError):
+        audit.make_config(10, [(1, 3)], winners=4)
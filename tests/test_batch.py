@@ -0,0 +1,79 @@
+"""대량 검증 (업로드 레코드의 파일 경로 제한)"""
+
+import io
+import json
+import zipfile
+
+from draw_core import draw_reveal, make_commitment
+from draw_core.batch import VerifyJob, iter_upload_records
+
+
+def _reveal():
+    _, commitment = make_commitment()
+    return draw_reveal(commitment)
+
+
+def _run(upload, name, **kwargs):
+    job = VerifyJob(iter_upload_records(upload, name), workers=1, **kwargs)
+    job.join(30)
+    assert job.finished and job.error is None
+    return [json.loads(line) for line in job.results]
+
+
+def test_untrusted_upload_rejects_file_paths():
+    record = _reveal()
+    lines = [record, dict(record, roster_path="/etc/passwd"), dict(record, weights_path="/dev/zero")]
+    upload = io.BytesIO("".join(json.dumps(r) + "\n" for r in lines).encode())
+    results = _run(upload, "reveals.jsonl", untrusted=True)
+    assert [r["ok"] for r in results] == [True, False, False]
+    assert [r.get("error") for r in results[1:]] == ["path_not_allowed"] * 2
+    assert all("sha256" not in json.dumps(r) for r in results[1:])
+
+
+def test_untrusted_zip_upload_rejects_file_paths():
+    record = _reveal()
+    upload = io.BytesIO()
+    with zipfile.ZipFile(upload, "w") as zf:
+        zf.writestr("ok.json", json.dumps(record))
+        zf.writestr("bad.json", json.dumps([dict(record, roster_path="../../etc/passwd")]))
+    upload.seek(0)
+    results = _run(upload, "reveals.zip", untrusted=True)
+    assert {r["line"]: r["ok"] for r in results} == {"ok.json": True, "bad.json[1]": False}
+    assert results[1]["error"] == "path_not_allowed"
+
+
+
+def test_job_caps_records_and_stored_results():
+    record = _reveal()
+    lines = [record if i % 3 else dict(record, result=0) for i in range(40)]
+    upload = io.BytesIO("".join(json.dumps(r) + "\n\n" for r in lines).encode())
+    job = VerifyJob(iter_upload_records(upload, "reveals.jsonl"), workers=1, chunk_size=8,
+                    max_records=25, max_results=10, max_failures=3)
+    job.join(30)
+    assert job.finished and job.error is None and job.truncated
+    assert job.done == 25 and job.failed == 9
+    assert len(job.results) == 10 and len(job.failures) == 3
+
+
+def test_zip_member_size_checked_before_reading(monkeypatch):
+    from draw_core import batch
+    monkeypatch.setattr(batch, "MAX_MEMBER_BYTES", 1000)
+    upload = io.BytesIO()
+    with zipfile.ZipFile(upload, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("ok.json", json.dumps(_reveal()))
+        zf.writestr("bomb.json", "[" + " " * 100_000 + "]")
+    upload.seek(0)
+    job = VerifyJob(iter_upload_records(upload, "reveals.zip"), workers=1, chunk_size=1)
+    job.join(30)
+    assert job.done == 1
+    assert "bomb.json" in job.error
+
+
+def test_shared_pool_job():
+    record = _reveal()
+    upload = io.BytesIO("".join(json.dumps(record) + "\n" for _ in range(20)).encode())
+    job = VerifyJob(iter_upload_records(upload, "reveals.jsonl"), chunk_size=4)
+    job.join(60)
+    assert job.error is None and job.done == 20 and job.failed == 0
+    from draw_core.batch import shared_pool
+    assert job.pool is shared_pool()[0]
@@ -0,0 +1,33 @@
+"""캠페인 일괄 공개: 중복/이미 공개된 추첨 거부"""
+
+import json
+
+import random_draw
+
+
+def _reveals(out_dir):
+    with open(out_dir / "reveals.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_file_mode_rejects_duplicates_and_revealed(tmp_path):
+    random_draw.commit_campaign(4, str(tmp_path))
+    assert random_draw.reveal_campaign([(0, 1, 10, 1), (1, 1, 10, 1), (0, 1, 100, 1)], str(tmp_path)) is None
+    assert not (tmp_path / "reveals.jsonl").exists()
+
+    assert random_draw.reveal_campaign([(0, 1, 10, 1), (1, 1, 10, 1)], str(tmp_path)) is not None
+    # 이미 공개한 0 번을 다른 범위로 다시 공개할 수 없음 (아무것도 덧붙이지 않음)
+    assert random_draw.reveal_campaign([(2, 1, 10, 1), (0, 1, 100, 1)], str(tmp_path)) is None
+    assert len(_reveals(tmp_path)) == 2
+
+    assert random_draw.reveal_campaign([(2, 1, 10, 1), (3, 1, 10, 2)], str(tmp_path)) is not None
+    reveals = _reveals(tmp_path)
+    assert len(reveals) == 4
+    assert len({r["commitment_hash"] for r in reveals}) == 4
+
+
+def test_ledger_mode_rejects_duplicates(tmp_path):
+    db = str(tmp_path / "draws.db")
+    random_draw.commit_campaign(2, str(tmp_path), db)
+    assert random_draw.reveal_campaign([(1, 1, 10, 1), (1, 1, 100, 1)], str(tmp_path), db) is None
+    assert random_draw.reveal_campaign([(1, 1, 10, 1), (2, 1, 10, 1)], str(tmp_path), db) is not None
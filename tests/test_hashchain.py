@@ -0,0 +1,35 @@
+"""해시 체인 reveal 검증 (위조 링크 거부)"""
+
+import hashlib
+import os
+
+from draw_core import hashchain, verify_record
+
+
+def test_chain_reveals_verify():
+    chain = hashchain.new_chain(20)
+    for draw_index in (1, 2, 7, 20):
+        record = hashchain.chain_draw(chain, draw_index, 1, 100, winners=3)
+        assert verify_record(record)["ok"], draw_index
+
+
+def test_forged_link_rejected():
+    chain = hashchain.new_chain(20)
+    record = hashchain.chain_draw(chain, 5, 1, 100)
+    # 아무 링크나 고르고 prev_link 를 그 해시로 맞춘 위조 레코드
+    link = os.urandom(32)
+    record.update({"link": link.hex(), "prev_link": hashlib.sha256(link).hexdigest()})
+    record.pop("result")
+    outcome = verify_record(record)
+    assert not outcome["ok"]
+    assert outcome["error"] == "chain_tip_mismatch"
+
+
+def test_link_from_other_index_rejected():
+    chain = hashchain.new_chain(20)
+    record = hashchain.chain_draw(chain, 5, 1, 100)
+    record["draw_index"] = 6
+    record.pop("result")
+    assert verify_record(record)["error"] == "chain_tip_mismatch"
+    record["draw_index"] = 10 ** 9
+    assert verify_record(record)["error"] == "chain_index_invalid"
@@ -0,0 +1,16 @@
+"""draw_core import 회귀 검사 (의존성은 엄격하게, 시간은 느슨하게)"""
+
+from draw_core import importcheck
+
+# 테스트는 다른 작업과 함께 돌기도 하므로 시간 예산은 기본값의 3배만 확인
+LOOSE_BUDGET_MS = importcheck.DEFAULT_BUDGET_MS * 3
+
+
+def test_draw_core_import_stays_light():
+    problems, elapsed_ms = importcheck.check(LOOSE_BUDGET_MS)
+    assert problems == [], f"{problems} ({elapsed_ms:.1f}ms)"
+
+
+def test_forbidden_module_is_reported():
+    modules, _ = importcheck.measure_import("sqlite3")
+    assert "sqlite3" in modules & importcheck.FORBIDDEN_MODULES
@@ -0,0 +1,18 @@
+"""draw_core.metrics 의 Prometheus 내보내기"""
+
+from draw_core import metrics
+
+
+def test_prometheus_escapes_label_values():
+    metrics.reset()
+    try:
+        metrics.record('bad"name\\\nfake_metric 1', 0.5)
+        metrics.count("ok")
+        text = metrics.to_prometheus()
+    finally:
+        metrics.reset()
+    lines = text.splitlines()
+    assert 'draw_phase_seconds_count{phase="bad\\"name\\\\\\nfake_metric 1"} 1' in lines
+    # 이름 안의 줄바꿈이 새 줄(주입된 메트릭)을 만들지 않음
+    assert not any(line.startswith("fake_metric") for line in lines)
+    assert 'draw_events_total{event="ok"} 1' in lines
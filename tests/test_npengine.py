@@ -0,0 +1,58 @@
+"""NumPy MT19937 엔진이 CPython random 과 비트 단위로 같은지 확인"""
+
+import random
+
+import pytest
+
+from draw_core.draw import _draw
+
+np = pytest.importorskip("numpy")
+from draw_core import npengine  # noqa: E402
+
+SEEDS = [0, 1, 2, 42, 2**31 - 1, 2**31, 2**32 - 1] + [random.Random(7).getrandbits(32) for _ in range(150)]
+
+# 거절 샘플링 경계: 2^k 바로 위(거절 확률 최대), 2^k, 2^k - 1
+SIZES = sorted({1, 2, 3, 10, 100, 10**6, 10**9, 10**12, 2**64 - 1}
+               | {2**k + d for k in (1, 7, 16, 31, 32, 33, 53, 63) for d in (-1, 0, 1)})
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_randint_matches_cpython(size):
+    got = npengine.draw_many(SEEDS, [1] * len(SEEDS), [size] * len(SEEDS))
+    assert got == [[random.Random(seed).randint(1, size)] for seed in SEEDS]
+
+
+@pytest.mark.parametrize("min_num", [-10**6, 0, 7])
+def test_offset_ranges(min_num):
+    size = 2**32 + 1
+    got = npengine.draw_many(SEEDS, [min_num] * len(SEEDS), [min_num + size - 1] * len(SEEDS))
+    assert got == [[random.Random(seed).randint(min_num, min_num + size - 1)] for seed in SEEDS]
+
+
+@pytest.mark.parametrize("size, winners", [(10, 10), (1000, 7), (2**33 + 1, 50), (10**12, 700)])
+def test_multiple_winners_match_draw(size, winners):
+    seeds = SEEDS[:40]
+    got = npengine.draw_many(seeds, [1] * len(seeds), [size] * len(seeds), winners)
+    assert got == [_draw(seed, 1, size, winners) for seed in seeds]
+
+
+def test_random_corpus():
+    mismatches, total = npengine.check(3000, seed=2024)
+    assert total > 3000
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("winners", [1, 3, 10])
+def test_draw_offsets_match_draw(winners):
+    sizes = [10, 1000, 2**33 + 1]
+    got = npengine.draw_offsets(SEEDS, sizes, winners)
+    for size, offsets in zip(sizes, got):
+        assert offsets.shape == (len(SEEDS), winners)
+        assert offsets.tolist() == [_draw(seed, 0, size - 1, winners) for seed in SEEDS]
+
+
+def test_draw_offsets_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        npengine.draw_offsets(SEEDS, [5], 6)
+    with pytest.raises(ValueError):
+        npengine.draw_offsets(SEEDS, [2**64], 1)
@@ -0,0 +1,50 @@
+"""draw_publish 의 영수증 체인 (여러 프로세스 동시 게시, 공유 Publisher)"""
+
+import os
+import subprocess
+import sys
+
+import draw_publish
+from draw_core import make_commitment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 자식 프로세스: publish_sync 로 commitment count 개를 게시
+_CHILD = """
+import sys
+import draw_publish
+from draw_core import make_commitment
+config = {"sinks": ["file:" + sys.argv[1]], "receipts": sys.argv[2], "key_file": sys.argv[3]}
+for _ in range(int(sys.argv[4])):
+    draw_publish.publish_sync(config, [make_commitment()[1] for _ in range(5)])
+"""
+
+
+def _config(tmp_path):
+    return {"sinks": [f"file:{tmp_path / 'published'}"], "receipts": str(tmp_path / "receipts.jsonl"),
+            "key_file": str(tmp_path / "publish.key")}
+
+
+def test_shared_publisher_per_config(tmp_path):
+    config = _config(tmp_path)
+    publisher = draw_publish.get_publisher(config)
+    assert draw_publish.get_publisher(dict(config)) is publisher
+
+    draw_publish.publish_sync(config, [make_commitment()[1] for _ in range(3)])
+    receipts = draw_publish.publish_sync(config, [make_commitment()[1]])
+    assert receipts[0]["ok"]
+    key = draw_publish.load_key(config["key_file"])
+    assert draw_publish.verify_receipts(config["receipts"], key) == (4, None)
+    draw_publish.close_publishers()
+
+
+def test_processes_share_receipt_chain(tmp_path):
+    config = _config(tmp_path)
+    key = draw_publish.load_key(config["key_file"])   # 자식들이 같은 키를 쓰도록 먼저 생성
+    processes, rounds = 4, 10
+    children = [subprocess.Popen([sys.executable, "-c", _CHILD, config["sinks"][0][5:], config["receipts"],
+                                  config["key_file"], str(rounds)], cwd=ROOT)
+                for _ in range(processes)]
+    for child in children:
+        assert child.wait(timeout=60) == 0
+    assert draw_publish.verify_receipts(config["receipts"], key) == (processes * rounds * 5, None)
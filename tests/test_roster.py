@@ -0,0 +1,42 @@
+"""명단 인덱스 캐시 (위치, 깨진 인덱스 재생성)"""
+
+import os
+
+import pytest
+
+from draw_core import roster
+
+
+@pytest.fixture
+def entrants(tmp_path):
+    path = tmp_path / "entrants.txt"
+    path.write_text("".join(f"참가자 {i}\n" for i in range(1, 101)), encoding="utf-8")
+    return str(path)
+
+
+def test_default_cache_dir_is_not_cwd():
+    assert os.path.isabs(roster.CACHE_DIR)
+    assert os.path.commonpath([roster.CACHE_DIR, os.getcwd()]) != os.getcwd()
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:len(data) - 8],                 # 마지막 위치가 잘림
+    lambda data: data[:roster.INDEX_HEADER.size],        # 헤더만 남음
+    lambda data: data[:5],                               # 헤더도 잘림
+    lambda data: b"",                                    # 빈 파일
+    lambda data: data[:-8] + (10 ** 9).to_bytes(8, "little"),  # 마지막 위치가 파일 끝이 아님
+])
+def test_damaged_index_is_rebuilt(entrants, tmp_path, damage):
+    cache_dir = str(tmp_path / "cache")
+    with roster.open_roster(entrants, cache_dir=cache_dir) as opened:
+        index_path = roster._index_path(opened.digest, cache_dir)
+    with open(index_path, "rb") as f:
+        data = f.read()
+    with open(index_path, "wb") as f:
+        f.write(damage(data))
+
+    with roster.open_roster(entrants, cache_dir=cache_dir) as reopened:
+        assert len(reopened) == 100
+        assert reopened.entry(100) == "참가자 100"
+    with open(index_path, "rb") as f:
+        assert f.read() == data
@@ -0,0 +1,73 @@
+"""예약 공개 데몬 (실패한 묶음 재시도)"""
+
+import asyncio
+import sqlite3
+import time
+from contextlib import closing
+
+import draw_scheduler
+from draw_core import ledger, make_commitment, verify_record
+
+
+def _schedule(path, count):
+    with closing(ledger.connect(path)) as conn:
+        draw_ids = ledger.add_commitments(conn, (make_commitment() for _ in range(count)))
+        ledger.schedule_reveals(conn, [(draw_id, time.time(), 1, 100, 1) for draw_id in draw_ids])
+    return draw_ids
+
+
+def test_failed_batch_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / "draws.db")
+    draw_ids = _schedule(path, 3)
+    monkeypatch.setattr(draw_scheduler, "RETRY_BACKOFF", 0.01)
+
+    scheduler = draw_scheduler.RevealScheduler(path, concurrency=1, poll=0.01, verbose=False)
+    reveal_due = scheduler._reveal_due
+    calls = []
+
+    def flaky(due):
+        calls.append(len(due))
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return reveal_due(due)
+
+    scheduler._reveal_due = flaky
+    try:
+        stats = asyncio.run(asyncio.wait_for(scheduler.run(until_idle=True), 10))
+    finally:
+        scheduler.close()
+
+    assert calls == [3, 3]
+    assert stats["retried"] == 3 and stats["revealed"] == 3 and stats["failed"] == 0
+    assert scheduler.retries == {}
+    with closing(ledger.connect(path)) as conn:
+        for draw_id in draw_ids:
+            draw = ledger.get_draw(conn, draw_id)
+            assert draw["status"] == "revealed"
+            assert verify_record(draw["reveal"])["ok"]
+
+
+def test_gives_up_after_retry_limit(tmp_path, monkeypatch):
+    path = str(tmp_path / "draws.db")
+    draw_ids = _schedule(path, 2)
+    monkeypatch.setattr(draw_scheduler, "RETRY_BACKOFF", 0.001)
+    monkeypatch.setattr(draw_scheduler, "RETRY_LIMIT", 2)
+
+    scheduler = draw_scheduler.RevealScheduler(path, concurrency=1, poll=0.01, verbose=False)
+    calls = []
+
+    def broken(due):
+        calls.append(len(due))
+        raise sqlite3.OperationalError("disk I/O error")
+
+    scheduler._reveal_due = broken
+    try:
+        stats = asyncio.run(asyncio.wait_for(scheduler.run(until_idle=True), 10))
+    finally:
+        scheduler.close()
+
+    # 처음 1번 + 재시도 2번 뒤 포기, 추첨은 pending 으로 남아 재시작 때 다시 공개
+    assert calls == [2, 2, 2]
+    assert stats["retried"] == 4 and stats["failed"] == 2 and stats["revealed"] == 0
+    with closing(ledger.connect(path)) as conn:
+        assert all(ledger.get_draw(conn, draw_id)["status"] == "pending" for draw_id in draw_ids)
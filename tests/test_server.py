@@ -0,0 +1,197 @@
+"""draw_server 의 요청 처리 (잘못된 본문, 파일 경로 제한)"""
+
+import asyncio
+import json
+
+import pytest
+
+import draw_server
+from draw_core import draw_reveal, make_commitment
+
+
+def _request(app, raw):
+    """요청 바이트를 그대로 보내고 (상태 코드, 응답 JSON) 반환 (응답 없이 끊기면 (None, None))"""
+    async def run():
+        server = await asyncio.start_server(app.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+        if not response:
+            return None, None
+        head, _, body = response.partition(b"\r\n\r\n")
+        if b"Transfer-Encoding: chunked" in head:
+            body = _dechunk(body)
+        return int(head.split()[1]), json.loads(body)
+    return asyncio.run(run())
+
+
+def _dechunk(data):
+    body = b""
+    while True:
+        size, _, data = data.partition(b"\r\n")
+        if int(size, 16) == 0:
+            return body
+        body, data = body + data[:int(size, 16)], data[int(size, 16) + 2:]
+
+
+def _post(app, path, body):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    return _request(app, f"POST {path} HTTP/1.1\r\nHost: t\r\nConnection: close\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+
+
+@pytest.fixture
+def app():
+    server = draw_server.DrawServer(workers=1)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def roster_reveal(tmp_path):
+    roster = tmp_path / "entrants.txt"
+    roster.write_text("".join(f"참가자 {i}\n" for i in range(1, 11)), encoding="utf-8")
+    from draw_core.roster import open_roster
+    with open_roster(str(roster)) as entrants:
+        _, commitment = make_commitment({"roster_sha256": entrants.digest, "roster_lines": len(entrants)})
+    return draw_reveal(commitment, winners=2), roster
+
+
+@pytest.mark.parametrize("path", ["/commit", "/reveal", "/verify"])
+@pytest.mark.parametrize("body", [b"[1]", b"\"text\"", b"3", b"null"])
+def test_non_object_body_is_400(app, path, body):
+    status, payload = _post(app, path, body)
+    assert status == 400
+    assert "object" in payload["error"]
+
+
+@pytest.mark.parametrize("length_header", ["Content-Length: abc\r\n", "Content-Length: -5\r\n", ""])
+def test_invalid_or_missing_content_length_is_400(app, length_header):
+    status, payload = _request(app, f"POST /verify HTTP/1.1\r\nHost: t\r\n{length_header}\r\n{{}}".encode())
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_get_without_content_length_ok(app):
+    status, payload = _request(app, b"GET /health HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+    assert status == 200 and payload["ok"]
+
+
+@pytest.mark.parametrize("key", ["roster_path", "weights_path"])
+def test_verify_rejects_file_paths(app, roster_reveal, key):
+    record, _ = roster_reveal
+    status, payload = _post(app, "/verify", dict(record, **{key: "/etc/passwd"}))
+    assert status == 400
+    assert "허용되지 않습니다" in payload["error"]
+    assert "sha256" not in json.dumps(payload) and "Errno" not in payload["error"]
+
+
+def test_verify_batch_rejects_file_paths(app, roster_reveal):
+    record, _ = roster_reveal
+    status, payload = _post(app, "/verify-batch", {"records": [record, dict(record, roster_path="/dev/zero")]})
+    assert status == 200
+    assert payload["results"][0]["ok"]
+    assert payload["results"][1]["error"] == "path_not_allowed"
+
+
+def test_data_dir_allows_only_files_inside(roster_reveal, tmp_path):
+    record, roster = roster_reveal
+    app = draw_server.DrawServer(workers=1, data_dir=str(tmp_path))
+    try:
+        status, payload = _post(app, "/verify", dict(record, roster_path=roster.name))
+        assert status == 200 and payload["ok"]
+        assert len(payload["roster_entries"]) == 2
+        for outside in ("../" * 10 + "etc/passwd", "/etc/passwd", "/dev/zero", "missing.txt"):
+            status, payload = _post(app, "/verify", dict(record, roster_path=outside))
+            assert status == 400, outside
+            assert "데이터 디렉터리" in payload["error"]
+    finally:
+        app.close()
+
+
+@pytest.mark.parametrize("body", [{"winners": 10 ** 8, "min_num": 1, "max_num": 10 ** 9},
+                                  {"min_num": 0, "max_num": 2 ** 70}])
+def test_reveal_limits_are_400(app, body):
+    _, commitment = make_commitment()
+    status, payload = _post(app, "/reveal", dict(body, commitment=commitment))
+    assert status == 400
+    assert "LimitExceeded" in payload["error"]
+
+
+def test_verify_limits(app):
+    _, commitment = make_commitment()
+    record = draw_reveal(commitment, 1, 100, winners=3)
+    status, payload = _post(app, "/verify", dict(record, winners=10 ** 8, max_num=10 ** 9))
+    assert status == 400
+    status, payload = _post(app, "/verify-batch", {"records": [record, dict(record, winners=10 ** 8)]})
+    assert status == 200
+    assert payload["results"][0]["ok"]
+    assert payload["results"][1]["error"] == "limit_exceeded"
+
+
+def test_verify_batch_streams_in_input_order(app, monkeypatch):
+    monkeypatch.setattr(draw_server, "BATCH_CHUNK_BYTES", 256)   # 조각 여러 개로 나뉘게 함
+    records = [draw_reveal(make_commitment()[1], 1, 100) for _ in range(30)]
+    records[7]["result"] = 0
+    jsonl = "\n".join(json.dumps(r) for r in records[:10]) + "\n\nnot json\n" + \
+        "\n".join(json.dumps(r) for r in records[10:])
+    for body in ({"records": records}, jsonl.encode()):
+        status, payload = _post(app, "/verify-batch", body)
+        assert status == 200
+        assert payload["total"] == (31 if isinstance(body, bytes) else 30)
+        assert payload["failed"] == (2 if isinstance(body, bytes) else 1)
+        assert [r["ok"] for r in payload["results"]].count(False) == payload["failed"]
+    lines = [r["line"] for r in payload["results"]]
+    assert lines == sorted(lines) and lines[10] == 12 and payload["results"][10]["error"] == "invalid_record"
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n", 414),
+    (b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 70000 + b"\r\n\r\n", 431),
+    (b"GET /health HTTP/1.1\r\n" + b"X-A: 1\r\n" * 150 + b"\r\n", 431),
+])
+def test_oversized_request_head(app, raw, status):
+    assert _request(app, raw)[0] == status
+
+
+@pytest.mark.parametrize("body", [
+    {"weights_sha256": {"nested": 1}},
+    {"weights_sha256": "A" * 64},
+    {"weights_sha256": "ab"},
+    {"roster_sha256": "0" * 64},
+    {"roster_sha256": "0" * 64, "roster_lines": 0},
+    {"roster_sha256": "0" * 64, "roster_lines": "10"},
+    {"roster_sha256": ["0" * 64], "roster_lines": 10},
+])
+def test_commit_validates_file_hashes(app, body):
+    status, payload = _post(app, "/commit", body)
+    assert status == 400
+
+
+def test_commit_with_roster_hash(app):
+    status, payload = _post(app, "/commit", {"roster_sha256": "0" * 64, "roster_lines": 10})
+    assert status == 200
+    assert payload["commitment"]["roster_lines"] == 10
+
+
+def test_metric_spans_use_fixed_endpoint_names(app):
+    from draw_core import metrics
+    metrics.enable()
+    metrics.reset()
+    try:
+        for path in ("/health", "/unknown-1", "/unknown-2?x"):
+            _request(app, f"GET {path} HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n".encode())
+        spans = metrics.snapshot()["spans"]
+    finally:
+        metrics.disable()
+        metrics.reset()
+    assert spans["http other"]["count"] == 2
+    assert [name for name in spans if name.startswith("http")] == ["http /health", "http other"]
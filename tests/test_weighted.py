@@ -0,0 +1,72 @@
+"""가중치 추첨 (중복 없는 다중 당첨, alias table 캐시)"""
+
+import json
+import random
+from array import array
+
+import pytest
+
+from draw_core import weighted
+
+
+def _table(weights, ids=None):
+    weights = array('q', weights)
+    prob, alias, total = weighted.build_alias_table(weights)
+    ids = ids or [f"id{i}" for i in range(len(weights))]
+    return weighted.AliasTable("digest", ids, weights, prob, alias, total, sum(1 for w in weights if w > 0))
+
+
+def _alias_redraw(table, rng, winners):
+    """전환 없는 단순 재추첨 (기존 방식)"""
+    chosen, results = set(), []
+    while len(results) < winners:
+        j = rng.randrange(len(table.ids))
+        if rng.randrange(table.total) >= table.prob[j]:
+            j = table.alias[j]
+        if j not in chosen:
+            chosen.add(j)
+            results.append(table.ids[j])
+    return results
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_plain_redraw_when_weights_spread(seed):
+    table = _table([random.Random(seed).randint(1, 50) for _ in range(200)])
+    assert weighted.weighted_draw(table, random.Random(seed), 10) == _alias_redraw(table, random.Random(seed), 10)
+
+
+def test_skewed_weights_draw_every_positive_entrant():
+    # 가중치가 한 명에게 몰려 있고 당첨자 수가 가중치가 있는 참가자 수와 같아도 끝나야 함
+    table = _table([10**12, 0, 1, 1, 0, 1, 1])
+    for seed in range(50):
+        results = weighted.weighted_draw(table, random.Random(seed), 5)
+        assert sorted(results) == ["id0", "id2", "id3", "id5", "id6"]
+
+
+@pytest.mark.parametrize("winners", [0, 3])
+def test_winners_out_of_range(winners):
+    with pytest.raises(ValueError):
+        weighted.weighted_draw(_table([5, 0, 7]), random.Random(1), winners)
+
+
+def test_fenwick_follows_remaining_weights():
+    # 첫 당첨자(가중치 10^9)를 뺀 나머지 1:2:3 비율
+    table = _table([10**9, 1, 2, 3])
+    counts = {}
+    for seed in range(3000):
+        second = weighted.weighted_draw(table, random.Random(seed), 2)[1]
+        counts[second] = counts.get(second, 0) + 1
+    assert counts.get("id0", 0) == 0
+    for entrant, expected in (("id1", 500), ("id2", 1000), ("id3", 1500)):
+        assert abs(counts[entrant] - expected) < 150
+
+
+def test_cache_round_trips_ids_with_newlines(tmp_path):
+    path = tmp_path / "weights.jsonl"
+    rows = [{"id": "첫째\n줄", "weight": 3}, {"id": "a,b", "weight": 1}, {"id": "", "weight": 2}]
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    built = weighted.load_alias_table(str(path), cache_dir=str(cache_dir))
+    cached = weighted.load_alias_table(str(path), cache_dir=str(cache_dir))
+    assert cached == built
+    assert cached.ids == ["첫째\n줄", "a,b", ""]